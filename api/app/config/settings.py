@@ -16,6 +16,35 @@ class Config:
     # Configuración de CORS
     CORS_ORIGINS = os.environ.get('CORS_ORIGINS', '*')
 
+    # Caché LRU en memoria para get_tm / hairpin / duplex ΔG
+    THERMO_CACHE_ENABLED = os.environ.get('THERMO_CACHE_ENABLED', 'True').lower() == 'true'
+    THERMO_CACHE_MAX_ENTRIES = int(os.environ.get('THERMO_CACHE_MAX_ENTRIES', 100000))
+    THERMO_CACHE_MAX_BYTES = int(os.environ.get('THERMO_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+
+    # Almacén SQLite compartido entre workers (vacío = desactivado)
+    THERMO_STORE_PATH = os.environ.get('THERMO_STORE_PATH', '')
+    THERMO_STORE_TTL = int(os.environ.get('THERMO_STORE_TTL', 30 * 24 * 3600))
+    THERMO_STORE_MAX_ENTRIES = int(os.environ.get('THERMO_STORE_MAX_ENTRIES', 1000000))
+
+    # Backend de kernels termodinámicos: auto | numba | numpy
+    THERMO_BACKEND = os.environ.get('THERMO_BACKEND', 'auto').lower()
+
+    # Procesos para optimize_oligos (1 = en serie)
+    OPTIMIZE_WORKERS = max(1, int(os.environ.get('OPTIMIZE_WORKERS', 1)))
+
+    # Checkpoints SQLite de optimize_oligos para reanudar ejecuciones (vacío = desactivado)
+    OPTIMIZE_CHECKPOINT_PATH = os.environ.get('OPTIMIZE_CHECKPOINT_PATH', '')
+    OPTIMIZE_CHECKPOINT_TTL = int(os.environ.get('OPTIMIZE_CHECKPOINT_TTL', 7 * 24 * 3600))
+
+    # Procesos para el diseño de librerías en /oligos/library (1 = en serie)
+    LIBRARY_WORKERS = max(1, int(os.environ.get('LIBRARY_WORKERS', 1)))
+
+    # Inventario SQLite de oligos en stock (vacío = desactivado)
+    OLIGO_INVENTORY_PATH = os.environ.get('OLIGO_INVENTORY_PATH', '')
+
+    # Longitud máxima aceptada por /sequences/profile
+    PROFILE_MAX_LENGTH = int(os.environ.get('PROFILE_MAX_LENGTH', 10000000))
+
 class DevelopmentConfig(Config):
     """Configuración para desarrollo"""
     DEBUG = True
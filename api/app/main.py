@@ -7,6 +7,10 @@ from flask_cors import CORS
 
 from app.config.settings import config
 from app.models.swagger_models import get_models
+from app.utils.thermo_cache import configure_thermo_cache, configure_thermo_store, flush_thermo_store
+from app.utils.kernel_backend import set_backend, warm_up
+from app.utils.oligo_inventory import configure_inventory
+from app.utils.optimize_checkpoint import configure_optimize_checkpoint
 
 # Import all namespaces
 from app.resources.health import health_ns
@@ -16,6 +20,7 @@ from app.resources.mutagenesis import mutagenesis_ns
 from app.resources.primers import primers_ns
 from app.resources.downloads import downloads_ns
 from app.resources.recycle import recycle_ns
+from app.resources.inventory import inventory_ns
 
 def create_app_with_legacy_endpoints(config_name='default'):
     """Factory para crear la aplicación Flask"""
@@ -23,6 +28,30 @@ def create_app_with_legacy_endpoints(config_name='default'):
     app = Flask(__name__)
     app.config.from_object(config[config_name])
 
+    configure_thermo_cache(
+        enabled=app.config['THERMO_CACHE_ENABLED'],
+        max_entries=app.config['THERMO_CACHE_MAX_ENTRIES'],
+        max_bytes=app.config['THERMO_CACHE_MAX_BYTES']
+    )
+    configure_thermo_store(
+        app.config['THERMO_STORE_PATH'],
+        ttl_seconds=app.config['THERMO_STORE_TTL'],
+        max_entries=app.config['THERMO_STORE_MAX_ENTRIES']
+    )
+
+    @app.teardown_request
+    def flush_thermo_results(exc):
+        flush_thermo_store()
+
+    configure_inventory(app.config['OLIGO_INVENTORY_PATH'])
+    configure_optimize_checkpoint(
+        app.config['OPTIMIZE_CHECKPOINT_PATH'],
+        ttl_seconds=app.config['OPTIMIZE_CHECKPOINT_TTL']
+    )
+
+    set_backend(app.config['THERMO_BACKEND'])
+    warm_up()
+
     # Configure CORS for development - allow any localhost port
     CORS(app, origins=['http://localhost:3000', 'http://localhost', 'http://localhost:80'],
          methods=['GET', 'POST', 'PUT', 'DELETE', 'OPTIONS'],
@@ -52,5 +81,6 @@ def create_app_with_legacy_endpoints(config_name='default'):
     api.add_namespace(primers_ns, path='/primers')
     api.add_namespace(downloads_ns, path='/downloads')
     api.add_namespace(recycle_ns, path='/recycle')
+    api.add_namespace(inventory_ns, path='/inventory')
 
     return app
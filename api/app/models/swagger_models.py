@@ -3,6 +3,8 @@ All Swagger models for the API
 """
 from flask_restx import fields, Api
 
+from app.utils.overlap_utils import DEFAULT_OVERLAP_K, MAX_OVERLAP_K
+
 # Create a dummy Api object to define models
 # This is a bit of a hack, but it allows us to define the models
 # without having to pass the api object around.
@@ -13,6 +15,16 @@ sequence_model = api.model('SequenceAnalyze', {
     'sequence': fields.String(required=True, description='DNA sequence to analyze')
 })
 
+sequence_profile_model = api.model('SequenceProfile', {
+    'sequence': fields.String(required=True, description='DNA sequence, raw or FASTA (multi-megabase inputs accepted)'),
+    'sequence_name': fields.String(description='Name used when the sequence is not FASTA'),
+    'window': fields.Integer(default=100, description='Window size in bases'),
+    'step': fields.Integer(description='Step between windows (defaults to the window size)'),
+    'na_conc': fields.Integer(default=50, description='Na+ concentration (mM)'),
+    'k_conc': fields.Integer(default=0, description='K+ concentration (mM)'),
+    'oligo_conc': fields.Integer(default=250, description='Oligo concentration (nM)')
+})
+
 generate_oligos_model = api.model('GenerateOligos', {
     'sequence': fields.String(required=True, description='DNA sequence in FASTA format'),
     'oligo_length': fields.Integer(default=60, description='Oligo length'),
@@ -23,8 +35,42 @@ generate_oligos_model = api.model('GenerateOligos', {
     'oligo_conc': fields.Integer(default=250, description='Oligo concentration (nM)'),
     'simple_oligo_maker': fields.Boolean(default=False, description='Use simple oligo maker'),
     'gapped_oligo_maker': fields.Boolean(default=False, description='Use gapped oligo maker'),
+    'tm_balanced_oligo_maker': fields.Boolean(default=False, description='Choose all oligo boundaries together so overlaps are close to target_overlap_tm'),
+    'min_oligo_length': fields.Integer(description='Minimum oligo length for the Tm-balanced maker (default oligo_length - 20)'),
+    'min_overlap_length': fields.Integer(description='Minimum overlap length for the Tm-balanced maker (default overlap_length - 12)'),
+    'target_overlap_tm': fields.Float(default=62, description='Target overlap Tm (°C) for the Tm-balanced maker'),
     'clean_oligos': fields.Boolean(default=False, description='Clean oligos to remove secondary structures'),
-    'optimized_oligos': fields.Boolean(default=False, description='Optimize oligos for melting temperature')
+    'optimized_oligos': fields.Boolean(default=False, description='Optimize oligos for melting temperature'),
+    'cross_check_scope': fields.String(default='global', enum=['fragment', 'pool', 'global'], description='Which oligos clean_oligos and validate_overlaps check against each other; streaming requires fragment'),
+    'pools': fields.Raw(description='Fragment name to assembly pool name, used with cross_check_scope=pool'),
+    'stream': fields.Boolean(default=False, description='Return NDJSON records per fragment as they are designed'),
+    'validate_overlaps': fields.Boolean(default=False, description='Flag assembly overlaps that are not unique within cross_check_scope'),
+    'overlap_kmer': fields.Integer(default=DEFAULT_OVERLAP_K, description=f'k-mer length compared between overlaps (8-{MAX_OVERLAP_K})'),
+    'overlap_mismatches': fields.Integer(default=1, description='Mismatches tolerated when comparing overlap k-mers (0 or 1)'),
+    'use_inventory': fields.Boolean(default=False, description='Report which oligos are already stocked and pool them from the inventory'),
+    'dest_well_format': fields.String(default='96-column', description='Destination plate well format for inventory pooling')
+})
+
+design_library_model = api.model('DesignLibrary', {
+    'sequence': fields.String(required=True, description='Constructs in multi-FASTA format, one record per construct'),
+    'oligo_length': fields.Integer(default=60, description='Oligo length'),
+    'overlap_length': fields.Integer(default=30, description='Overlap length'),
+    'gap_length': fields.Integer(default=20, description='Gap length for gapped oligo maker'),
+    'na_conc': fields.Integer(default=50, description='Na+ concentration (mM)'),
+    'k_conc': fields.Integer(default=0, description='K+ concentration (mM)'),
+    'oligo_conc': fields.Integer(default=250, description='Oligo concentration (nM)'),
+    'simple_oligo_maker': fields.Boolean(default=False, description='Use simple oligo maker'),
+    'gapped_oligo_maker': fields.Boolean(default=False, description='Use gapped oligo maker'),
+    'tm_balanced_oligo_maker': fields.Boolean(default=False, description='Use the Tm-balanced oligo maker'),
+    'min_oligo_length': fields.Integer(description='Minimum oligo length for the Tm-balanced maker (default oligo_length - 20)'),
+    'min_overlap_length': fields.Integer(description='Minimum overlap length for the Tm-balanced maker (default overlap_length - 12)'),
+    'target_overlap_tm': fields.Float(default=62, description='Target overlap Tm (°C) for the Tm-balanced maker'),
+    'clean_oligos': fields.Boolean(default=False, description='Clean the oligos of each construct'),
+    'optimized_oligos': fields.Boolean(default=False, description='Optimize the oligos of each construct'),
+    'dedupe_reverse_complements': fields.Boolean(default=True, description='Order an oligo once when another construct needs its reverse complement'),
+    'use_inventory': fields.Boolean(default=False, description='Pool oligos already stocked in the inventory instead of ordering them'),
+    'well_format': fields.String(default='96-column', description='Source plate well format'),
+    'dest_well_format': fields.String(default='96-column', description='Destination plate well format')
 })
 
 custom_mutagenesis_model = api.model('CustomMutagenesis', {
@@ -54,6 +100,15 @@ generate_primers_model = api.model('GeneratePrimers', {
     'options': fields.Raw(description='Advanced primer generation options')
 })
 
+inventory_stock_model = api.model('InventoryStock', {
+    'oligos': fields.List(fields.Raw, description='Stocked oligos: plate, well, sequence and optional name/volume'),
+    'oligos_csv': fields.String(description='CSV with Plate, Well, Sequence and optional Name/Volume columns (e.g. oligos_to_order.csv)')
+})
+
+inventory_lookup_model = api.model('InventoryLookup', {
+    'sequences': fields.List(fields.String, required=True, description='Oligo sequences to look up')
+})
+
 recycle_model = api.model('RecycleOligos', {
     'fragments_csv': fields.String(required=True, description='Content of the fragments CSV file'),
     'pooling_csv': fields.String(required=True, description='Content of the pooling CSV file')
@@ -88,6 +143,16 @@ def get_models(api_instance):
         'sequence': fields.String(required=True, description='DNA sequence to analyze')
     })
 
+    sequence_profile_model_real = api_instance.model('SequenceProfile', {
+        'sequence': fields.String(required=True, description='DNA sequence, raw or FASTA (multi-megabase inputs accepted)'),
+        'sequence_name': fields.String(description='Name used when the sequence is not FASTA'),
+        'window': fields.Integer(default=100, description='Window size in bases'),
+        'step': fields.Integer(description='Step between windows (defaults to the window size)'),
+        'na_conc': fields.Integer(default=50, description='Na+ concentration (mM)'),
+        'k_conc': fields.Integer(default=0, description='K+ concentration (mM)'),
+        'oligo_conc': fields.Integer(default=250, description='Oligo concentration (nM)')
+    })
+
     generate_oligos_model_real = api_instance.model('GenerateOligos', {
         'sequence': fields.String(required=True, description='DNA sequence in FASTA format'),
         'oligo_length': fields.Integer(default=60, description='Oligo length'),
@@ -98,8 +163,42 @@ def get_models(api_instance):
         'oligo_conc': fields.Integer(default=250, description='Oligo concentration (nM)'),
         'simple_oligo_maker': fields.Boolean(default=False, description='Use simple oligo maker'),
         'gapped_oligo_maker': fields.Boolean(default=False, description='Use gapped oligo maker'),
+        'tm_balanced_oligo_maker': fields.Boolean(default=False, description='Choose all oligo boundaries together so overlaps are close to target_overlap_tm'),
+        'min_oligo_length': fields.Integer(description='Minimum oligo length for the Tm-balanced maker (default oligo_length - 20)'),
+        'min_overlap_length': fields.Integer(description='Minimum overlap length for the Tm-balanced maker (default overlap_length - 12)'),
+        'target_overlap_tm': fields.Float(default=62, description='Target overlap Tm (°C) for the Tm-balanced maker'),
         'clean_oligos': fields.Boolean(default=False, description='Clean oligos to remove secondary structures'),
-        'optimized_oligos': fields.Boolean(default=False, description='Optimize oligos for melting temperature')
+        'optimized_oligos': fields.Boolean(default=False, description='Optimize oligos for melting temperature'),
+        'cross_check_scope': fields.String(default='global', enum=['fragment', 'pool', 'global'], description='Which oligos clean_oligos and validate_overlaps check against each other; streaming requires fragment'),
+        'pools': fields.Raw(description='Fragment name to assembly pool name, used with cross_check_scope=pool'),
+        'stream': fields.Boolean(default=False, description='Return NDJSON records per fragment as they are designed'),
+        'validate_overlaps': fields.Boolean(default=False, description='Flag assembly overlaps that are not unique within cross_check_scope'),
+        'overlap_kmer': fields.Integer(default=DEFAULT_OVERLAP_K, description=f'k-mer length compared between overlaps (8-{MAX_OVERLAP_K})'),
+        'overlap_mismatches': fields.Integer(default=1, description='Mismatches tolerated when comparing overlap k-mers (0 or 1)'),
+        'use_inventory': fields.Boolean(default=False, description='Report which oligos are already stocked and pool them from the inventory'),
+        'dest_well_format': fields.String(default='96-column', description='Destination plate well format for inventory pooling')
+    })
+
+    design_library_model_real = api_instance.model('DesignLibrary', {
+        'sequence': fields.String(required=True, description='Constructs in multi-FASTA format, one record per construct'),
+        'oligo_length': fields.Integer(default=60, description='Oligo length'),
+        'overlap_length': fields.Integer(default=30, description='Overlap length'),
+        'gap_length': fields.Integer(default=20, description='Gap length for gapped oligo maker'),
+        'na_conc': fields.Integer(default=50, description='Na+ concentration (mM)'),
+        'k_conc': fields.Integer(default=0, description='K+ concentration (mM)'),
+        'oligo_conc': fields.Integer(default=250, description='Oligo concentration (nM)'),
+        'simple_oligo_maker': fields.Boolean(default=False, description='Use simple oligo maker'),
+        'gapped_oligo_maker': fields.Boolean(default=False, description='Use gapped oligo maker'),
+        'tm_balanced_oligo_maker': fields.Boolean(default=False, description='Use the Tm-balanced oligo maker'),
+        'min_oligo_length': fields.Integer(description='Minimum oligo length for the Tm-balanced maker (default oligo_length - 20)'),
+        'min_overlap_length': fields.Integer(description='Minimum overlap length for the Tm-balanced maker (default overlap_length - 12)'),
+        'target_overlap_tm': fields.Float(default=62, description='Target overlap Tm (°C) for the Tm-balanced maker'),
+        'clean_oligos': fields.Boolean(default=False, description='Clean the oligos of each construct'),
+        'optimized_oligos': fields.Boolean(default=False, description='Optimize the oligos of each construct'),
+        'dedupe_reverse_complements': fields.Boolean(default=True, description='Order an oligo once when another construct needs its reverse complement'),
+        'use_inventory': fields.Boolean(default=False, description='Pool oligos already stocked in the inventory instead of ordering them'),
+        'well_format': fields.String(default='96-column', description='Source plate well format'),
+        'dest_well_format': fields.String(default='96-column', description='Destination plate well format')
     })
 
     custom_mutagenesis_model_real = api_instance.model('CustomMutagenesis', {
@@ -129,6 +228,15 @@ def get_models(api_instance):
         'options': fields.Raw(description='Advanced primer generation options')
     })
 
+    inventory_stock_model_real = api_instance.model('InventoryStock', {
+        'oligos': fields.List(fields.Raw, description='Stocked oligos: plate, well, sequence and optional name/volume'),
+        'oligos_csv': fields.String(description='CSV with Plate, Well, Sequence and optional Name/Volume columns (e.g. oligos_to_order.csv)')
+    })
+
+    inventory_lookup_model_real = api_instance.model('InventoryLookup', {
+        'sequences': fields.List(fields.String, required=True, description='Oligo sequences to look up')
+    })
+
     recycle_model_real = api_instance.model('RecycleOligos', {
         'fragments_csv': fields.String(required=True, description='Content of the fragments CSV file'),
         'pooling_csv': fields.String(required=True, description='Content of the pooling CSV file')
@@ -156,12 +264,16 @@ def get_models(api_instance):
 
     return {
         'sequence_model': sequence_model_real,
+        'sequence_profile_model': sequence_profile_model_real,
         'generate_oligos_model': generate_oligos_model_real,
+        'design_library_model': design_library_model_real,
         'custom_mutagenesis_model': custom_mutagenesis_model_real,
         'saturation_mutagenesis_model': saturation_mutagenesis_model_real,
         'scanning_library_model': scanning_library_model_real,
         'generate_primers_model': generate_primers_model_real,
         'recycle_model': recycle_model_real,
+        'inventory_stock_model': inventory_stock_model_real,
+        'inventory_lookup_model': inventory_lookup_model_real,
         'download_oligos_csv_model': download_oligos_csv_model_real,
         'download_primers_csv_model': download_primers_csv_model_real,
         'download_pooling_model': download_pooling_model_real
@@ -1,7 +1,10 @@
 """
 Health check endpoints
 """
+from flask import request
 from flask_restx import Resource, Namespace
+from app.utils.thermo_cache import thermo_cache_stats, clear_thermo_cache
+from app.utils.optimize_checkpoint import get_optimize_checkpoint
 
 # Crear namespace
 health_ns = Namespace('health', description='Health check operations')
@@ -15,4 +18,24 @@ class Health(Resource):
             'status': 'healthy',
             'service': 'Ramon ADN - Oligo Toolkit API',
             'version': '1.0'
-        }
\ No newline at end of file
+        }
+
+def _cache_status():
+    checkpoint = get_optimize_checkpoint()
+    return {
+        **thermo_cache_stats(),
+        'optimize_checkpoint': checkpoint.stats() if checkpoint is not None else None
+    }
+
+@health_ns.route('/cache')
+class ThermoCacheStatus(Resource):
+    @health_ns.doc('thermo_cache_stats')
+    def get(self):
+        """Thermodynamic cache and optimize checkpoint statistics"""
+        return _cache_status()
+
+    @health_ns.doc('thermo_cache_clear')
+    def delete(self):
+        """Clear the thermodynamic caches (?store=true also clears the shared store)"""
+        clear_thermo_cache(include_store=request.args.get('store', 'false').lower() == 'true')
+        return _cache_status()
@@ -0,0 +1,102 @@
+"""
+Oligo inventory endpoints
+"""
+from io import StringIO
+
+import pandas as pd
+from flask import request
+from flask_restx import Resource, Namespace
+from app.models.swagger_models import inventory_stock_model, inventory_lookup_model
+from app.utils.oligo_inventory import get_inventory
+
+inventory_ns = Namespace('inventory', description='Stocked oligo inventory')
+
+NOT_CONFIGURED = {'error': 'The oligo inventory is not configured (OLIGO_INVENTORY_PATH)'}, 400
+
+def _oligos_from_csv(text):
+    df = pd.read_csv(StringIO(text))
+    df.columns = [column.strip().lower() for column in df.columns]
+    missing = {'plate', 'well', 'sequence'} - set(df.columns)
+    if missing:
+        raise ValueError(f"CSV is missing columns: {', '.join(sorted(missing))}")
+    # A column of digits would otherwise be read as numbers.
+    df['sequence'] = df['sequence'].astype('string')
+    df = df.astype(object).where(df.notna(), None)
+    return [
+        {key: row.get(key) for key in ('plate', 'well', 'sequence', 'name', 'volume')}
+        for row in df.to_dict('records')
+    ]
+
+@inventory_ns.route('/')
+class Inventory(Resource):
+    @inventory_ns.doc('inventory_stats')
+    def get(self):
+        """Inventory size and lookup statistics"""
+        inventory = get_inventory()
+        if inventory is None:
+            return NOT_CONFIGURED
+        return inventory.stats()
+
+    @inventory_ns.expect(inventory_stock_model)
+    @inventory_ns.doc('inventory_stock')
+    def post(self):
+        """Register stocked oligos (a list or an ordering CSV)"""
+        inventory = get_inventory()
+        if inventory is None:
+            return NOT_CONFIGURED
+        try:
+            data = request.get_json()
+            if not data:
+                return {'error': 'Request body is required'}, 400
+
+            oligos = data.get('oligos') or []
+            if not isinstance(oligos, list) or not all(
+                    isinstance(oligo, dict) and isinstance(oligo.get('sequence'), str) for oligo in oligos):
+                return {'error': 'oligos must be a list of objects with a sequence string'}, 400
+            if data.get('oligos_csv'):
+                oligos = oligos + _oligos_from_csv(data['oligos_csv'])
+            if not oligos:
+                return {'error': 'No oligos provided'}, 400
+            if any(not oligo.get('plate') or not oligo.get('well') or not oligo.get('sequence') for oligo in oligos):
+                return {'error': 'Every oligo needs a plate, a well and a sequence'}, 400
+
+            added = inventory.add(oligos)
+            return {'success': True, 'added': added, **inventory.stats()}
+
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        except Exception as e:
+            print(f"Error stocking oligos: {e}")
+            return {'error': 'An unexpected error occurred while stocking oligos'}, 500
+
+    @inventory_ns.doc('inventory_remove_plate')
+    def delete(self):
+        """Remove a plate from the inventory (?plate=<name>)"""
+        inventory = get_inventory()
+        if inventory is None:
+            return NOT_CONFIGURED
+        plate = request.args.get('plate')
+        if not plate:
+            return {'error': 'plate is required'}, 400
+        return {'success': True, 'removed': inventory.remove_plate(plate)}
+
+@inventory_ns.route('/lookup')
+class InventoryLookup(Resource):
+    @inventory_ns.expect(inventory_lookup_model)
+    @inventory_ns.doc('inventory_lookup')
+    def post(self):
+        """Stocked wells for a list of sequences"""
+        inventory = get_inventory()
+        if inventory is None:
+            return NOT_CONFIGURED
+        data = request.get_json() or {}
+        sequences = data.get('sequences') or []
+        if not isinstance(sequences, list) or not all(isinstance(seq, str) for seq in sequences):
+            return {'error': 'sequences must be a list of strings'}, 400
+
+        found = inventory.find_many(sequences)
+        return {
+            'found': len(found),
+            'missing': len(set(sequences)) - len(found),
+            'stocked': found
+        }
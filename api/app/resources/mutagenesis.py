@@ -1,10 +1,11 @@
 """
 Mutagenesis endpoints
 """
+import itertools
 from flask import request
 from flask_restx import Resource, Namespace
 from app.utils.mutagenesis_utils import generate_custom_mutagenesis, generate_saturation_mutagenesis, generate_scanning_library
-from app.utils.sequence_utils import parse_multi_fasta
+from app.utils.sequence_utils import parse_multi_fasta, iter_multi_fasta
 from app.models.swagger_models import custom_mutagenesis_model, saturation_mutagenesis_model, scanning_library_model
 
 mutagenesis_ns = Namespace('mutagenesis', description='Mutagenesis operations')
@@ -89,16 +90,12 @@ class SaturationMutagenesis(Resource):
             if not saturation_mutations:
                 return {'error': 'Saturation mutations list is required'}, 400
 
-            # Parse FASTA sequences
-            sequences = parse_multi_fasta(fasta_content)
-
-            # DEBUG: Log parsed sequences
-            print(f'🔥 BACKEND - Parsed sequences count: {len(sequences) if sequences else 0}')
-            if sequences:
-                for i, seq in enumerate(sequences):
-                    print(f'🔥 BACKEND - Sequence {i}: name="{seq.get("name", "NONAME")}", length={len(seq.get("seq", ""))}')
+            # Parse FASTA sequences lazily; records after the first are read
+            # while variants for the earlier ones are being generated.
+            sequences = iter_multi_fasta(fasta_content)
+            first_sequence = next(sequences, None)
 
-            if not sequences:
+            if first_sequence is None:
                 print('❌ BACKEND - No sequences parsed from FASTA')
                 return {'error': 'No valid sequences found in FASTA content'}, 400
 
@@ -140,9 +137,21 @@ class SaturationMutagenesis(Resource):
                 print('❌ BACKEND - No valid mutations parsed')
                 return {'error': 'No valid mutations found. Use format like {"type": "AA", "pos": 123} or "123-NNN"'}, 400
 
+            sequences_processed = [0]
+
+            def counted_sequences():
+                for seq in itertools.chain([first_sequence], sequences):
+                    sequences_processed[0] += 1
+                    yield seq
+
             # Pass sequences directly - mutagenesis_utils.py now handles both formats
             print('🔥 BACKEND - Calling generate_saturation_mutagenesis...')
-            result = generate_saturation_mutagenesis(sequences, parsed_mutations, exclude_stops, generation_mode)
+            if generation_mode in ('group', 'group_degenerate'):
+                # Combinatorial modes only design from the first record.
+                result = generate_saturation_mutagenesis([first_sequence], parsed_mutations, exclude_stops, generation_mode)
+                sequences_processed[0] = sum(1 for _ in counted_sequences())
+            else:
+                result = generate_saturation_mutagenesis(counted_sequences(), parsed_mutations, exclude_stops, generation_mode)
 
             if include_original:
                 result.insert(0, fasta_content)
@@ -157,7 +166,7 @@ class SaturationMutagenesis(Resource):
                 'variants': result,
                 'total_count': len(result),
                 'parameters': {
-                    'sequences_processed': len(sequences),
+                    'sequences_processed': sequences_processed[0],
                     'mutations_applied': len(parsed_mutations),
                     'exclude_stops': exclude_stops
                 }
@@ -1,16 +1,25 @@
 """
 Oligo generation endpoints
 """
-from flask import request
+import itertools
+import json
+from flask import request, current_app, Response, send_file, stream_with_context
 from flask_restx import Resource, Namespace
-from app.utils.sequence_utils import parse_multi_fasta
-from app.utils.oligo_utils import simple_oligo_maker, generate_gapped_oligos, clean_oligos, optimize_oligos
+from app.utils.sequence_utils import iter_multi_fasta
+from app.utils.oligo_utils import iter_simple_oligos, iter_gapped_oligos, tm_balanced_oligo_maker, clean_oligos, optimize_oligos, AcceptanceStats
+from app.utils.interaction_utils import PoolInteractions
+from app.utils.oligo_set import OligoSet
+from app.utils.overlap_utils import validate_overlaps, DEFAULT_OVERLAP_K, MAX_OVERLAP_K
+from app.utils.library_utils import OligoLibrary, iter_library_designs, write_library_zip
+from app.utils.oligo_inventory import get_inventory, inventory_pooling
+from app.utils.optimize_checkpoint import get_optimize_checkpoint
 from app.utils.primer_utils import generate_primers
-from app.models.swagger_models import generate_oligos_model
+from app.models.swagger_models import generate_oligos_model, design_library_model
 from app.utils.recycle_utils import recycle_oligos
 from app.utils.file_plate_utils import download_pooling_and_dilution_plate_files, generate_list, generate_dilution_plate_csv
 import pandas as pd
 import io
+import tempfile
 import zipfile
 import base64
 from app.utils.file_plate_utils import get_well_position
@@ -19,6 +28,72 @@ from app.utils.file_plate_utils import get_fragment_destination_map
 # Crear namespace
 oligos_ns = Namespace('oligos', description='Oligo generation operations')
 
+CROSS_CHECK_SCOPES = ('fragment', 'pool', 'global')
+
+# Oligos serialized per NDJSON chunk
+STREAM_CHUNK_OLIGOS = 1000
+
+def _fragment_primers(name, seq):
+    primers = generate_primers(seq)
+    return [
+        {'fragment': name, 'name': 'forward_primer', 'sequence': primers['forward_primer']},
+        {'fragment': name, 'name': 'reverse_primer', 'sequence': primers['reverse_primer']}
+    ]
+
+def iter_generate_records(records, make_oligos, post_process, parameters, acceptance_stats=None, validate=None):
+    """NDJSON lines with the oligos and primers of every record as soon as it is designed.
+
+    Without post-processing the oligos go out in chunks straight from the
+    maker, so no fragment is ever held in memory as a whole. post_process
+    (cleaning/optimization) needs a complete fragment and works on one
+    fragment at a time, as an OligoSet. validate does the same and its
+    result follows the fragment's oligos as an 'overlap_validation' line.
+    """
+    fragments = 0
+    total_count = 0
+    for record in records:
+        fragments += 1
+        name = record.get('name', 'fragment')
+        if not record.get('seq'):
+            continue
+        yield json.dumps({'type': 'fragment', 'name': name, 'length': len(record['seq'])}) + '\n'
+
+        try:
+            oligos = (o for o in make_oligos(record['seq']) if o and 'sequence' in o)
+            validation = None
+            if post_process is not None or validate is not None:
+                oligo_set = OligoSet.from_dicts(oligos, fragment=name)
+                if post_process is not None:
+                    oligo_set = post_process(oligo_set)
+                if validate is not None:
+                    validation = validate(oligo_set)
+                oligos = oligo_set.iter_dicts()
+            else:
+                oligos = ({**o, 'fragment': name} for o in oligos)
+            while True:
+                chunk = list(itertools.islice(oligos, STREAM_CHUNK_OLIGOS))
+                if not chunk:
+                    break
+                total_count += len(chunk)
+                yield json.dumps({'type': 'oligos', 'name': name, 'oligos': chunk}) + '\n'
+            if validation is not None:
+                yield json.dumps({'type': 'overlap_validation', 'name': name, **validation}) + '\n'
+
+            yield json.dumps({'type': 'primers', 'name': name, 'primers': _fragment_primers(name, record['seq'])}) + '\n'
+        except Exception as e:
+            print(f"Error processing fragment {name}: {e}")
+            yield json.dumps({'type': 'error', 'name': name, 'error': 'Error processing fragment'}) + '\n'
+
+    summary = {
+        'type': 'summary',
+        'fragments': fragments,
+        'total_count': total_count,
+        'parameters': parameters
+    }
+    if acceptance_stats is not None:
+        summary['acceptance_stats'] = acceptance_stats.as_dict()
+    yield json.dumps(summary) + '\n'
+
 @oligos_ns.route('/generate')
 class GenerateOligos(Resource):
     @oligos_ns.expect(generate_oligos_model)
@@ -42,73 +117,149 @@ class GenerateOligos(Resource):
                 na_conc = max(1, min(1000, int(data.get('na_conc', 50))))
                 k_conc = max(0, min(1000, int(data.get('k_conc', 0))))
                 oligo_conc = max(1, min(10000, int(data.get('oligo_conc', 250))))
+                # Tm-balanced design: oligo_length and overlap_length are the upper bounds.
+                min_oligo_length = max(10, min(oligo_length, int(data.get('min_oligo_length', oligo_length - 20))))
+                min_overlap_length = max(5, min(overlap_length, int(data.get('min_overlap_length', overlap_length - 12))))
+                target_overlap_tm = max(30.0, min(90.0, float(data.get('target_overlap_tm', 62))))
+                overlap_kmer = max(8, min(MAX_OVERLAP_K, int(data.get('overlap_kmer', DEFAULT_OVERLAP_K))))
+                overlap_mismatches = max(0, min(1, int(data.get('overlap_mismatches', 1))))
             except (ValueError, TypeError) as e:
                 return {'error': f'Invalid parameter value: {str(e)}'}, 400
 
             simple_oligo_maker_checked = bool(data.get('simple_oligo_maker', False))
             gapped_oligo_maker_checked = bool(data.get('gapped_oligo_maker', False))
+            tm_balanced_oligo_maker_checked = bool(data.get('tm_balanced_oligo_maker', False))
             clean_oligos_checked = bool(data.get('clean_oligos', False))
             optimized_oligos_checked = bool(data.get('optimized_oligos', False))
             recycle_oligos_checked = bool(data.get('recycle_oligos', False))
+            validate_overlaps_checked = bool(data.get('validate_overlaps', False))
+            use_inventory_checked = bool(data.get('use_inventory', False))
+            if use_inventory_checked and get_inventory() is None:
+                return {'error': 'The oligo inventory is not configured (OLIGO_INVENTORY_PATH)'}, 400
+
+            # Which oligos clean_oligos cross-checks: all of them (default),
+            # those of the same fragment, or of the same user-defined pool.
+            cross_check_scope = data.get('cross_check_scope', 'global')
+            if cross_check_scope not in CROSS_CHECK_SCOPES:
+                return {'error': f"cross_check_scope must be one of {', '.join(CROSS_CHECK_SCOPES)}"}, 400
+            fragment_pools = data.get('pools') or {}
+            if not isinstance(fragment_pools, dict) or not all(
+                    isinstance(name, str) and isinstance(pool, str) for name, pool in fragment_pools.items()):
+                return {'error': 'pools must map fragment names to pool names'}, 400
 
             # Validate that at least one method is selected
-            if not (simple_oligo_maker_checked or gapped_oligo_maker_checked):
-                return {'error': 'Please select either simple or gapped oligo maker'}, 400
+            if not (simple_oligo_maker_checked or gapped_oligo_maker_checked or tm_balanced_oligo_maker_checked):
+                return {'error': 'Please select either simple, gapped or Tm-balanced oligo maker'}, 400
 
-            # Parse FASTA sequence
-            fragments = parse_multi_fasta(sequence)
-            if not fragments:
-                return {'error': 'Invalid FASTA sequence or no valid sequences found'}, 400
+            def make_oligos(seq):
+                if tm_balanced_oligo_maker_checked:
+                    return tm_balanced_oligo_maker(
+                        seq, min_oligo_length, oligo_length, min_overlap_length, overlap_length,
+                        target_overlap_tm, na_conc, k_conc, oligo_conc
+                    )
+                if gapped_oligo_maker_checked:
+                    return iter_gapped_oligos(seq, oligo_length, overlap_length, gap_length)
+                return iter_simple_oligos(seq, oligo_length, overlap_length)
+
+            parameters = {
+                'oligo_length': oligo_length,
+                'overlap_length': overlap_length,
+                'gap_length': gap_length,
+                'simple_oligo_maker': simple_oligo_maker_checked,
+                'gapped_oligo_maker': gapped_oligo_maker_checked,
+                'tm_balanced_oligo_maker': tm_balanced_oligo_maker_checked,
+                'clean_oligos': clean_oligos_checked,
+                'optimized_oligos': optimized_oligos_checked,
+                'recycle_oligos': recycle_oligos_checked,
+                'cross_check_scope': cross_check_scope,
+                'validate_overlaps': validate_overlaps_checked,
+                'use_inventory': use_inventory_checked
+            }
+            if validate_overlaps_checked:
+                parameters['overlap_kmer'] = overlap_kmer
+                parameters['overlap_mismatches'] = overlap_mismatches
+
+            if bool(data.get('stream', False)):
+                return self._stream(sequence, make_oligos, parameters, na_conc, k_conc, oligo_conc)
 
-            current_oligos = []
+            # Parse FASTA records lazily so each fragment is designed as soon
+            # as it has been read.
+            fragment_names = []
+            fragment_sets = []
             current_primers = []
-            for fr in fragments:
+            for fr in iter_multi_fasta(sequence):
+                fragment_names.append(fr.get('name', 'fragment'))
                 if not fr.get('seq'):
                     continue
 
-                oligos = []
                 try:
-                    if gapped_oligo_maker_checked:
-                        oligos = generate_gapped_oligos(fr['seq'], oligo_length, overlap_length, gap_length)
-                    elif simple_oligo_maker_checked:
-                        oligos = simple_oligo_maker(fr['seq'], oligo_length, overlap_length)
-
-                    for o in oligos:
-                        if o and 'sequence' in o:
-                            current_oligos.append({
-                                **o,
-                                'fragment': fr.get('name', 'fragment')
-                            })
+                    constants = {'fragment': fr.get('name', 'fragment')}
+                    if cross_check_scope == 'pool':
+                        # Fragments not assigned to a pool get a well of their own.
+                        constants['pool'] = fragment_pools.get(constants['fragment'], constants['fragment'])
+                    fragment_sets.append(OligoSet.from_dicts(
+                        (o for o in make_oligos(fr['seq']) if o and 'sequence' in o),
+                        **constants
+                    ))
                     
-                    primers = generate_primers(fr['seq'])
-                    current_primers.append({
-                        'fragment': fr.get('name', 'fragment'),
-                        'name': 'forward_primer',
-                        'sequence': primers['forward_primer']
-                    })
-                    current_primers.append({
-                        'fragment': fr.get('name', 'fragment'),
-                        'name': 'reverse_primer',
-                        'sequence': primers['reverse_primer']
-                    })
+                    current_primers.extend(_fragment_primers(fr.get('name', 'fragment'), fr['seq']))
 
                 except Exception as e:
                     print(f"Error processing fragment {fr.get('name', 'unknown')}: {e}")
                     continue
 
-            if not current_oligos:
+            if not fragment_names:
+                return {'error': 'Invalid FASTA sequence or no valid sequences found'}, 400
+
+            current_set = OligoSet.concat(fragment_sets)
+            if not len(current_set):
                 return {'error': 'No oligos could be generated from the provided sequence'}, 400
 
             # Apply optional processing
+            interactions = None
+            acceptance_stats = None
             try:
+                if optimized_oligos_checked:
+                    # Built once and carried through cleaning so optimization
+                    # only recomputes the oligos that cleaning trimmed.
+                    interactions = PoolInteractions(current_set)
+                    acceptance_stats = AcceptanceStats()
+
                 if clean_oligos_checked:
-                    current_oligos = clean_oligos(current_oligos)
+                    current_set = clean_oligos(
+                        current_set,
+                        interactions=interactions,
+                        scope=None if cross_check_scope == 'global' else cross_check_scope
+                    )
 
                 if optimized_oligos_checked:
-                    current_oligos = optimize_oligos(current_oligos, na_conc, k_conc, oligo_conc)
+                    current_set = optimize_oligos(
+                        current_set, na_conc, k_conc, oligo_conc,
+                        interactions=interactions,
+                        workers=current_app.config.get('OPTIMIZE_WORKERS', 1),
+                        stats=acceptance_stats,
+                        checkpoint=get_optimize_checkpoint()
+                    )
             except Exception as e:
                 print(f"Error in post-processing: {e}")
 
+            # Junction overlaps are compared within the same scope cleaning uses.
+            overlap_validation = None
+            if validate_overlaps_checked:
+                overlap_validation = validate_overlaps(
+                    current_set, overlap_kmer, overlap_mismatches,
+                    scope=None if cross_check_scope == 'global' else cross_check_scope
+                )
+
+            # Oligos are only turned back into dicts for recycling and the response.
+            current_oligos = current_set.to_dicts()
+
+            inventory_report = None
+            if use_inventory_checked:
+                inventory_report = inventory_pooling(
+                    current_oligos, get_inventory(), data.get('dest_well_format', '96-column')
+                )
+
             recycled_pooling_data = None
             if recycle_oligos_checked:
                 well_format = data.get('well_format', '96-column')
@@ -118,16 +269,19 @@ class GenerateOligos(Resource):
                 # Group oligos by fragment
                 oligos_by_fragment = {}
                 fragment_order = []
-                for fr in fragments:
-                    name = fr.get('name', 'fragment')
+                for name in fragment_names:
                     fragment_order.append(name)
                     oligos_by_fragment[name] = []
 
                 for oligo in current_oligos:
                     oligos_by_fragment[oligo['fragment']].append(oligo)
 
-                # Determine unique oligos to order and their locations
+                # Determine unique oligos to order and their locations;
+                # stocked oligos are pooled from their inventory well.
                 seen_oligos_map = {}
+                if inventory_report is not None:
+                    for row in inventory_report['pooling']:
+                        seen_oligos_map[row['Sequence']] = {'Plate': row['Plate Source'], 'Well': row['Well Source']}
                 oligos_to_order = []
                 plate_num = 1
                 well_idx = 0
@@ -201,23 +355,160 @@ class GenerateOligos(Resource):
                 'oligos': current_oligos,
                 'primers': current_primers,
                 'total_count': len(current_oligos),
-                'parameters': {
-                    'oligo_length': oligo_length,
-                    'overlap_length': overlap_length,
-                    'gap_length': gap_length,
-                    'simple_oligo_maker': simple_oligo_maker_checked,
-                    'gapped_oligo_maker': gapped_oligo_maker_checked,
-                    'clean_oligos': clean_oligos_checked,
-                    'optimized_oligos': optimized_oligos_checked,
-                    'recycle_oligos': recycle_oligos_checked
-                }
+                'parameters': parameters
             }
 
             if recycled_pooling_data:
                 response_data['recycled_pooling_data'] = recycled_pooling_data
 
+            if overlap_validation is not None:
+                response_data['overlap_validation'] = overlap_validation
+
+            if inventory_report is not None:
+                response_data['inventory'] = inventory_report
+
+            if interactions is not None:
+                response_data['interaction_stats'] = interactions.stats()
+
+            if acceptance_stats is not None:
+                response_data['acceptance_stats'] = acceptance_stats.as_dict()
+
             return response_data
 
         except Exception as e:
             print(f"Unexpected error in oligo generation: {e}")
-            return {'error': 'An unexpected error occurred during oligo generation'}, 500
\ No newline at end of file
+            return {'error': 'An unexpected error occurred during oligo generation'}, 500
+
+    def _stream(self, sequence, make_oligos, parameters, na_conc, k_conc, oligo_conc):
+        """NDJSON response: one 'fragment' line, 'oligos' chunks and a 'primers'
+        line per record, then a 'summary' line."""
+        # Every option below needs the whole request before it can emit anything.
+        if parameters['recycle_oligos']:
+            return {'error': 'recycle_oligos is not available when streaming'}, 400
+        if parameters['use_inventory']:
+            return {'error': 'use_inventory is not available when streaming'}, 400
+        if (parameters['clean_oligos'] or parameters['validate_overlaps']) and parameters['cross_check_scope'] != 'fragment':
+            return {'error': 'Streaming checks each fragment on its own; set cross_check_scope to fragment'}, 400
+
+        records = iter_multi_fasta(sequence)
+        first_record = next(records, None)
+        if first_record is None:
+            return {'error': 'Invalid FASTA sequence or no valid sequences found'}, 400
+        records = itertools.chain([first_record], records)
+
+        workers = current_app.config.get('OPTIMIZE_WORKERS', 1)
+        checkpoint = get_optimize_checkpoint()
+        acceptance_stats = AcceptanceStats() if parameters['optimized_oligos'] else None
+
+        post_process = None
+        if parameters['clean_oligos'] or parameters['optimized_oligos']:
+            def post_process(oligos):
+                # Each fragment is cleaned and optimized against itself only.
+                interactions = PoolInteractions(oligos) if parameters['optimized_oligos'] else None
+                if parameters['clean_oligos']:
+                    oligos = clean_oligos(oligos, interactions=interactions)
+                if parameters['optimized_oligos']:
+                    oligos = optimize_oligos(
+                        oligos, na_conc, k_conc, oligo_conc,
+                        interactions=interactions, workers=workers, stats=acceptance_stats,
+                        checkpoint=checkpoint
+                    )
+                return oligos
+
+        validate = None
+        if parameters['validate_overlaps']:
+            def validate(oligos):
+                return validate_overlaps(oligos, parameters['overlap_kmer'], parameters['overlap_mismatches'])
+
+        return Response(
+            stream_with_context(iter_generate_records(records, make_oligos, post_process, parameters, acceptance_stats, validate)),
+            mimetype='application/x-ndjson'
+        )
+
+@oligos_ns.route('/library')
+class DesignLibrary(Resource):
+    @oligos_ns.expect(design_library_model)
+    def post(self):
+        """Design a construct library and order every shared oligo once.
+
+        Each FASTA record is a construct assembled in its own destination
+        well. Returns a ZIP with oligos_to_order.csv, pooling.csv and
+        summary.json.
+        """
+        try:
+            data = request.get_json()
+            if not data:
+                return {'error': 'Request body is required'}, 400
+
+            sequence = data.get('sequence', '').strip()
+            if not sequence:
+                return {'error': 'Sequence is required'}, 400
+
+            try:
+                oligo_length = max(10, min(200, int(data.get('oligo_length', 60))))
+                overlap_length = max(5, min(100, int(data.get('overlap_length', 30))))
+                design = {
+                    'oligo_length': oligo_length,
+                    'overlap_length': overlap_length,
+                    'gap_length': max(0, min(100, int(data.get('gap_length', 20)))),
+                    'na_conc': max(1, min(1000, int(data.get('na_conc', 50)))),
+                    'k_conc': max(0, min(1000, int(data.get('k_conc', 0)))),
+                    'oligo_conc': max(1, min(10000, int(data.get('oligo_conc', 250)))),
+                    'min_oligo_length': max(10, min(oligo_length, int(data.get('min_oligo_length', oligo_length - 20)))),
+                    'min_overlap_length': max(5, min(overlap_length, int(data.get('min_overlap_length', overlap_length - 12)))),
+                    'target_overlap_tm': max(30.0, min(90.0, float(data.get('target_overlap_tm', 62)))),
+                    'clean_oligos': bool(data.get('clean_oligos', False)),
+                    'optimized_oligos': bool(data.get('optimized_oligos', False))
+                }
+            except (ValueError, TypeError) as e:
+                return {'error': f'Invalid parameter value: {str(e)}'}, 400
+
+            if data.get('tm_balanced_oligo_maker'):
+                design['maker'] = 'tm_balanced'
+            elif data.get('gapped_oligo_maker'):
+                design['maker'] = 'gapped'
+            elif data.get('simple_oligo_maker'):
+                design['maker'] = 'simple'
+            else:
+                return {'error': 'Please select either simple, gapped or Tm-balanced oligo maker'}, 400
+
+            records = [
+                (fr.get('name', 'construct'), fr['seq'])
+                for fr in iter_multi_fasta(sequence) if fr.get('seq')
+            ]
+            if not records:
+                return {'error': 'Invalid FASTA sequence or no valid sequences found'}, 400
+
+            inventory = None
+            if data.get('use_inventory'):
+                inventory = get_inventory()
+                if inventory is None:
+                    return {'error': 'The oligo inventory is not configured (OLIGO_INVENTORY_PATH)'}, 400
+
+            library = OligoLibrary(
+                data.get('well_format', '96-column'),
+                reverse_complements=bool(data.get('dedupe_reverse_complements', True)),
+                inventory=inventory
+            )
+            designs = iter_library_designs(records, design, current_app.config.get('LIBRARY_WORKERS', 1))
+
+            # The archive is written to disk as constructs are designed and
+            # streamed from there, so it never sits in memory whole.
+            archive = tempfile.TemporaryFile()
+            try:
+                write_library_zip(archive, designs, library, data.get('dest_well_format', '96-column'))
+            except Exception:
+                archive.close()
+                raise
+            archive.seek(0)
+
+            return send_file(
+                archive,
+                mimetype='application/zip',
+                as_attachment=True,
+                download_name='oligo_library.zip'
+            )
+
+        except Exception as e:
+            print(f"Unexpected error in library design: {e}")
+            return {'error': 'An unexpected error occurred during library design'}, 500
@@ -1,9 +1,14 @@
 """
 Sequence analysis endpoints
 """
-from flask import request, current_app
+import json
+from flask import request, current_app, Response, stream_with_context
 from flask_restx import Resource, Namespace
-from app.utils.sequence_utils import get_reverse_complement, get_gc_content, get_tm
+import numpy as np
+from app.utils.sequence_utils import get_reverse_complement, get_gc_content, get_tm, iter_multi_fasta
+from app.utils.thermo_utils import ThermoProfile
+from app.utils.degenerate_utils import is_degenerate, get_degenerate_tm, get_degenerate_dg_full_complementary
+from app.models.swagger_models import sequence_profile_model
 
 # Crear namespace
 sequences_ns = Namespace('sequences', description='Sequence analysis operations')
@@ -44,7 +49,7 @@ class AnalyzeSequence(Resource):
                 gc_content = round(get_gc_content(sequence), 2)
                 tm = round(get_tm(sequence), 2)
 
-                return {
+                result = {
                     'success': True,
                     'reverse_complement': reverse_complement,
                     'gc_content': gc_content,
@@ -52,10 +57,92 @@ class AnalyzeSequence(Resource):
                     'original_sequence': sequence,
                     'length': len(sequence)
                 }
+
+                # get_tm skips ambiguous positions; report the range over
+                # every expansion instead of a misleading single value.
+                if is_degenerate(sequence):
+                    tm_range = get_degenerate_tm(sequence)
+                    dg_range = get_degenerate_dg_full_complementary(sequence)
+                    result['tm_degenerate'] = {key: round(value, 2) for key, value in tm_range.items()}
+                    result['dg_full_degenerate'] = {key: round(value, 2) for key, value in dg_range.items()}
+
+                return result
             except Exception as e:
                 print(f"Error calculating sequence properties: {e}")
                 return {'error': 'Error calculating sequence properties'}, 500
 
         except Exception as e:
             print(f"Unexpected error in sequence analysis: {e}")
-            return {'error': 'An unexpected error occurred during sequence analysis'}, 500
\ No newline at end of file
+            return {'error': 'An unexpected error occurred during sequence analysis'}, 500
+
+# Windows serialized per NDJSON chunk
+PROFILE_CHUNK_WINDOWS = 5000
+
+def iter_profile_records(records, window, step, na_conc, k_conc, oligo_conc):
+    """NDJSON lines with windowed GC, Tm and GC-skew tracks for every record."""
+    for record in records:
+        seq = record['seq']
+        profile = ThermoProfile(seq)
+        width = min(window, len(seq))
+        starts = np.arange(0, len(seq) - width + 1, step, dtype=np.int64)
+        yield json.dumps({
+            'type': 'sequence',
+            'name': record['name'],
+            'length': len(seq),
+            'window': width,
+            'step': step,
+            'windows': len(starts)
+        }) + '\n'
+
+        for chunk_start in range(0, len(starts), PROFILE_CHUNK_WINDOWS):
+            chunk = starts[chunk_start:chunk_start + PROFILE_CHUNK_WINDOWS]
+            ends = chunk + width
+            gc = profile.gc_windows(chunk, ends)
+            tm = profile.tm_windows(chunk, ends, na_conc, k_conc, oligo_conc)
+            skew = profile.gc_skew_windows(chunk, ends)
+            yield json.dumps({
+                'type': 'windows',
+                'name': record['name'],
+                'start': chunk.tolist(),
+                'gc_content': np.round(gc, 2).tolist(),
+                'tm': np.round(tm, 2).tolist(),
+                'gc_skew': np.round(skew, 4).tolist()
+            }) + '\n'
+
+@sequences_ns.route('/profile')
+class ProfileSequence(Resource):
+    @sequences_ns.expect(sequence_profile_model)
+    @sequences_ns.doc('profile_sequence')
+    def post(self):
+        """Stream sliding-window GC, Tm and GC-skew tracks as NDJSON"""
+        try:
+            data = request.get_json()
+            if not data:
+                return {'error': 'Request body is required'}, 400
+
+            sequence = data.get('sequence', '')
+            if not sequence.strip():
+                return {'error': 'Sequence is required'}, 400
+
+            max_length = current_app.config.get('PROFILE_MAX_LENGTH', 10000000)
+            if len(sequence) > max_length:
+                return {'error': f'Sequence too long (maximum {max_length:,} characters)'}, 400
+
+            try:
+                window = max(2, min(1000000, int(data.get('window', 100))))
+                step = max(1, min(1000000, int(data.get('step', window))))
+                na_conc = max(1, min(1000, int(data.get('na_conc', 50))))
+                k_conc = max(0, min(1000, int(data.get('k_conc', 0))))
+                oligo_conc = max(1, min(10000, int(data.get('oligo_conc', 250))))
+            except (ValueError, TypeError) as e:
+                return {'error': f'Invalid parameter value: {str(e)}'}, 400
+
+            records = iter_multi_fasta(sequence, data.get('sequence_name', ''))
+            return Response(
+                stream_with_context(iter_profile_records(records, window, step, na_conc, k_conc, oligo_conc)),
+                mimetype='application/x-ndjson'
+            )
+
+        except Exception as e:
+            print(f"Unexpected error in sequence profiling: {e}")
+            return {'error': 'An unexpected error occurred during sequence profiling'}, 500
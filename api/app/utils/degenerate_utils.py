@@ -0,0 +1,176 @@
+"""
+Nearest-neighbor thermodynamics for IUPAC-degenerate sequences.
+
+Each position is a probability vector over the thermo_utils codes (A, C, G,
+T, invalid). Mean ΔH/ΔS/ΔG come from the expected pair energies, and exact
+extremes come from a dynamic program over the allowed bases of every
+position, so NNK/NNN libraries are scored without expanding the 4^k
+sequences. Tm is not linear in the sums, so its mean over the expansions
+is not available this way; only the Tm of the mean sums is reported.
+"""
+import math
+
+import numpy as np
+
+from ..config.constants import R
+from .thermo_utils import BASES, N_CODES, INVALID_CODE, H_PAIR, S_PAIR, H_INIT_CODE, S_INIT_CODE
+
+IUPAC_BASES = {
+    'A': 'A', 'C': 'C', 'G': 'G', 'T': 'T',
+    'R': 'AG', 'Y': 'CT', 'S': 'CG', 'W': 'AT', 'K': 'GT', 'M': 'AC',
+    'B': 'CGT', 'D': 'AGT', 'H': 'ACT', 'V': 'ACG', 'N': 'ACGT'
+}
+DEGENERATE_CODES = set(IUPAC_BASES) - set(BASES)
+
+H_PAIR_MATRIX = H_PAIR.reshape(N_CODES, N_CODES)
+S_PAIR_MATRIX = S_PAIR.reshape(N_CODES, N_CODES)
+
+# Dinkelbach iterations needed in practice are 2-4; this is only a guard.
+MAX_RATIO_ITERATIONS = 50
+
+
+def _position_probabilities():
+    table = {}
+    for char, bases in IUPAC_BASES.items():
+        row = np.zeros(N_CODES, dtype=np.float64)
+        for base in bases:
+            row[BASES.index(base)] = 1.0 / len(bases)
+        table[char] = row
+    return table
+
+
+POSITION_PROBABILITIES = _position_probabilities()
+_INVALID_ROW = np.eye(N_CODES, dtype=np.float64)[INVALID_CODE]
+
+
+def is_degenerate(seq):
+    return any(char in DEGENERATE_CODES for char in seq.upper())
+
+
+def position_table(seq):
+    """L x 5 matrix of per-position base probabilities.
+
+    Characters outside IUPAC are the invalid state, which contributes no
+    energy, as in the scalar functions.
+    """
+    seq = seq.upper()
+    if not seq:
+        return np.zeros((0, N_CODES), dtype=np.float64)
+    return np.array([POSITION_PROBABILITIES.get(char, _INVALID_ROW) for char in seq])
+
+
+def expected_sums(probabilities):
+    """Expected ΔH (kcal/mol) and ΔS (cal/(mol·K)), initiation included."""
+    if not len(probabilities):
+        return 0.0, 0.0
+    first, last = probabilities[0], probabilities[-1]
+    delta_h = np.einsum('ij,jk,ik->', probabilities[:-1], H_PAIR_MATRIX, probabilities[1:])
+    delta_s = np.einsum('ij,jk,ik->', probabilities[:-1], S_PAIR_MATRIX, probabilities[1:])
+    delta_h += first @ H_INIT_CODE + last @ H_INIT_CODE
+    delta_s += first @ S_INIT_CODE + last @ S_INIT_CODE
+    return float(delta_h), float(delta_s)
+
+
+def extreme_sums(probabilities, weight_h, weight_s, maximize=False):
+    """ΔH and ΔS of the expansion that minimizes (or maximizes) weight_h·ΔH + weight_s·ΔS.
+
+    Viterbi-style pass over the five states of each position; only states
+    with non-zero probability are allowed.
+    """
+    if not len(probabilities):
+        return 0.0, 0.0
+    sign = -1.0 if maximize else 1.0
+    allowed = probabilities > 0
+    pair_cost = sign * (weight_h * H_PAIR_MATRIX + weight_s * S_PAIR_MATRIX)
+    init_cost = sign * (weight_h * H_INIT_CODE + weight_s * S_INIT_CODE)
+
+    cost = np.where(allowed[0], init_cost, np.inf)
+    path_h = H_INIT_CODE.copy()
+    path_s = S_INIT_CODE.copy()
+    for pos in range(1, len(probabilities)):
+        candidates = cost[:, None] + pair_cost
+        best_prev = np.argmin(candidates, axis=0)
+        states = np.arange(N_CODES)
+        cost = np.where(allowed[pos], candidates[best_prev, states], np.inf)
+        path_h = path_h[best_prev] + H_PAIR_MATRIX[best_prev, states]
+        path_s = path_s[best_prev] + S_PAIR_MATRIX[best_prev, states]
+
+    cost = cost + init_cost
+    best = int(np.argmin(cost))
+    return float(path_h[best] + H_INIT_CODE[best]), float(path_s[best] + S_INIT_CODE[best])
+
+
+def _tm_kelvin(delta_h, delta_s, constant):
+    return (delta_h * 1000) / (delta_s + constant)
+
+
+def _extreme_tm(probabilities, constant, start_ratio, maximize):
+    # Tm = 1000·ΔH / (ΔS + C) with ΔS + C < 0. Dinkelbach's method turns the
+    # ratio into a sequence of linear objectives 1000·ΔH - r·ΔS, each solved
+    # exactly by extreme_sums, and converges in a handful of passes.
+    ratio = start_ratio
+    for _ in range(MAX_RATIO_ITERATIONS):
+        delta_h, delta_s = extreme_sums(probabilities, 1000.0, -ratio, maximize=not maximize)
+        new_ratio = _tm_kelvin(delta_h, delta_s, constant)
+        if abs(new_ratio - ratio) <= 1e-9 * max(1.0, abs(ratio)):
+            return new_ratio
+        ratio = new_ratio
+    return ratio
+
+
+def get_degenerate_tm(seq, na_conc=50, k_conc=0, oligo_conc=250):
+    """Tm (°C) of the mean sums, and min and max Tm over all expansions.
+
+    'at_mean_sums' is the Tm of the expected ΔH/ΔS, which is not the mean
+    Tm of the expansions; 'min'/'max' are exact extremes. For a sequence
+    without ambiguity codes all three equal get_tm.
+    """
+    try:
+        if not seq or len(seq) < 2:
+            return {'at_mean_sums': 0.0, 'min': 0.0, 'max': 0.0}
+
+        total_salt = max(1, na_conc + k_conc)
+        oligo_conc_m = max(1e-12, oligo_conc * 1e-9)
+        constant = 0.368 * (len(seq) - 1) * math.log(total_salt / 1000) + R * math.log(oligo_conc_m / 2)
+
+        probabilities = position_table(seq)
+        mean_h, mean_s = expected_sums(probabilities)
+        if abs(mean_s + constant) < 1e-10:
+            return {'at_mean_sums': 0.0, 'min': 0.0, 'max': 0.0}
+        mean_ratio = _tm_kelvin(mean_h, mean_s, constant)
+
+        result = {
+            'at_mean_sums': mean_ratio,
+            'min': _extreme_tm(probabilities, constant, mean_ratio, maximize=False),
+            'max': _extreme_tm(probabilities, constant, mean_ratio, maximize=True)
+        }
+        return {key: max(0.0, value - 273.15) for key, value in result.items()}
+    except Exception as e:
+        print(f"Error calculating degenerate Tm for sequence {seq}: {e}")
+        return {'at_mean_sums': 0.0, 'min': 0.0, 'max': 0.0}
+
+
+def get_degenerate_dg_full_complementary(seq):
+    """Mean, min and max full-duplex ΔG at 37 °C over all expansions.
+
+    ΔG is linear in the pair energies, so 'mean' is the exact mean over
+    the expansions.
+    """
+    try:
+        if not seq:
+            return {'mean': 0.0, 'min': 0.0, 'max': 0.0}
+
+        temperature = (273.15 + 37) / 1000
+        probabilities = position_table(seq)
+        values = {}
+        for key, sums in (
+            ('mean', expected_sums(probabilities)),
+            ('min', extreme_sums(probabilities, 1.0, -temperature)),
+            ('max', extreme_sums(probabilities, 1.0, -temperature, maximize=True))
+        ):
+            delta_h, delta_s = sums
+            values[key] = delta_h - (delta_s * (273.15 + 37) / 1000)
+        return values
+    except Exception as e:
+        print(f"Error calculating degenerate dG for sequence {seq}: {e}")
+        return {'mean': 0.0, 'min': 0.0, 'max': 0.0}
@@ -1,5 +1,7 @@
 import math
 
+from .oligo_set import OligoSet
+
 def get_well_position(index, format):
     wells = []
     plate_type = int(format.split('-')[0])
@@ -37,28 +39,28 @@ def generate_list(oligos, well_format):
     plate_number = 1
     oligo_index = 0
 
-    def sort_key(oligo):
-        index_num = lambda label: int(label.split('_')[1])
-        orientation = lambda label: "FF" if label.startswith("FF") else "RC"
-        a_num = index_num(oligo['label'])
-        a_orient = orientation(oligo['label'])
-        return (oligo['fragment'], a_num, 0 if a_orient == 'FF' else 1)
-
-    flat_oligos = sorted(oligos, key=sort_key)
+    # Labels are already parsed in the OligoSet columns, so ordering by
+    # fragment, FF/RC number and orientation needs no string splitting.
+    if not isinstance(oligos, OligoSet):
+        oligos = OligoSet.from_dicts(oligos)
+    order = sorted(
+        range(len(oligos)),
+        key=lambda row: (oligos.fragments[row], oligos.index[row], oligos.orientation[row])
+    )
 
     plate_size = int(well_format.split('-')[0])
 
-    for oligo in flat_oligos:
+    for row in order:
         if oligo_index >= plate_size:
             oligo_index = 0
             plate_number += 1
         formatted_oligos.append({
             'plate': plate_number,
             'well': get_well_position(oligo_index, well_format),
-            'label': oligo['label'],
-            'sequence': oligo['sequence'],
-            'length': oligo['length'],
-            'fragment': oligo['fragment']
+            'label': oligos.labels[row],
+            'sequence': oligos.sequences[row],
+            'length': oligos.lengths[row],
+            'fragment': oligos.fragments[row]
         })
         oligo_index += 1
 
@@ -0,0 +1,154 @@
+"""
+Pool-wide cross-dimer bookkeeping shared across optimization passes.
+"""
+import numpy as np
+
+from .oligo_set import OligoSet
+from .thermo_utils import HAS_STACKS, encode_sequence, encode_pool, partial_dg_row
+
+
+class PoolInteractions:
+    """N x N matrix of worst partial ΔG between the oligos of a pool.
+
+    matrix[t, p] is the worst partial ΔG of oligo t (as target) against oligo
+    p (as partner). The matrix is built once; when oligos change, sync()
+    only recomputes the rows and columns of the oligos whose sequence moved.
+    Candidate sequences scored against the pool (trim candidates in
+    optimize_oligos) are memoized until the pool changes.
+
+    Without stacking parameters in the constants (HAS_STACKS is False) every
+    partial ΔG is 0, so no matrix is built and every lookup returns 0
+    without being counted.
+    """
+
+    def __init__(self, oligos):
+        self.enabled = HAS_STACKS
+        self.hits = 0
+        self.misses = 0
+        self.rows_recomputed = 0
+        self._build(self._sequences_of(oligos))
+
+    def _build(self, sequences):
+        self.sequences = sequences
+        if not self.enabled:
+            self.matrix = None
+            return
+        self._encode()
+        self.matrix = np.zeros((len(sequences), len(sequences)), dtype=np.float64)
+        for row, seq in enumerate(sequences):
+            self.matrix[row] = self._row(seq)
+        self.rows_recomputed += len(sequences)
+        self._candidates = {}
+
+    @staticmethod
+    def _sequence_of(oligo):
+        # Partners without a sequence are skipped by the scalar scan, which
+        # is the same as contributing no stacks.
+        if not oligo or not oligo.get('sequence'):
+            return ''
+        return oligo['sequence']
+
+    @classmethod
+    def _sequences_of(cls, oligos):
+        if isinstance(oligos, OligoSet):
+            return [seq or '' for seq in oligos.sequences]
+        return [cls._sequence_of(oligo) for oligo in oligos]
+
+    def _encode(self):
+        self._codes, self._offsets, self._lengths = encode_pool(self.sequences)
+        self._index = {}
+        for k, seq in enumerate(self.sequences):
+            self._index.setdefault(seq, k)
+
+    def _row(self, seq):
+        return partial_dg_row(encode_sequence(seq), self._codes, self._offsets, self._lengths)
+
+    def encoded_pool(self):
+        """(codes, offsets, lengths) of the current pool, as used by partial_dg_row."""
+        return self._codes, self._offsets, self._lengths
+
+    def member_index(self):
+        """First pool position of every member sequence."""
+        return self._index
+
+    def __len__(self):
+        return len(self.sequences)
+
+    def worst(self, index):
+        """Worst partial ΔG of pool member index against the whole pool."""
+        if self.matrix is None or not len(self.sequences):
+            return 0
+        value = self.matrix[index].min()
+        return float(value) if value < 0 else 0
+
+    def candidate_worst(self, seq):
+        """Worst partial ΔG of an arbitrary sequence against the current pool."""
+        if not self.enabled:
+            return 0
+        if seq in self._candidates:
+            self.hits += 1
+            return self._candidates[seq]
+        if seq in self._index:
+            # Untrimmed pool members reuse their prebuilt matrix row.
+            self.hits += 1
+            return self.worst(self._index[seq])
+
+        self.misses += 1
+        row = self._row(seq)
+        value = row.min() if len(row) else 0
+        value = float(value) if value < 0 else 0
+        self._candidates[seq] = value
+        return value
+
+    def record_lookups(self, lookups, computed):
+        """Count candidate_worst calls made against a copy of this pool elsewhere.
+
+        computed maps the sequences the copy had to score to their value.
+        Those this pool has not seen become misses and join the memo, the
+        rest of the lookups are hits, so the counts match making the same
+        calls here.
+        """
+        new = 0
+        for seq, value in computed.items():
+            if seq not in self._candidates and seq not in self._index:
+                self._candidates[seq] = value
+                new += 1
+        self.misses += new
+        self.hits += lookups - new
+
+    def sync(self, oligos):
+        """Bring the matrix in line with oligos, recomputing changed rows only."""
+        sequences = self._sequences_of(oligos)
+        if not self.enabled or len(sequences) != len(self.sequences):
+            self._build(sequences)
+            return
+
+        changed = [k for k, (old, new) in enumerate(zip(self.sequences, sequences)) if old != new]
+        if not changed:
+            return
+
+        self.sequences = sequences
+        self._encode()
+        self._candidates = {}
+
+        changed_seqs = [self.sequences[k] for k in changed]
+        sub_codes, sub_offsets, sub_lengths = encode_pool(changed_seqs)
+        changed_set = set(changed)
+        for row, seq in enumerate(self.sequences):
+            if row in changed_set:
+                self.matrix[row] = self._row(seq)
+                self.rows_recomputed += 1
+            else:
+                self.matrix[row, changed] = partial_dg_row(
+                    encode_sequence(seq), sub_codes, sub_offsets, sub_lengths)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'pool_size': len(self.sequences),
+            'enabled': self.enabled,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            'rows_recomputed': self.rows_recomputed
+        }
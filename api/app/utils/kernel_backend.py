@@ -0,0 +1,198 @@
+"""
+Selectable kernel backend for the thermodynamic hot loops.
+
+The 'numpy' backend is the vectorized code in thermo_utils and the scalar
+score_end_match loop. The 'numba' backend compiles the loop kernels below
+with numba.njit; the kernels accumulate in exactly the same order as the
+scalar functions, so both backends return identical values. 'auto' picks
+numba when it is installed and falls back to numpy otherwise.
+"""
+import logging
+
+import numpy as np
+
+from .thermo_utils import (
+    N_CODES, COMPLEMENT_CODE, H_PAIR, S_PAIR, H_INIT_CODE, S_INIT_CODE,
+    H_STACK, S_STACK, HAS_STACKS, _loop_penalties
+)
+
+try:
+    import numba
+except ImportError:  # numba is optional
+    numba = None
+
+BACKENDS = ('auto', 'numpy', 'numba')
+
+logger = logging.getLogger(__name__)
+
+_backend = 'numpy'
+_kernels = None
+
+
+def _nn_sums(codes, h_pair, s_pair, h_init, s_init, n_codes):
+    delta_h = 0.0
+    delta_s = 0.0
+    for i in range(len(codes) - 1):
+        idx = codes[i] * n_codes + codes[i + 1]
+        delta_h += h_pair[idx]
+        delta_s += s_pair[idx]
+    if len(codes) > 0:
+        delta_h += h_init[codes[0]] + h_init[codes[len(codes) - 1]]
+        delta_s += s_init[codes[0]] + s_init[codes[len(codes) - 1]]
+    return delta_h, delta_s
+
+
+def _hairpin_min(codes, complement, h_pair, s_pair, loop_penalties, n_codes):
+    seq_l = len(codes)
+    min_dg = 0.0
+    stem_h = np.zeros(seq_l + 1)
+    stem_s = np.zeros(seq_l + 1)
+    for i in range(seq_l - 4):
+        # stem_h[k] = energy of the first k stacks starting at i.
+        for k in range(seq_l - i):
+            idx = codes[i + k] * n_codes + complement[codes[seq_l - 1 - k]]
+            stem_h[k + 1] = stem_h[k] + h_pair[idx]
+            stem_s[k + 1] = stem_s[k] + s_pair[idx]
+        for j in range(i + 4, seq_l):
+            stem_len = min(j - i, seq_l - j)
+            loop_length = j - i - stem_len
+            if stem_len < 4 or loop_length < 3:
+                continue
+            dg = stem_h[stem_len] - ((stem_s[stem_len] * (273.15 + 37)) / 1000)
+            dg += loop_penalties[loop_length]
+            if dg < min_dg:
+                min_dg = dg
+    return min_dg
+
+
+def _partial_min(target, partner_rc, h_stack, s_stack, n_codes):
+    n = len(target)
+    m = len(partner_rc)
+    max_dg = 0.0
+    for i in range(n + m - 1):
+        current_h = 0.0
+        current_s = 0.0
+        for j in range(n - 1):
+            k = i - j
+            if k < 0 or k >= m - 1:
+                continue
+            idx = ((target[j] * n_codes + target[j + 1]) * n_codes * n_codes
+                   + partner_rc[k] * n_codes + partner_rc[k + 1])
+            current_h += h_stack[idx]
+            current_s += s_stack[idx]
+        if current_h != 0:
+            dg = current_h - (current_s * (273.15 + 37) / 1000)
+            if dg < max_dg:
+                max_dg = dg
+    return max_dg
+
+
+def _end_match(end_rc, target):
+    end_len = len(end_rc)
+    worst_score = 0.0
+    for i in range(len(target) - end_len + 1):
+        mismatches = 0
+        mismatch_pos = -1
+        for p in range(end_len):
+            if end_rc[p] != target[i + p]:
+                mismatches += 1
+                mismatch_pos = p + 1
+                if mismatches > 1:
+                    break
+        if mismatches == 0:
+            return 1.0
+        if mismatches == 1:
+            base = end_rc[mismatch_pos - 1]
+            base_penalty = 1.0 if base == 71 or base == 67 else 0.5
+            pos_weight = mismatch_pos / end_len
+            score = (7 / 8) - pos_weight * base_penalty
+            if score > worst_score:
+                worst_score = score
+    return worst_score
+
+
+def _compile():
+    jit = numba.njit(cache=True)
+    return {
+        'nn_sums': jit(_nn_sums),
+        'hairpin_min': jit(_hairpin_min),
+        'partial_min': jit(_partial_min),
+        'end_match': jit(_end_match)
+    }
+
+
+def set_backend(name):
+    """Select the kernel backend; returns the backend actually in use."""
+    global _backend, _kernels
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown kernel backend '{name}', expected one of {', '.join(BACKENDS)}")
+    if name in ('auto', 'numba') and numba is not None:
+        if _kernels is None:
+            _kernels = _compile()
+        _backend = 'numba'
+    else:
+        if name == 'numba':
+            logger.warning('numba is not installed, falling back to the numpy kernel backend')
+        _backend = 'numpy'
+    return _backend
+
+
+def get_backend():
+    return _backend
+
+
+def jit_kernels():
+    """Compiled kernels when the numba backend is active, otherwise None."""
+    return _kernels if _backend == 'numba' else None
+
+
+def jit_nn_sums(codes):
+    """Nearest-neighbor ΔH and ΔS of one encoded sequence, initiation included."""
+    return _kernels['nn_sums'](codes, H_PAIR, S_PAIR, H_INIT_CODE, S_INIT_CODE, N_CODES)
+
+
+def jit_hairpin_dg(codes):
+    """Same result as thermo_utils.hairpin_dg_codes."""
+    if len(codes) < 8:
+        return 0
+    min_dg = _kernels['hairpin_min'](
+        codes, COMPLEMENT_CODE, H_PAIR, S_PAIR, _loop_penalties(len(codes)), N_CODES)
+    return float(min_dg) if min_dg < 0 else 0
+
+
+def jit_partial_dg(target_codes, partner_codes):
+    """Worst partial ΔG of one encoded target against encoded partners, 0 when no stack."""
+    if not HAS_STACKS or len(target_codes) < 2:
+        return 0
+    max_dg = 0.0
+    for codes in partner_codes:
+        dg = _kernels['partial_min'](target_codes, COMPLEMENT_CODE[codes[::-1]], H_STACK, S_STACK, N_CODES)
+        if dg < max_dg:
+            max_dg = dg
+    return float(max_dg) if max_dg < 0 else 0
+
+
+def jit_end_match(end_rc, target_seq):
+    """score_end_match over ASCII strings; None when either side isn't ASCII."""
+    if not (end_rc.isascii() and target_seq.isascii()):
+        return None
+    score = _kernels['end_match'](
+        np.frombuffer(end_rc.encode('ascii'), dtype=np.uint8),
+        np.frombuffer(target_seq.encode('ascii'), dtype=np.uint8))
+    # The scalar loop returns the ints 1 (exact match) and 0 (no near match).
+    if score == 1.0:
+        return 1
+    if score == 0.0:
+        return 0
+    return float(score)
+
+
+def warm_up():
+    """Compile every kernel now so the first request doesn't pay for it."""
+    if jit_kernels() is None:
+        return
+    codes = np.array([0, 1, 2, 3, 3, 2, 1, 0, 0, 1, 2, 3], dtype=np.uint8)
+    jit_nn_sums(codes)
+    jit_hairpin_dg(codes)
+    _kernels['partial_min'](codes, COMPLEMENT_CODE[codes[::-1]], H_STACK, S_STACK, N_CODES)
+    jit_end_match('ACGT', 'ACGTACGT')
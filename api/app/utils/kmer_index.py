@@ -0,0 +1,41 @@
+"""
+k-mer neighborhood index used to find end-match conflicts in a pool.
+"""
+
+
+class KmerIndex:
+    """Index of every k-long window of a pool of sequences, up to one mismatch.
+
+    Each window is stored under its k one-character deletions (position, rest).
+    A query and a window differ in at most one position exactly when they
+    share one of those keys, whatever the characters involved, so
+    candidates() returns the same members a full score_end_match scan would
+    find with a non-zero score.
+    """
+
+    def __init__(self, sequences, k):
+        self.k = k
+        self._keys = {}
+        for member, seq in enumerate(sequences):
+            self._add(member, seq)
+
+    def _add(self, member, seq):
+        k = self.k
+        for start in range(len(seq) - k + 1):
+            window = seq[start:start + k]
+            for p in range(k):
+                self._keys.setdefault((p, window[:p] + window[p + 1:]), set()).add(member)
+
+    def candidates(self, query):
+        """Members holding a window equal to query or one substitution away."""
+        if len(query) != self.k:
+            return set()
+        found = set()
+        for p in range(self.k):
+            members = self._keys.get((p, query[:p] + query[p + 1:]))
+            if members:
+                found |= members
+        return found
+
+    def __len__(self):
+        return len(self._keys)
@@ -0,0 +1,202 @@
+"""
+Library design: many constructs designed in parallel, shared oligos ordered once.
+"""
+import csv
+import hashlib
+import io
+import json
+import zipfile
+
+from .file_plate_utils import get_well_position
+from .kernel_backend import get_backend, set_backend
+from .oligo_set import OligoSet
+from .oligo_utils import iter_simple_oligos, iter_gapped_oligos, tm_balanced_oligo_maker, clean_oligos, optimize_oligos
+from .parallel_utils import map_chunks
+from .sequence_utils import get_reverse_complement
+from .thermo_cache import flush_thermo_store
+
+# Below this many constructs the library is designed in the request process.
+MIN_PARALLEL_CONSTRUCTS = 16
+
+POOLING_HEADER = ["Plate Source", "Well Source", "Sequence", "Plate Destination", "Well Destination",
+                  "Volume Transfer", "Construct", "Name", "Orientation"]
+ORDER_HEADER = ["Plate", "Well", "Name", "Sequence", "Length", "Uses"]
+
+
+def design_construct(sequence, design):
+    """(label, sequence) pairs for one construct.
+
+    design holds the maker ('simple', 'gapped' or 'tm_balanced') with its
+    lengths, and whether to clean and optimize. Each construct is assembled
+    on its own, so cleaning and optimization only see its own oligos.
+    """
+    maker = design['maker']
+    if maker == 'tm_balanced':
+        oligos = tm_balanced_oligo_maker(
+            sequence, design['min_oligo_length'], design['oligo_length'],
+            design['min_overlap_length'], design['overlap_length'], design['target_overlap_tm'],
+            design['na_conc'], design['k_conc'], design['oligo_conc']
+        )
+    elif maker == 'gapped':
+        oligos = iter_gapped_oligos(sequence, design['oligo_length'], design['overlap_length'], design['gap_length'])
+    else:
+        oligos = iter_simple_oligos(sequence, design['oligo_length'], design['overlap_length'])
+
+    oligos = OligoSet.from_dicts(o for o in oligos if o and 'sequence' in o)
+    if design.get('clean_oligos'):
+        oligos = clean_oligos(oligos)
+    if design.get('optimized_oligos'):
+        oligos = optimize_oligos(oligos, design['na_conc'], design['k_conc'], design['oligo_conc'])
+    return list(zip(oligos.labels, oligos.sequences))
+
+
+def _design_one(record, design):
+    name, sequence = record
+    try:
+        return name, design_construct(sequence, design)
+    except Exception as e:
+        print(f"Error designing construct {name}: {e}")
+        return name, None
+
+
+def _design_chunk(records, design, backend):
+    if get_backend() != backend:
+        set_backend(backend)
+    designs = [_design_one(record, design) for record in records]
+    # Worker processes exit without running atexit hooks.
+    flush_thermo_store()
+    return designs
+
+
+def iter_library_designs(records, design, workers=1):
+    """(name, oligos) per (name, sequence) record, in input order.
+
+    oligos is None when the construct could not be designed. With several
+    workers, constructs are designed in chunks on the shared process pool.
+    """
+    records = list(records)
+    if workers <= 1 or len(records) < MIN_PARALLEL_CONSTRUCTS:
+        for record in records:
+            yield _design_one(record, design)
+        return
+
+    for results in map_chunks(_design_chunk, records, workers, design, get_backend()):
+        yield from results
+
+
+class OligoLibrary:
+    """Unique oligos of a library, each placed on a plate the first time it is seen.
+
+    Oligos are keyed by a 16-byte digest of their sequence; each entry
+    keeps the sequence it was placed as, for the order file. With
+    reverse_complements, a sequence and its reverse complement share the
+    digest of the smaller of the two and are ordered once. With an
+    inventory, oligos already stocked are pooled from their wells and take
+    no new well.
+    """
+
+    def __init__(self, well_format='96-column', reverse_complements=True, inventory=None):
+        self.plate_size = int(well_format.split('-')[0])
+        self.wells = [get_well_position(index, well_format) for index in range(self.plate_size)]
+        self.reverse_complements = reverse_complements
+        self.inventory = inventory
+        self.oligos = {}
+        self.requested = 0
+        self.ordered = 0
+
+    def _key(self, sequence):
+        if self.reverse_complements:
+            sequence = min(sequence, get_reverse_complement(sequence))
+        return hashlib.blake2b(sequence.encode('ascii', 'replace'), digest_size=16).digest()
+
+    def add(self, sequence, name):
+        """(plate, well, orientation) of the ordered oligo that provides sequence."""
+        self.requested += 1
+        key = self._key(sequence)
+        entry = self.oligos.get(key)
+        if entry is None:
+            entry = self._stocked(sequence, name)
+            if entry is None:
+                slot = self.ordered
+                self.ordered += 1
+                entry = [f'Plate_{slot // self.plate_size + 1}', self.wells[slot % self.plate_size], name, sequence, 0, False]
+            self.oligos[key] = entry
+        entry[4] += 1
+        orientation = 'as_ordered' if entry[3] == sequence else 'reverse_complement'
+        return entry[0], entry[1], orientation
+
+    def _stocked(self, sequence, name):
+        if self.inventory is None:
+            return None
+        found = self.inventory.find(sequence)
+        if found is None and self.reverse_complements:
+            found = self.inventory.find(get_reverse_complement(sequence))
+        if found is None:
+            return None
+        return [found['plate'], found['well'], found['name'] or name, found['sequence'], 0, True]
+
+    def plates(self):
+        return -(-self.ordered // self.plate_size)
+
+    def from_inventory(self):
+        return len(self.oligos) - self.ordered
+
+    def order_rows(self):
+        for plate, well, name, sequence, uses, stocked in self.oligos.values():
+            if not stocked:
+                yield [plate, well, name, sequence, len(sequence), uses]
+
+
+def _csv_entry(zf, filename):
+    # Rows go straight into the compressed entry instead of a CSV string.
+    return io.TextIOWrapper(zf.open(filename, 'w'), encoding='utf-8', newline='')
+
+
+def write_library_zip(fileobj, designs, library, dest_well_format='96-column', volume=2):
+    """Write the library's order and pooling files to fileobj as a ZIP.
+
+    designs is an iterable of (construct, oligos) as produced by
+    iter_library_designs. Each construct gets the next destination well and
+    its oligos are deduplicated into library as they arrive, so pooling
+    rows are written in the same pass. Returns the summary that is also
+    stored as summary.json.
+    """
+    dest_size = int(dest_well_format.split('-')[0])
+    dest_wells = [get_well_position(index, dest_well_format) for index in range(dest_size)]
+    constructs = 0
+    failed = []
+
+    with zipfile.ZipFile(fileobj, 'w', zipfile.ZIP_DEFLATED) as zf:
+        with _csv_entry(zf, 'pooling.csv') as handle:
+            writer = csv.writer(handle)
+            writer.writerow(POOLING_HEADER)
+            for construct, oligos in designs:
+                if not oligos:
+                    failed.append(construct)
+                    continue
+                dest_plate = f'Destination_Plate_{constructs // dest_size + 1}'
+                dest_well = dest_wells[constructs % dest_size]
+                constructs += 1
+                for label, sequence in oligos:
+                    plate, well, orientation = library.add(sequence, f'{construct}_{label}')
+                    writer.writerow([plate, well, sequence, dest_plate, dest_well, volume,
+                                     construct, label, orientation])
+
+        with _csv_entry(zf, 'oligos_to_order.csv') as handle:
+            writer = csv.writer(handle)
+            writer.writerow(ORDER_HEADER)
+            writer.writerows(library.order_rows())
+
+        summary = {
+            'constructs': constructs,
+            'failed_constructs': failed,
+            'oligos_requested': library.requested,
+            'unique_oligos': len(library.oligos),
+            'from_inventory': library.from_inventory(),
+            'oligos_to_order': library.ordered,
+            'oligos_saved': library.requested - len(library.oligos),
+            'source_plates': library.plates(),
+            'destination_plates': -(-constructs // dest_size)
+        }
+        zf.writestr('summary.json', json.dumps(summary, indent=2))
+    return summary
@@ -0,0 +1,218 @@
+"""
+Persistent inventory of oligos already stocked in source plates.
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+from .file_plate_utils import get_fragment_destination_map
+
+# SQLite caps the number of bound parameters per statement.
+LOOKUP_BATCH = 500
+
+_CREATE_STOCK = (
+    'CREATE TABLE IF NOT EXISTS stock ('
+    'key BLOB NOT NULL, plate TEXT NOT NULL, well TEXT NOT NULL, '
+    'sequence TEXT NOT NULL, name TEXT, volume REAL, added REAL NOT NULL, '
+    'PRIMARY KEY (plate, well)) WITHOUT ROWID'
+)
+
+
+class OligoInventory:
+    """SQLite table of stocked oligos, one row per (plate, well).
+
+    Each row also holds a 16-byte blake2b digest of its sequence, and the
+    digest is indexed, so a lookup is a single index probe whatever the
+    number of stocked oligos. A sequence may sit in several wells; lookups
+    return the well with the most volume left. Connections are per thread
+    and the file is shared by all workers in WAL mode, as in ThermoStore.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._connection()
+        conn.execute(_CREATE_STOCK)
+        if self._keyed_by_sequence(conn):
+            self._migrate(conn)
+        conn.execute('CREATE INDEX IF NOT EXISTS stock_key ON stock (key)')
+        conn.commit()
+
+    @staticmethod
+    def _keyed_by_sequence(conn):
+        # Files written before wells were unique have the digest in the primary key.
+        return any(column[1] == 'key' and column[5] for column in conn.execute('PRAGMA table_info(stock)'))
+
+    @staticmethod
+    def _migrate(conn):
+        # Rebuild with one row per well, keeping the latest stocking of each.
+        conn.execute('ALTER TABLE stock RENAME TO stock_by_sequence')
+        conn.execute(_CREATE_STOCK)
+        conn.execute(
+            'INSERT OR REPLACE INTO stock SELECT key, plate, well, sequence, name, volume, added '
+            'FROM stock_by_sequence ORDER BY added'
+        )
+        conn.execute('DROP TABLE stock_by_sequence')
+
+    def _connection(self):
+        # sqlite3 connections cannot be shared between threads.
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def make_key(sequence):
+        return hashlib.blake2b(sequence.upper().encode('ascii', 'replace'), digest_size=16).digest()
+
+    def add(self, oligos):
+        """Stock oligos given as dicts with plate, well, sequence and optional name/volume.
+
+        A well that is stocked again is replaced. Returns the number of rows written.
+        """
+        now = time.time()
+        rows = [
+            (self.make_key(oligo['sequence']), str(oligo['plate']), str(oligo['well']),
+             oligo['sequence'].upper(), oligo.get('name'), oligo.get('volume'), now)
+            for oligo in oligos
+        ]
+        conn = self._connection()
+        with conn:
+            conn.executemany('INSERT OR REPLACE INTO stock VALUES (?, ?, ?, ?, ?, ?, ?)', rows)
+        return len(rows)
+
+    def remove_plate(self, plate):
+        conn = self._connection()
+        with conn:
+            return conn.execute('DELETE FROM stock WHERE plate = ?', (plate,)).rowcount
+
+    @staticmethod
+    def _rank(row):
+        return (row[5] is not None, row[5] or 0)
+
+    @staticmethod
+    def _stocked(row):
+        return {'plate': row[1], 'well': row[2], 'sequence': row[3], 'name': row[4], 'volume': row[5]}
+
+    def find(self, sequence):
+        """The stocked well holding sequence, or None."""
+        row = self._connection().execute(
+            'SELECT key, plate, well, sequence, name, volume FROM stock WHERE key = ? '
+            'ORDER BY volume IS NULL, volume DESC LIMIT 1',
+            (self.make_key(sequence),)
+        ).fetchone()
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return self._stocked(row)
+
+    def find_many(self, sequences):
+        """{sequence: stocked well} for the sequences that are in stock."""
+        sequences = list(sequences)
+        wanted = {}
+        for sequence in sequences:
+            wanted.setdefault(self.make_key(sequence), []).append(sequence)
+        keys = list(wanted)
+        conn = self._connection()
+        best = {}
+        for lo in range(0, len(keys), LOOKUP_BATCH):
+            batch = keys[lo:lo + LOOKUP_BATCH]
+            rows = conn.execute(
+                'SELECT key, plate, well, sequence, name, volume FROM stock WHERE key IN '
+                f'({", ".join("?" * len(batch))})',
+                batch
+            ).fetchall()
+            for row in rows:
+                # Same choice as find(): most volume first, unknown volume last.
+                current = best.get(row[0])
+                if current is None or self._rank(row) > self._rank(current):
+                    best[row[0]] = row
+        found = {}
+        for key, row in best.items():
+            for sequence in wanted[key]:
+                found[sequence] = self._stocked(row)
+        with self._lock:
+            self.hits += len(found)
+            self.misses += len(set(sequences)) - len(found)
+        return found
+
+    def clear(self):
+        conn = self._connection()
+        with conn:
+            conn.execute('DELETE FROM stock')
+
+    def stats(self):
+        conn = self._connection()
+        entries = conn.execute('SELECT COUNT(*) FROM stock').fetchone()[0]
+        plates = conn.execute('SELECT COUNT(DISTINCT plate) FROM stock').fetchone()[0]
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'path': self.path,
+                'entries': entries,
+                'plates': plates,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+
+_inventory = None
+
+
+def configure_inventory(path):
+    """Open the inventory at path; an empty path disables it."""
+    global _inventory
+    _inventory = OligoInventory(path) if path else None
+
+
+def get_inventory():
+    return _inventory
+
+
+def inventory_pooling(oligos, inventory, dest_well_format='96-column', volume=2):
+    """Split designed oligos into stocked ones and ones that still need ordering.
+
+    Stocked oligos get pooling rows from their inventory well to their
+    fragment's destination well.
+    """
+    stocked = inventory.find_many(oligo['sequence'] for oligo in oligos)
+    dest_map = get_fragment_destination_map(oligos, dest_well_format)
+    pooling = []
+    to_order = []
+    for oligo in oligos:
+        source = stocked.get(oligo['sequence'])
+        if source is None:
+            to_order.append(oligo)
+            continue
+        dest = dest_map[oligo.get('fragment', 'unknown_sequence')]
+        pooling.append({
+            'Plate Source': source['plate'],
+            'Well Source': source['well'],
+            'Sequence': oligo['sequence'],
+            'Plate Destination': dest['plate'],
+            'Well Destination': dest['well'],
+            'Volume Transfer': volume,
+            'Fragment': oligo.get('fragment'),
+            'Name': oligo.get('label')
+        })
+    return {
+        'stocked': len(pooling),
+        'to_order': len(to_order),
+        'pooling': pooling,
+        'oligos_to_order': to_order
+    }
@@ -0,0 +1,157 @@
+"""
+Columnar container for oligo pools.
+"""
+
+FORWARD = 0
+REVERSE = 1
+
+# Keys with a dedicated column; anything else an oligo carries (pool,
+# overlap_tm, invalid, ...) is kept in a generic column.
+CORE_KEYS = ('label', 'sequence', 'length', 'fragment')
+
+
+def parse_label(label):
+    """(orientation, index) of an FF_<n> / RC_<n> label, index None when it has no number."""
+    orientation = FORWARD if label.startswith('FF') else REVERSE
+    try:
+        index = int(label.split('_')[1])
+    except (IndexError, ValueError):
+        index = None
+    return orientation, index
+
+
+class OligoSet:
+    """Pool of oligos stored column by column instead of one dict per oligo.
+
+    labels, sequences, lengths and fragments are parallel lists. Every label
+    is parsed once into the orientation and index columns, and fragments are
+    numbered in order of appearance in fragment_ids, so partner checks,
+    grouping and plate ordering never split strings again. Other keys live
+    in columns (name -> list, None where an oligo lacks the key). Updates
+    return a new set sharing the unchanged columns; dicts are only built by
+    iter_dicts()/to_dicts() at the JSON boundary.
+    """
+
+    __slots__ = ('labels', 'sequences', 'lengths', 'fragments', 'columns',
+                 'orientation', 'index', 'fragment_ids', '_row_ids')
+
+    def __init__(self, labels, sequences, lengths, fragments, columns=None, _parsed=None):
+        self.labels = labels
+        self.sequences = sequences
+        self.lengths = lengths
+        self.fragments = fragments
+        self.columns = columns or {}
+        if _parsed is None:
+            _parsed = self._parse(labels, fragments)
+        self.orientation, self.index, self.fragment_ids = _parsed
+        self._row_ids = None
+
+    @staticmethod
+    def _parse(labels, fragments):
+        orientation = []
+        index = []
+        for label in labels:
+            label_orientation, label_index = parse_label(label or '')
+            orientation.append(label_orientation)
+            index.append(label_index)
+        numbering = {}
+        fragment_ids = [numbering.setdefault(fragment, len(numbering)) for fragment in fragments]
+        return orientation, index, fragment_ids
+
+    @classmethod
+    def from_dicts(cls, oligos, **constants):
+        """Build from oligo dicts; constants (e.g. fragment='chr1') apply to every oligo."""
+        oligos = list(oligos)
+        core = {key: [oligo.get(key) for oligo in oligos] for key in CORE_KEYS}
+        columns = {}
+        for row, oligo in enumerate(oligos):
+            for key, value in oligo.items():
+                if key not in CORE_KEYS:
+                    columns.setdefault(key, [None] * len(oligos))[row] = value
+        for key, value in constants.items():
+            if key in CORE_KEYS:
+                core[key] = [value] * len(oligos)
+            else:
+                columns[key] = [value] * len(oligos)
+        return cls(core['label'], core['sequence'], core['length'], core['fragment'], columns)
+
+    @classmethod
+    def concat(cls, sets):
+        sets = list(sets)
+        names = []
+        for oligo_set in sets:
+            names.extend(name for name in oligo_set.columns if name not in names)
+
+        def joined(get):
+            values = []
+            for oligo_set in sets:
+                values.extend(get(oligo_set))
+            return values
+
+        return cls(
+            joined(lambda s: s.labels),
+            joined(lambda s: s.sequences),
+            joined(lambda s: s.lengths),
+            joined(lambda s: s.fragments),
+            {name: joined(lambda s: s.column(name)) for name in names}
+        )
+
+    def __len__(self):
+        return len(self.sequences)
+
+    def column(self, name):
+        if name in CORE_KEYS:
+            return {'label': self.labels, 'sequence': self.sequences,
+                    'length': self.lengths, 'fragment': self.fragments}[name]
+        return self.columns.get(name, [None] * len(self))
+
+    def with_columns(self, **changes):
+        """New set with whole columns replaced, e.g. sequence=[...], invalid=[...]."""
+        core = {key: changes.pop(key, self.column(key)) for key in CORE_KEYS}
+        columns = {**self.columns, **changes}
+        parsed = None
+        if core['label'] is self.labels and core['fragment'] is self.fragments:
+            parsed = (self.orientation, self.index, self.fragment_ids)
+        return OligoSet(core['label'], core['sequence'], core['length'], core['fragment'], columns, parsed)
+
+    def row(self, row):
+        oligo = {}
+        for key in CORE_KEYS:
+            value = self.column(key)[row]
+            if value is not None:
+                oligo[key] = value
+        for name, values in self.columns.items():
+            if values[row] is not None:
+                oligo[name] = values[row]
+        return oligo
+
+    def iter_dicts(self):
+        for row in range(len(self)):
+            yield self.row(row)
+
+    def to_dicts(self):
+        return list(self.iter_dicts())
+
+    def same(self, a, b):
+        """Whether rows a and b hold identical oligos (what dict == compared)."""
+        if self._row_ids is None:
+            first = {}
+            keys = zip(self.labels, self.sequences, self.lengths, self.fragments,
+                       *self.columns.values())
+            self._row_ids = [first.setdefault(key, row) for row, key in enumerate(keys)]
+        return self._row_ids[a] == self._row_ids[b]
+
+    def is_partner(self, a, b):
+        """is_intended_partner on rows: FF_n pairs with RC_n and RC_(n-1).
+
+        Labels without a number never pair.
+        """
+        if self.orientation[a] == self.orientation[b]:
+            return False
+        i = self.index[a]
+        j = self.index[b]
+        if i is None or j is None:
+            return False
+        if self.orientation[a] == FORWARD:
+            return j == i or j == i - 1
+        return j == i or j == i + 1
@@ -1,47 +1,56 @@
-from .sequence_utils import get_reverse_complement, get_gc_content, get_tm, get_dg_intra_hairpin, get_dg_full_complementary, get_dg_partial_complementary
-
-def simple_oligo_maker(sequence, oligo_length=60, overlap_length=30):
-    forward = []
-    reverse = []
-    result = []
-
-    for pos in range(0, len(sequence), oligo_length):
-        forward.append(sequence[pos:pos + oligo_length])
+import time
 
-    if forward and len(forward[-1]) < overlap_length:
-        forward.pop()
+import numpy as np
 
-    for i in range(len(forward) - 1):
-        bridge_start = i * oligo_length + (oligo_length - overlap_length)
-        region = sequence[bridge_start:bridge_start + oligo_length]
-        reverse.append(get_reverse_complement(region))
-
-    last_fwd_end = len(forward) * oligo_length
-    term_start = max(0, last_fwd_end - overlap_length)
-    if term_start < len(sequence):
-        terminal_region = sequence[term_start:]
-        reverse.append(get_reverse_complement(terminal_region))
+from .sequence_utils import get_reverse_complement, get_gc_content, get_tm, get_dg_intra_hairpin, get_dg_full_complementary, get_dg_partial_complementary
+from .interaction_utils import PoolInteractions
+from .thermo_utils import ThermoProfile
+from .kmer_index import KmerIndex
+from .parallel_utils import MIN_PARALLEL_OLIGOS, optimize_sequences_parallel
+from .oligo_set import OligoSet
+from .optimize_checkpoint import CHECKPOINT_EVERY
+from .kernel_backend import jit_kernels, jit_end_match
 
-    filtered_reverse = [seq for seq in reverse if len(seq) >= overlap_length]
+def iter_simple_oligos(sequence, oligo_length=60, overlap_length=30):
+    """Oligos of simple_oligo_maker, yielded one at a time (FF_ first, then RC_)."""
+    n_forward = -(-len(sequence) // oligo_length)
+    if n_forward and len(sequence) - (n_forward - 1) * oligo_length < overlap_length:
+        n_forward -= 1
 
-    for i, seq in enumerate(forward):
-        result.append({
+    for i in range(n_forward):
+        seq = sequence[i * oligo_length:(i + 1) * oligo_length]
+        yield {
             'label': f'FF_{i+1}',
             'sequence': seq,
             'length': len(seq)
-        })
-    for i, seq in enumerate(filtered_reverse):
-        result.append({
-            'label': f'RC_{i+1}',
+        }
+
+    def bridges():
+        for i in range(n_forward - 1):
+            bridge_start = i * oligo_length + (oligo_length - overlap_length)
+            yield sequence[bridge_start:bridge_start + oligo_length]
+        term_start = max(0, n_forward * oligo_length - overlap_length)
+        if term_start < len(sequence):
+            yield sequence[term_start:]
+
+    index = 0
+    for region in bridges():
+        if len(region) < overlap_length:
+            continue
+        index += 1
+        seq = get_reverse_complement(region)
+        yield {
+            'label': f'RC_{index}',
             'sequence': seq,
             'length': len(seq)
-        })
+        }
 
-    return result
+def simple_oligo_maker(sequence, oligo_length=60, overlap_length=30):
+    return list(iter_simple_oligos(sequence, oligo_length, overlap_length))
 
-def generate_gapped_oligos(sequence, oligo_length, overlap_length, gap_length):
+def iter_gapped_oligos(sequence, oligo_length, overlap_length, gap_length):
+    """Oligos of generate_gapped_oligos, yielded one at a time (FF_ first, then RC_)."""
     min_length_to_keep = 20
-    oligos = []
 
     # Generate Forward Oligos
     fwd_oligo_start = 0
@@ -49,11 +58,11 @@ def generate_gapped_oligos(sequence, oligo_length, overlap_length, gap_length):
     while fwd_oligo_start < len(sequence):
         oligo = sequence[fwd_oligo_start:fwd_oligo_start + oligo_length]
         if len(oligo) >= min_length_to_keep:
-            oligos.append({
+            yield {
                 'label': f'FF_{fwd_oligo_index}',
                 'sequence': oligo,
                 'length': len(oligo)
-            })
+            }
         fwd_oligo_start += oligo_length + gap_length
         fwd_oligo_index += 1
 
@@ -63,20 +72,192 @@ def generate_gapped_oligos(sequence, oligo_length, overlap_length, gap_length):
     while rev_comp_start + oligo_length <= len(sequence):
         segment = sequence[rev_comp_start:rev_comp_start + oligo_length]
         rev_comp = get_reverse_complement(segment)
-        oligos.append({
-            'label': f'RC_{rev_comp_index}',
-            'sequence': rev_comp,
-            'length': len(rev_comp)
-        })
+        if len(rev_comp) >= min_length_to_keep:
+            yield {
+                'label': f'RC_{rev_comp_index}',
+                'sequence': rev_comp,
+                'length': len(rev_comp)
+            }
         rev_comp_start += oligo_length + gap_length
         rev_comp_index += 1
 
-    return [oligo for oligo in oligos if len(oligo['sequence']) >= min_length_to_keep]
+def generate_gapped_oligos(sequence, oligo_length, overlap_length, gap_length):
+    return list(iter_gapped_oligos(sequence, oligo_length, overlap_length, gap_length))
+
+def _balanced_overlaps(profile, min_length, max_length, min_overlap, max_overlap, target_tm, na_conc, k_conc, oligo_conc):
+    """Overlaps [(start, end), ...] minimizing the summed squared Tm error.
+
+    The design is a chain of overlaps O_1 .. O_n along the sequence. Oligo 1
+    is [0, end(O_1)), oligo k is [start(O_(k-1)), end(O_k)) and the last one
+    is [start(O_n), L), alternating strands. A[s] holds the best chain whose
+    last overlap starts at s and already ended, so the next overlap [s', e')
+    only needs the minimum of A over the starts that keep the oligo
+    [s, e') within the length limits. Each position costs one slice of A,
+    so the whole design is O(L x overlap widths x length range).
+    """
+    seq_l = len(profile.sequence)
+    widths = np.arange(min_overlap, max_overlap + 1)
+    n_widths = len(widths)
+    span = max_length - min_length + 1
+    if seq_l < 3 or n_widths == 0 or span <= 0:
+        return []
+
+    # Tm error of every overlap [s, s + w); both ends of the sequence stay single-stranded.
+    grid_starts = np.repeat(np.arange(seq_l), n_widths)
+    grid_ends = grid_starts + np.tile(widths, seq_l)
+    inside = (grid_starts >= 1) & (grid_ends <= seq_l - 1)
+    tm = np.full(len(grid_starts), np.nan)
+    tm[inside] = profile.tm_windows(grid_starts[inside], grid_ends[inside], na_conc, k_conc, oligo_conc)
+    cost = np.where(inside, (tm - target_tm) ** 2, np.inf).reshape(seq_l, n_widths)
+
+    best = np.full((seq_l, n_widths), np.inf)
+    prev_start = np.full((seq_l, n_widths), -1, dtype=np.int64)
+    prev_width = np.full((seq_l, n_widths), -1, dtype=np.int64)
+    # A[s] is stored max_length entries in, so windows may start before 0
+    # or run past the end.
+    finished = np.full(seq_l + 2 * max_length + max_overlap, np.inf)
+    finished_width = np.full(seq_l, -1, dtype=np.int64)
+
+    for start in range(1, seq_l - min_overlap):
+        # Overlaps ending at start become possible predecessors.
+        for k, width in enumerate(widths):
+            before = start - width
+            if before >= 1 and best[before, k] < finished[max_length + before]:
+                finished[max_length + before] = best[before, k]
+                finished_width[before] = k
+
+        ends = start + widths
+        lo = max_length + start + min_overlap - max_length
+        windows = np.lib.stride_tricks.sliding_window_view(finished[lo:lo + n_widths + span - 1], span)
+        pick = windows.argmin(axis=1)
+        chained = windows[np.arange(n_widths), pick]
+        first = np.where((ends >= min_length) & (ends <= max_length), 0.0, np.inf)
+
+        use_first = first <= chained
+        best[start] = cost[start] + np.where(use_first, first, chained)
+        chosen = ends - max_length + pick
+        prev_start[start] = np.where(use_first, -1, chosen)
+        # finished_width keeps changing as later overlaps finish, so the
+        # width of the chosen predecessor is recorded now.
+        prev_width[start] = np.where(use_first, -1, finished_width[np.clip(chosen, 0, seq_l - 1)])
+
+    # The last oligo runs from the start of the final overlap to the end.
+    last_starts = np.arange(max(1, seq_l - max_length), max(1, seq_l - min_length + 1))
+    if not len(last_starts):
+        return []
+    tail = best[last_starts]
+    flat = int(np.argmin(tail))
+    if not np.isfinite(tail.flat[flat]):
+        return []
 
-def clean_oligos(oligos, end_len=8, score_threshold=0.75, trim_limit=8):
-    cleaned = []
-    for obj in oligos:
-        seq = obj['sequence']
+    start = int(last_starts[flat // n_widths])
+    k = flat % n_widths
+    overlaps = []
+    while start >= 0:
+        overlaps.append((start, start + int(widths[k])))
+        start, k = int(prev_start[start, k]), int(prev_width[start, k])
+    return overlaps[::-1]
+
+def tm_balanced_oligo_maker(sequence, min_length=40, max_length=60, min_overlap=18, max_overlap=30,
+                            target_tm=62, na_conc=50, k_conc=0, oligo_conc=250):
+    """Oligos whose boundaries are chosen together so every overlap is near target_tm.
+
+    Labels follow the other makers: FF_ oligos are top-strand pieces and
+    RC_ oligos the reverse complements that bridge them. Each oligo also
+    carries the Tm of the overlap it shares with the next one. A fragment
+    of at most max_length needs no overlap and is a single FF_1 oligo;
+    longer ones return [] when no layout satisfies the length limits.
+    """
+    if len(sequence) <= max_length:
+        return [{'label': 'FF_1', 'sequence': sequence.upper(), 'length': len(sequence)}] if sequence else []
+
+    sequence = sequence.upper()
+    profile = ThermoProfile(sequence)
+    overlaps = _balanced_overlaps(profile, min_length, max_length, min_overlap, max_overlap,
+                                  target_tm, na_conc, k_conc, oligo_conc)
+    if not overlaps:
+        return []
+
+    bounds = [0] + [start for start, _ in overlaps]
+    ends = [end for _, end in overlaps] + [len(sequence)]
+    forward = []
+    reverse = []
+    for k, (start, end) in enumerate(zip(bounds, ends)):
+        segment = sequence[start:end]
+        oligo = {
+            'sequence': segment if k % 2 == 0 else get_reverse_complement(segment),
+            'length': end - start
+        }
+        if k < len(overlaps):
+            overlap_start, overlap_end = overlaps[k]
+            oligo['overlap_tm'] = round(profile.tm(overlap_start, overlap_end, na_conc, k_conc, oligo_conc), 2)
+        (forward if k % 2 == 0 else reverse).append(oligo)
+
+    return (
+        [{'label': f'FF_{i+1}', **oligo} for i, oligo in enumerate(forward)]
+        + [{'label': f'RC_{i+1}', **oligo} for i, oligo in enumerate(reverse)]
+    )
+
+def _pool_end_scores(oligos, row, members, index, start_seq, end_seq, worst5, worst3):
+    # Same result as scoring the ends against every other oligo of members
+    # in pool order and stopping at the first exact match.
+    if worst5 == 1 or worst3 == 1:
+        # An exact self match stops the scan after the first member it keeps.
+        for other in members:
+            if oligos.same(other, row) or oligos.is_partner(row, other):
+                continue
+            return (max(worst5, score_end_match(start_seq, oligos.sequences[other])),
+                    max(worst3, score_end_match(end_seq, oligos.sequences[other])))
+        return worst5, worst3
+
+    # Members without a one-mismatch window score 0 and never stop the scan,
+    # so only the index candidates need scoring.
+    start_hits = index.candidates(get_reverse_complement(start_seq))
+    end_hits = index.candidates(get_reverse_complement(end_seq))
+    for member in sorted(start_hits | end_hits):
+        other = members[member]
+        if oligos.same(other, row) or oligos.is_partner(row, other):
+            continue
+        if member in start_hits:
+            worst5 = max(worst5, score_end_match(start_seq, oligos.sequences[other]))
+        if member in end_hits:
+            worst3 = max(worst3, score_end_match(end_seq, oligos.sequences[other]))
+        if worst5 == 1 or worst3 == 1:
+            break
+    return worst5, worst3
+
+def clean_oligos(oligos, end_len=8, score_threshold=0.75, trim_limit=8, interactions=None, scope=None):
+    """Trim oligo ends that cross-hybridize with the rest of the pool.
+
+    Takes an OligoSet or a list of oligo dicts and returns the same kind.
+    """
+    as_dicts = not isinstance(oligos, OligoSet)
+    pool = OligoSet.from_dicts(oligos) if as_dicts else oligos
+
+    # With a scope key (e.g. 'fragment'), oligos are only checked against the
+    # oligos sharing their value for it, since separate assembly wells never
+    # see each other's oligos.
+    if scope == 'fragment':
+        scope_values = pool.fragment_ids
+    elif scope:
+        scope_values = pool.column(scope)
+    else:
+        scope_values = [None] * len(pool)
+    groups = {}
+    for row, value in enumerate(scope_values):
+        groups.setdefault(value, []).append(row)
+    indexes = {
+        value: KmerIndex([pool.sequences[row] for row in members], end_len)
+        for value, members in groups.items()
+    }
+
+    sequences = []
+    lengths = []
+    invalid = []
+    for row, value in enumerate(scope_values):
+        members = groups[value]
+        index = indexes[value]
+        seq = pool.sequences[row]
         trimmed5 = 0
         trimmed3 = 0
         is_valid = False
@@ -85,16 +266,11 @@ def clean_oligos(oligos, end_len=8, score_threshold=0.75, trim_limit=8):
             start_seq = seq[:end_len]
             end_seq = seq[-end_len:]
 
-            worst5 = score_end_match(start_seq, seq[end_len:])
-            worst3 = score_end_match(end_seq, seq[:-end_len])
-
-            for other in oligos:
-                if other == obj or is_intended_partner(obj, other):
-                    continue
-                worst5 = max(worst5, score_end_match(start_seq, other['sequence']))
-                worst3 = max(worst3, score_end_match(end_seq, other['sequence']))
-                if worst5 == 1 or worst3 == 1:
-                    break
+            worst5, worst3 = _pool_end_scores(
+                pool, row, members, index, start_seq, end_seq,
+                score_end_match(start_seq, seq[end_len:]),
+                score_end_match(end_seq, seq[:-end_len])
+            )
 
             conflict5 = worst5 >= score_threshold
             conflict3 = worst3 >= score_threshold
@@ -114,46 +290,74 @@ def clean_oligos(oligos, end_len=8, score_threshold=0.75, trim_limit=8):
         
         if is_valid:
             trimmed_homo = trim_terminal_homopolymers(seq, 5)
-            cleaned.append({
-                **obj,
-                'sequence': trimmed_homo,
-                'length': len(trimmed_homo),
-                'invalid': False 
-            })
+            sequences.append(trimmed_homo)
+            lengths.append(len(trimmed_homo))
         else:
-            cleaned.append({
-                **obj,
-                'invalid': True,
-                'sequence': obj['sequence'],
-                'length': obj['length']
-            })
-    return cleaned
+            sequences.append(pool.sequences[row])
+            lengths.append(pool.lengths[row])
+        invalid.append(not is_valid)
+
+    cleaned = pool.with_columns(sequence=sequences, length=lengths, invalid=invalid)
+
+    # Keep a shared interaction matrix in step with the trimmed pool so a
+    # following optimize_oligos pass only pays for the rows that changed.
+    if interactions is not None:
+        interactions.sync(cleaned)
+    return cleaned.to_dicts() if as_dicts else cleaned
+
+def _position_masks(text, chars):
+    # Bit i of masks[c] is set where text[i] == c.
+    masks = {}
+    if text.isascii():
+        reversed_text = text.encode('ascii')[::-1]
+        for char in chars:
+            if not char.isascii():
+                masks[char] = 0
+                continue
+            table = bytearray(b'0' * 256)
+            table[ord(char)] = ord('1')
+            masks[char] = int(reversed_text.translate(table), 2)
+    else:
+        for char in chars:
+            masks[char] = int(''.join('1' if c == char else '0' for c in reversed(text)), 2)
+    return masks
 
 def score_end_match(end_seq, target_seq):
     end_len = len(end_seq)
     end_rc = get_reverse_complement(end_seq)
-    worst_score = 0
+    if jit_kernels() is not None:
+        score = jit_end_match(end_rc, target_seq)
+        if score is not None:
+            return score
 
-    for i in range(len(target_seq) - end_len + 1):
-        window = target_seq[i:i + end_len]
-        mismatches = 0
-        mismatch_pos = -1
-
-        for p in range(end_len):
-            if end_rc[p] != window[p]:
-                mismatches += 1
-                mismatch_pos = p + 1
-                if mismatches > 1:
-                    break
-        
-        if mismatches == 0:
-            return 1
-        if mismatches == 1:
-            base = end_rc[mismatch_pos - 1]
+    n_windows = len(target_seq) - end_len + 1
+    if n_windows <= 0:
+        return 0
+    if end_len == 0:
+        return 1
+
+    # Bit-parallel over window starts: bit i of agrees[p] says whether the
+    # window starting at i matches end_rc at offset p. A window has exactly
+    # one mismatch, at p, when it agrees everywhere except p.
+    masks = _position_masks(target_seq, set(end_rc))
+    windows = (1 << n_windows) - 1
+    agrees = [(masks[end_rc[p]] >> p) & windows for p in range(end_len)]
+    before = [windows]
+    for p in range(end_len):
+        before.append(before[-1] & agrees[p])
+    if before[-1]:
+        return 1
+    after = windows
+
+    worst_score = 0
+    for p in range(end_len - 1, -1, -1):
+        if before[p] & after:
+            base = end_rc[p]
             base_penalty = 1.0 if base in ['G', 'C'] else 0.5
-            pos_weight = mismatch_pos / end_len
+            pos_weight = (p + 1) / end_len
             score = (7 / 8) - pos_weight * base_penalty
             worst_score = max(worst_score, score)
+        after &= agrees[p]
     return worst_score
 
 def is_intended_partner(a, b):
@@ -180,54 +384,171 @@ def trim_terminal_homopolymers(seq, window=5):
         trimmed_seq = trimmed_seq[:len(trimmed_seq) - len(end_match.group(0)) + 1]
     return trimmed_seq
 
-def optimize_oligos(oligos, na_conc, k_conc, oligo_conc):
-    optimized = []
+def _optimize_sequence(sequence, na_conc, k_conc, oligo_conc, interactions, stats=None):
+    # First acceptable trim of sequence, or None when no trim passes.
     MIN_LENGTH = 20
     MAX_TRIM = 10
 
-    for oligo in oligos:
-        is_optimized = False
-        
-        for left_trim in range(MAX_TRIM + 1):
-            for right_trim in range(MAX_TRIM + 1):
-                new_length = len(oligo['sequence']) - left_trim - right_trim
-                if new_length < MIN_LENGTH:
-                    continue
-
-                trimmed_seq = oligo['sequence'][left_trim:len(oligo['sequence']) - right_trim]
-                temp_oligo = {**oligo, 'sequence': trimmed_seq}
-
-                if is_oligo_acceptable(oligos, temp_oligo, na_conc, k_conc, oligo_conc):
-                    optimized.append({
-                        **oligo,
-                        'sequence': trimmed_seq,
-                        'length': new_length,
-                        'invalid': False
-                    })
-                    is_optimized = True
-                    break
-            if is_optimized:
-                break
-        
-        if not is_optimized:
-            optimized.append({
-                **oligo,
-                'invalid': True
-            })
-    return optimized
-
-def is_oligo_acceptable(oligos, target_oligo, na_conc, k_conc, oligo_conc):
+    # Every trim is a window of the same parent, so GC, Tm and duplex dG
+    # come from one set of prefix sums instead of a rescan per candidate.
+    profile = ThermoProfile(sequence)
+
+    for left_trim in range(MAX_TRIM + 1):
+        for right_trim in range(MAX_TRIM + 1):
+            new_length = len(sequence) - left_trim - right_trim
+            if new_length < MIN_LENGTH:
+                continue
+
+            trimmed_seq = sequence[left_trim:len(sequence) - right_trim]
+            window = (left_trim, len(sequence) - right_trim)
+
+            if is_oligo_acceptable(None, {'sequence': trimmed_seq}, na_conc, k_conc, oligo_conc, interactions, profile, window, stats):
+                return trimmed_seq
+    return None
+
+def optimize_oligos(oligos, na_conc, k_conc, oligo_conc, interactions=None, workers=1, stats=None, checkpoint=None):
+    """Trim every oligo to the first window that passes is_oligo_acceptable.
+
+    Takes an OligoSet or a list of oligo dicts and returns the same kind.
+    With an OptimizeCheckpoint, results are saved as they are produced and
+    oligos a previous run of the same pool and conditions finished are
+    not optimized again.
+    """
+    as_dicts = not isinstance(oligos, OligoSet)
+    pool = OligoSet.from_dicts(oligos) if as_dicts else oligos
+
+    trimmed = [None] * len(pool)
+    pending = list(range(len(pool)))
+    save = None
+    if checkpoint is not None:
+        run = checkpoint.run_key(pool.sequences, na_conc, k_conc, oligo_conc)
+        done = checkpoint.load(run, len(pool))
+        for row, seq in done.items():
+            trimmed[row] = seq
+        pending = [row for row in pending if row not in done]
+
+        def save(rows, results):
+            checkpoint.save(run, rows, results)
+
+    if pending:
+        if interactions is None:
+            interactions = PoolInteractions(pool)
+        else:
+            interactions.sync(pool)
+
+    # Oligos only read the pool, so their trim searches can run in separate
+    # processes; results come back in input order.
+    if workers > 1 and len(pending) >= MIN_PARALLEL_OLIGOS:
+        on_chunk = None
+        if save is not None:
+            def on_chunk(start, results):
+                save(pending[start:start + len(results)], results)
+        results = optimize_sequences_parallel(
+            [pool.sequences[row] for row in pending], na_conc, k_conc, oligo_conc,
+            interactions, workers, stats, on_chunk
+        )
+        for row, seq in zip(pending, results):
+            trimmed[row] = seq
+    else:
+        for start in range(0, len(pending), CHECKPOINT_EVERY):
+            rows = pending[start:start + CHECKPOINT_EVERY]
+            results = [
+                _optimize_sequence(pool.sequences[row], na_conc, k_conc, oligo_conc, interactions, stats)
+                for row in rows
+            ]
+            for row, seq in zip(rows, results):
+                trimmed[row] = seq
+            if save is not None:
+                save(rows, results)
+
+    optimized = pool.with_columns(
+        sequence=[seq if seq is not None else old for seq, old in zip(trimmed, pool.sequences)],
+        length=[len(seq) if seq is not None else old for seq, old in zip(trimmed, pool.lengths)],
+        invalid=[seq is None for seq in trimmed]
+    )
+    return optimized.to_dicts() if as_dicts else optimized
+
+ACCEPTANCE_STAGES = ('gc', 'dg_full', 'tm', 'dg_intra', 'dg_partial')
+
+class AcceptanceStats:
+    """Per-stage counters of is_oligo_acceptable: how often each check ran,
+    how often it rejected the candidate and the time it took."""
+
+    def __init__(self):
+        self.candidates = 0
+        self.accepted = 0
+        self.stages = {
+            name: {'evaluated': 0, 'rejected': 0, 'seconds': 0.0}
+            for name in ACCEPTANCE_STAGES
+        }
+
+    def record(self, name, seconds, passed):
+        counters = self.stages[name]
+        counters['evaluated'] += 1
+        counters['seconds'] += seconds
+        if not passed:
+            counters['rejected'] += 1
+
+    def merge(self, other):
+        self.candidates += other.candidates
+        self.accepted += other.accepted
+        for name, counters in other.stages.items():
+            for key, value in counters.items():
+                self.stages[name][key] += value
+
+    def as_dict(self):
+        return {
+            'candidates': self.candidates,
+            'accepted': self.accepted,
+            'stages': {
+                name: {**counters, 'seconds': round(counters['seconds'], 6)}
+                for name, counters in self.stages.items()
+            }
+        }
+
+def _stage_passed(stats, name, started, passed):
+    # Record one check in stats, when they are collected, and pass its result on.
+    if stats is not None:
+        stats.record(name, time.perf_counter() - started, passed)
+    return passed
+
+def is_oligo_acceptable(oligos, target_oligo, na_conc, k_conc, oligo_conc, interactions=None, profile=None, window=None, stats=None):
+    # Cheapest first: windowed prefix sums (or one scan) for GC, the duplex
+    # and Tm, then the O(L^2) hairpin scan, then the pool-wide dimer scan.
     seq = target_oligo['sequence']
-    gc = get_gc_content(seq)
-    tm = get_tm(seq, na_conc, k_conc, oligo_conc)
-    dg_intra = get_dg_intra_hairpin(seq)
-    dg_full = get_dg_full_complementary(seq)
-    dg_partial = get_dg_partial_complementary(oligos, target_oligo)
-    
-    gc_valid = 25 <= gc <= 75
-    tm_valid = 50 <= tm <= 75
-    dg_intra_valid = dg_intra >= -3
-    dg_full_valid = dg_full <= -20
-    dg_partial_valid = dg_partial >= -5
-
-    return gc_valid and tm_valid and dg_intra_valid and dg_full_valid and dg_partial_valid
+    if stats is not None:
+        stats.candidates += 1
+
+    started = time.perf_counter()
+    gc = profile.gc_content(*window) if profile is not None else get_gc_content(seq)
+    if not _stage_passed(stats, 'gc', started, 25 <= gc <= 75):
+        return False
+
+    started = time.perf_counter()
+    dg_full = profile.dg_full_complementary(*window) if profile is not None else get_dg_full_complementary(seq)
+    if not _stage_passed(stats, 'dg_full', started, dg_full <= -20):
+        return False
+
+    started = time.perf_counter()
+    if profile is not None:
+        tm = profile.tm(*window, na_conc, k_conc, oligo_conc)
+    else:
+        tm = get_tm(seq, na_conc, k_conc, oligo_conc)
+    if not _stage_passed(stats, 'tm', started, 50 <= tm <= 75):
+        return False
+
+    started = time.perf_counter()
+    if not _stage_passed(stats, 'dg_intra', started, get_dg_intra_hairpin(seq) >= -3):
+        return False
+
+    started = time.perf_counter()
+    if interactions is not None:
+        dg_partial = interactions.candidate_worst(seq)
+    else:
+        dg_partial = get_dg_partial_complementary(oligos, target_oligo)
+    if not _stage_passed(stats, 'dg_partial', started, dg_partial >= -5):
+        return False
+
+    if stats is not None:
+        stats.accepted += 1
+    return True
@@ -0,0 +1,147 @@
+"""
+Persistent per-oligo checkpoints for optimize_oligos runs.
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+# Bump when the trim search or acceptance checks change, so old results are not reused.
+CHECKPOINT_VERSION = 1
+# Oligos optimized between two checkpoint writes in a serial run.
+CHECKPOINT_EVERY = 32
+# Runs opened between two prunes of expired runs.
+PRUNE_EVERY_RUNS = 50
+
+
+class OptimizeCheckpoint:
+    """SQLite file holding the result of every oligo an optimize_oligos run finished.
+
+    A run is identified by a hash of the pool's sequences (in order) and the
+    conditions; each oligo's result depends on exactly those, so a run that
+    was interrupted, or an identical design submitted again, picks up the
+    stored results and only optimizes the rest. Runs not touched for
+    ttl_seconds are pruned when the store is opened and then every
+    PRUNE_EVERY_RUNS runs. Connections are per thread, in WAL mode, as in
+    ThermoStore.
+    """
+
+    def __init__(self, path, ttl_seconds=7 * 24 * 3600):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.resumed = 0
+        self.saved = 0
+        self._runs = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._connection()
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS runs ('
+            'run TEXT PRIMARY KEY, size INTEGER NOT NULL, updated REAL NOT NULL)'
+        )
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS results ('
+            'run TEXT NOT NULL, row INTEGER NOT NULL, sequence TEXT, '
+            'PRIMARY KEY (run, row)) WITHOUT ROWID'
+        )
+        conn.commit()
+        self.prune()
+
+    def _connection(self):
+        # sqlite3 connections cannot be shared between threads.
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def run_key(sequences, na_conc, k_conc, oligo_conc):
+        digest = hashlib.sha1(repr((CHECKPOINT_VERSION, na_conc, k_conc, oligo_conc)).encode('utf-8'))
+        for seq in sequences:
+            digest.update((seq or '').encode('ascii', 'replace'))
+            digest.update(b'\n')
+        return digest.hexdigest()
+
+    def load(self, run, size):
+        """{row: trimmed sequence or None} for the oligos of run already optimized."""
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                'INSERT INTO runs (run, size, updated) VALUES (?, ?, ?) '
+                'ON CONFLICT(run) DO UPDATE SET updated = excluded.updated',
+                (run, size, time.time())
+            )
+        done = dict(conn.execute('SELECT row, sequence FROM results WHERE run = ?', (run,)))
+        with self._lock:
+            self.resumed += len(done)
+            self._runs += 1
+            prune = self._runs % PRUNE_EVERY_RUNS == 0
+        if prune:
+            self.prune()
+        return done
+
+    def save(self, run, rows, sequences):
+        """Record the results (trimmed sequence, None when rejected) of rows."""
+        conn = self._connection()
+        with conn:
+            conn.executemany(
+                'INSERT OR REPLACE INTO results (run, row, sequence) VALUES (?, ?, ?)',
+                [(run, int(row), seq) for row, seq in zip(rows, sequences)]
+            )
+            conn.execute('UPDATE runs SET updated = ? WHERE run = ?', (time.time(), run))
+        with self._lock:
+            self.saved += len(rows)
+
+    def prune(self):
+        conn = self._connection()
+        with conn:
+            cutoff = time.time() - self.ttl_seconds
+            conn.execute('DELETE FROM results WHERE run IN (SELECT run FROM runs WHERE updated < ?)', (cutoff,))
+            conn.execute('DELETE FROM runs WHERE updated < ?', (cutoff,))
+
+    def clear(self):
+        conn = self._connection()
+        with conn:
+            conn.execute('DELETE FROM results')
+            conn.execute('DELETE FROM runs')
+
+    def stats(self):
+        conn = self._connection()
+        runs = conn.execute('SELECT COUNT(*) FROM runs').fetchone()[0]
+        results = conn.execute('SELECT COUNT(*) FROM results').fetchone()[0]
+        with self._lock:
+            return {
+                'path': self.path,
+                'runs': runs,
+                'results': results,
+                'ttl_seconds': self.ttl_seconds,
+                'resumed': self.resumed,
+                'saved': self.saved
+            }
+
+
+_checkpoint = None
+
+
+def configure_optimize_checkpoint(path, ttl_seconds=None):
+    """Checkpoint optimize_oligos runs to an SQLite file; an empty path disables it."""
+    global _checkpoint
+    if not path:
+        _checkpoint = None
+        return
+    options = {}
+    if ttl_seconds is not None:
+        options['ttl_seconds'] = ttl_seconds
+    _checkpoint = OptimizeCheckpoint(path, **options)
+
+
+def get_optimize_checkpoint():
+    return _checkpoint
@@ -0,0 +1,189 @@
+"""
+Assembly junctions and the check that every overlap is unique in its pool.
+"""
+import numpy as np
+
+from .oligo_set import FORWARD, OligoSet
+from .sequence_utils import get_reverse_complement
+from .thermo_utils import INVALID_CODE, encode_pool, reverse_complement_pool
+
+# Deletion keys pack k - 1 bases at 2 bits plus the deleted position into an int64.
+MAX_OVERLAP_K = 28
+# k-mer length compared between overlaps, for direct callers and the API alike.
+DEFAULT_OVERLAP_K = 16
+
+
+def _top_strand(oligos, row):
+    seq = oligos.sequences[row] or ''
+    return seq if oligos.orientation[row] == FORWARD else get_reverse_complement(seq)
+
+
+def _suffix_prefix(left, right, min_overlap):
+    # Longest suffix of left that is also a prefix of right.
+    for width in range(min(len(left), len(right)), min_overlap - 1, -1):
+        if left.endswith(right[:width]):
+            return width
+    return 0
+
+
+def find_junctions(oligos, min_overlap=8, scope=None):
+    """Overlap regions where consecutive oligos of each fragment anneal.
+
+    Every maker lays a fragment out as FF_1, RC_1, FF_2, RC_2, ... along the
+    top strand, so each neighbouring pair in that order shares the longest
+    suffix/prefix of their top-strand sequences. Pairs sharing fewer than
+    min_overlap bases (gapped designs) have no junction. Returns dicts with
+    fragment, left, right, overlap and the scope value the junction belongs to.
+    """
+    if not isinstance(oligos, OligoSet):
+        oligos = OligoSet.from_dicts(oligos)
+    scope_values = oligos.column(scope) if scope else [None] * len(oligos)
+
+    chains = {}
+    for row in range(len(oligos)):
+        if oligos.index[row] is not None and oligos.sequences[row]:
+            chains.setdefault(oligos.fragment_ids[row], []).append(row)
+
+    junctions = []
+    for rows in chains.values():
+        rows.sort(key=lambda row: (oligos.index[row], oligos.orientation[row]))
+        for left, right in zip(rows, rows[1:]):
+            left_top = _top_strand(oligos, left)
+            width = _suffix_prefix(left_top, _top_strand(oligos, right), min_overlap)
+            if width:
+                junctions.append({
+                    'fragment': oligos.fragments[left],
+                    'left': oligos.labels[left],
+                    'right': oligos.labels[right],
+                    'overlap': left_top[len(left_top) - width:],
+                    'scope': scope_values[left]
+                })
+    return junctions
+
+
+def _pack(columns):
+    packed = np.zeros(columns.shape[1], dtype=np.int64)
+    for column in columns:
+        packed = (packed << 2) | column
+    return packed
+
+
+def _deletion_keys(columns, k):
+    # keys[p] is every window with base p removed, tagged with p. Prefixes
+    # and suffixes are packed once and joined, instead of repacking k - 1
+    # bases per deletion.
+    prefix = [np.zeros(columns.shape[1], dtype=np.int64)]
+    for p in range(1, k):
+        prefix.append((prefix[-1] << 2) | columns[p - 1])
+    keys = np.empty(columns.shape, dtype=np.int64)
+    suffix = np.zeros(columns.shape[1], dtype=np.int64)
+    for p in range(k - 1, -1, -1):
+        # suffix packs bases p + 1 .. k - 1, 2 * (k - 1 - p) bits.
+        keys[p] = (p << (2 * (k - 1))) | (prefix[p] << (2 * (k - 1 - p))) | suffix
+        suffix |= columns[p] << (2 * (k - 1 - p))
+    return keys
+
+
+def overlap_conflicts(overlaps, k=DEFAULT_OVERLAP_K, max_mismatches=1, groups=None):
+    """Groups of overlaps that share a k-mer on either strand.
+
+    With max_mismatches=1 two k-mers also match when they differ at one
+    position: both are hashed under their k single-base deletions, and two
+    k-mers at Hamming distance 1 share the deletion at the position where
+    they differ. Each k-mer keeps the smaller of its own key and the key of
+    its reverse complement, so inverted repeats collide too. Collisions are
+    found by sorting the keys, so the check is O(n log n) in the total
+    overlap length. groups optionally gives each overlap a pool; overlaps
+    only conflict within the same one.
+
+    Returns sorted tuples of overlap indices, one per distinct group.
+    """
+    if not 1 <= k <= MAX_OVERLAP_K:
+        raise ValueError(f'k must be between 1 and {MAX_OVERLAP_K}')
+    if max_mismatches not in (0, 1):
+        raise ValueError('max_mismatches must be 0 or 1')
+
+    codes, offsets, lengths = encode_pool(overlaps)
+    rc_codes = reverse_complement_pool(codes, offsets, lengths)
+    n_windows = np.maximum(lengths - k + 1, 0)
+    owner = np.repeat(np.arange(len(overlaps)), n_windows)
+    local = np.arange(int(n_windows.sum())) - np.repeat(np.cumsum(n_windows) - n_windows, n_windows)
+    starts = offsets[owner] + local
+    # The reverse complement of window s is window length - k - s of the rc strand.
+    rc_starts = offsets[owner] + lengths[owner] - k - local
+
+    # One row per window position, one column per window.
+    span = np.arange(k)[:, None]
+    valid = (codes[starts + span] != INVALID_CODE).all(axis=0)
+    starts, rc_starts, owner = starts[valid], rc_starts[valid], owner[valid]
+    columns = codes[starts + span].astype(np.int64)
+    rc_columns = rc_codes[rc_starts + span].astype(np.int64)
+
+    if max_mismatches:
+        # Deleting base p of a window deletes base k - 1 - p of its reverse complement.
+        keys = np.minimum(_deletion_keys(columns, k), _deletion_keys(rc_columns, k)[::-1])
+    else:
+        keys = np.minimum(_pack(columns), _pack(rc_columns))[None, :]
+    owner = np.tile(owner, keys.shape[0])
+    keys = keys.ravel()
+    if not len(keys):
+        return []
+
+    # Nearly every key is unique; only repeated ones need the full sort.
+    order = np.argsort(keys)
+    repeated = keys[order[1:]] == keys[order[:-1]]
+    in_run = np.zeros(len(keys), dtype=bool)
+    in_run[1:] |= repeated
+    in_run[:-1] |= repeated
+    keys, owner = keys[order[in_run]], owner[order[in_run]]
+    if not len(keys):
+        return []
+
+    pool = np.zeros(len(overlaps), dtype=np.int64)
+    if groups is not None:
+        numbering = {}
+        pool = np.array([numbering.setdefault(group, len(numbering)) for group in groups], dtype=np.int64)
+    pool = pool[owner]
+
+    order = np.lexsort((owner, keys, pool))
+    keys, pool, owner = keys[order], pool[order], owner[order]
+    boundary = np.flatnonzero((keys[1:] != keys[:-1]) | (pool[1:] != pool[:-1])) + 1
+    run_starts = np.concatenate(([0], boundary))
+    run_ends = np.concatenate((boundary, [len(keys)]))
+    # Owners are sorted inside a run, so a run is shared when its ends differ.
+    shared = owner[run_starts] != owner[np.maximum(run_ends - 1, 0)]
+
+    conflicts = set()
+    for start, end in zip(run_starts[shared], run_ends[shared]):
+        conflicts.add(tuple(np.unique(owner[start:end]).tolist()))
+    return sorted(conflicts)
+
+
+def validate_overlaps(oligos, k=DEFAULT_OVERLAP_K, max_mismatches=1, min_overlap=8, scope=None):
+    """Flag assembly junctions whose overlap is not unique in its pool.
+
+    An overlap that shares a (near-)identical k-mer with another junction
+    can anneal there instead and mis-assemble the construct. scope works as
+    in clean_oligos: None checks the whole request, 'fragment' or a column
+    name such as 'pool' only compares junctions assembled together.
+    """
+    junctions = find_junctions(oligos, min_overlap, scope)
+    groups = overlap_conflicts(
+        [junction['overlap'] for junction in junctions], k, max_mismatches,
+        [junction['fragment'] if scope == 'fragment' else junction['scope'] for junction in junctions]
+    )
+
+    flagged = sorted({member for group in groups for member in group})
+
+    def describe(member):
+        return {key: junctions[member][key] for key in ('fragment', 'left', 'right', 'overlap')}
+
+    return {
+        'k': k,
+        'max_mismatches': max_mismatches,
+        'junctions': len(junctions),
+        'flagged': len(flagged),
+        'unique': not flagged,
+        'flagged_junctions': [describe(member) for member in flagged],
+        'conflicts': [[describe(member) for member in group] for group in groups]
+    }
@@ -0,0 +1,197 @@
+"""
+Compact 2-bit packed DNA sequences.
+"""
+import numpy as np
+
+from .thermo_utils import BASES, INVALID_CODE, encode_sequence
+
+_IUPAC_COMPLEMENT = {
+    'A': 'T', 'T': 'A', 'C': 'G', 'G': 'C', 'W': 'W', 'S': 'S',
+    'M': 'K', 'K': 'M', 'R': 'Y', 'Y': 'R', 'B': 'V', 'D': 'H',
+    'H': 'D', 'V': 'B', 'N': 'N'
+}
+_COMPLEMENT_TABLE = str.maketrans('ACGT', 'TGCA')
+# Codes and characters of the four bases packed in each possible byte.
+_BYTE_CODES = (np.arange(256, dtype=np.uint8)[:, None] >> (2 * np.arange(4, dtype=np.uint8))) & 3
+_BYTE_CHARS = np.frombuffer(BASES.encode('ascii'), dtype=np.uint8)[_BYTE_CODES]
+_NO_POSITIONS = np.zeros(0, dtype=np.int64)
+
+
+class PackedSequence:
+    """DNA sequence stored at 2 bits per base.
+
+    A, C, G and T are packed four to a byte using the thermo_utils codes
+    (A=0, C=1, G=2, T=3). Any other character (IUPAC ambiguity codes, N, gaps)
+    is kept in a small side channel of sorted positions. Slices and reverse
+    complements are views over the same packed buffer, and codes() exports
+    the array the thermodynamic kernels consume directly.
+
+    The sequence is uppercased when packed. It compares and hashes like
+    that uppercase str, and provides the read-only str methods the
+    sequence_utils helpers use (count, find, startswith, endswith, in).
+    """
+
+    __slots__ = ('_data', '_iupac', '_start', '_length', '_reverse')
+
+    def __init__(self, sequence='', _view=None):
+        if _view is not None:
+            self._data, self._iupac, self._start, self._length, self._reverse = _view
+            return
+
+        sequence = str(sequence).upper()
+        codes = encode_sequence(sequence)
+        positions = np.flatnonzero(codes == INVALID_CODE)
+        self._pack(codes, (positions, ''.join(sequence[pos] for pos in positions)))
+
+    def _pack(self, codes, iupac):
+        codes = np.where(codes == INVALID_CODE, 0, codes).astype(np.uint8)
+        padded = np.zeros((len(codes) + 3) // 4 * 4, dtype=np.uint8)
+        padded[:len(codes)] = codes
+        quads = padded.reshape(-1, 4)
+        self._data = quads[:, 0] | (quads[:, 1] << 2) | (quads[:, 2] << 4) | (quads[:, 3] << 6)
+        self._iupac = iupac
+        self._start = 0
+        self._length = len(codes)
+        self._reverse = False
+
+    def _view(self, start, length, reverse):
+        return PackedSequence(_view=(self._data, self._iupac, start, length, reverse))
+
+    def __len__(self):
+        return self._length
+
+    @property
+    def nbytes(self):
+        """Bytes of packed storage covered by this view plus its side channel."""
+        positions, chars = self._ambiguous()
+        return (self._length + 3) // 4 + positions.nbytes + len(chars)
+
+    def _bytes(self):
+        # Packed bytes covering the view, and the view's offset into their bases.
+        return self._data[self._start >> 2:(self._start + self._length + 3) >> 2], self._start & 3
+
+    def _ambiguous(self):
+        """(view positions, characters) of the non-ACGT bases, in position order."""
+        positions, chars = self._iupac
+        if not chars:
+            return _NO_POSITIONS, ''
+        lo, hi = np.searchsorted(positions, (self._start, self._start + self._length))
+        if lo == hi:
+            return _NO_POSITIONS, ''
+        found = positions[lo:hi] - self._start
+        chars = chars[lo:hi]
+        if self._reverse:
+            return self._length - 1 - found[::-1], ''.join(_IUPAC_COMPLEMENT.get(c, c) for c in reversed(chars))
+        return found, chars
+
+    def codes(self):
+        """Thermo kernel codes for this view (A=0, C=1, G=2, T=3, other=4)."""
+        data, offset = self._bytes()
+        codes = _BYTE_CODES[data].ravel()[offset:offset + self._length]
+        if self._reverse:
+            codes = 3 - codes[::-1]
+        positions, _ = self._ambiguous()
+        codes[positions] = INVALID_CODE
+        return codes
+
+    def __str__(self):
+        data, offset = self._bytes()
+        text = _BYTE_CHARS[data].tobytes().decode('ascii')[offset:offset + self._length]
+        if self._reverse:
+            text = text.translate(_COMPLEMENT_TABLE)[::-1]
+        positions, chars = self._ambiguous()
+        if not chars:
+            return text
+        pieces = []
+        previous = 0
+        for pos, char in zip(positions.tolist(), chars):
+            pieces.append(text[previous:pos])
+            pieces.append(char)
+            previous = pos + 1
+        pieces.append(text[previous:])
+        return ''.join(pieces)
+
+    def __repr__(self):
+        return f'PackedSequence({str(self)!r})'
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self._length)
+            if step != 1:
+                return PackedSequence(str(self)[key])
+            length = max(0, stop - start)
+            if self._reverse:
+                # View index i maps to underlying position start + length - 1 - i.
+                return self._view(self._start + self._length - start - length, length, True)
+            return self._view(self._start + start, length, False)
+
+        if key < 0:
+            key += self._length
+        if not 0 <= key < self._length:
+            raise IndexError('PackedSequence index out of range')
+        return str(self[key:key + 1])
+
+    def __iter__(self):
+        return iter(str(self))
+
+    def __eq__(self, other):
+        # Exactly as str compares, so equal objects always hash alike.
+        if isinstance(other, (PackedSequence, str)):
+            return str(self) == str(other)
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(str(self))
+
+    def __contains__(self, sub):
+        return str(sub) in str(self)
+
+    def count(self, sub, *bounds):
+        return str(self).count(str(sub), *bounds)
+
+    def find(self, sub, *bounds):
+        return str(self).find(str(sub), *bounds)
+
+    def startswith(self, prefix, *bounds):
+        return str(self).startswith(prefix, *bounds)
+
+    def endswith(self, suffix, *bounds):
+        return str(self).endswith(suffix, *bounds)
+
+    def upper(self):
+        return self
+
+    def reverse_complement(self):
+        """Reverse complement as a view over the same packed buffer."""
+        return self._view(self._start, self._length, not self._reverse)
+
+    def replace(self, position, bases):
+        """New sequence with bases substituted at position, e.g. a codon swap.
+
+        On a forward view from the start of its buffer (any sequence that
+        was packed directly) only the touched bytes of a copy are rewritten.
+        """
+        bases = bases.upper()
+        end = position + len(bases)
+        if not 0 <= position <= end <= self._length:
+            raise IndexError('PackedSequence replacement out of range')
+
+        positions, chars = self._ambiguous()
+        kept = [(pos, char) for pos, char in zip(positions.tolist(), chars) if not position <= pos < end]
+        added = [(position + offset, char) for offset, char in enumerate(bases) if char not in BASES]
+        iupac = sorted(kept + added)
+        iupac = (np.array([pos for pos, _ in iupac], dtype=np.int64), ''.join(char for _, char in iupac))
+
+        new_codes = encode_sequence(bases)
+        if self._start or self._reverse:
+            codes = self.codes()
+            codes[position:end] = new_codes
+            variant = PackedSequence()
+            variant._pack(codes, iupac)
+            return variant
+
+        data = self._data.copy()
+        for pos, code in zip(range(position, end), new_codes.tolist()):
+            shift = 2 * (pos & 3)
+            data[pos >> 2] = (int(data[pos >> 2]) & (0xFF ^ (3 << shift))) | ((code & 3) << shift)
+        return PackedSequence(_view=(data, iupac, 0, self._length, False))
@@ -0,0 +1,234 @@
+"""
+Process-parallel optimize_oligos with the encoded pool in shared memory.
+"""
+import atexit
+import threading
+from concurrent.futures import ProcessPoolExecutor, wait
+from contextlib import nullcontext
+from itertools import repeat
+from multiprocessing import get_context, shared_memory
+
+import numpy as np
+
+from .kernel_backend import get_backend, set_backend
+from .thermo_cache import apply_thermo_settings, flush_thermo_store, thermo_settings
+from .thermo_utils import encode_sequence, partial_dg_row
+
+# Below this many oligos, starting tasks costs more than it saves.
+MIN_PARALLEL_OLIGOS = 32
+# Tasks per worker; a few per worker evens out oligos of different cost.
+CHUNKS_PER_WORKER = 4
+
+_executor = None
+_executor_workers = 0
+_executor_settings = None
+_executor_lock = threading.Lock()
+
+
+class SharedPool:
+    """Copy of an encoded pool (codes, offsets, lengths) in shared memory.
+
+    Only the small handle (block names, shapes, dtypes) is pickled into each
+    task; workers map the same blocks instead of receiving the arrays.
+    """
+
+    def __init__(self, arrays):
+        self._blocks = []
+        self.handle = tuple(self._share(array) for array in arrays)
+
+    def _share(self, array):
+        block = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+        np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[:] = array
+        self._blocks.append(block)
+        return block.name, array.shape, array.dtype.str
+
+    def close(self):
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class SharedInteractions:
+    """Worker-side PoolInteractions.candidate_worst over a SharedPool handle."""
+
+    def __init__(self, handle):
+        self.handle = handle
+        self._candidates = {}
+        self._blocks = []
+        arrays = []
+        for name, shape, dtype in handle:
+            block = shared_memory.SharedMemory(name=name)
+            self._blocks.append(block)
+            arrays.append(np.ndarray(shape, dtype=dtype, buffer=block.buf))
+        self._codes, self._offsets, self._lengths = arrays
+
+    def candidate_worst(self, seq):
+        if seq in self._candidates:
+            return self._candidates[seq]
+        row = partial_dg_row(encode_sequence(seq), self._codes, self._offsets, self._lengths)
+        value = row.min() if len(row) else 0
+        value = float(value) if value < 0 else 0
+        self._candidates[seq] = value
+        return value
+
+    def close(self):
+        # Drop the array views first; a mapped buffer can't be closed while
+        # numpy still references it.
+        self._codes = self._offsets = self._lengths = None
+        for block in self._blocks:
+            block.close()
+        self._blocks = []
+
+
+# The pool a worker process last attached to; a new request replaces it.
+_worker_interactions = None
+
+
+def _worker_attach(handle):
+    global _worker_interactions
+    if _worker_interactions is None or _worker_interactions.handle != handle:
+        if _worker_interactions is not None:
+            _worker_interactions.close()
+        _worker_interactions = SharedInteractions(handle)
+    return _worker_interactions
+
+
+class _ChunkInteractions:
+    # Adds the parent's pool-member values to the worker's lookups, and
+    # records them so the parent can count them as a serial run would.
+    def __init__(self, shared, known):
+        self.shared = shared
+        self.known = known
+        self.lookups = 0
+        self.computed = {}
+
+    def candidate_worst(self, seq):
+        self.lookups += 1
+        if seq in self.known:
+            return self.known[seq]
+        value = self.shared.candidate_worst(seq)
+        self.computed[seq] = value
+        return value
+
+
+def _optimize_chunk(handle, chunk, known, na_conc, k_conc, oligo_conc, backend, with_stats):
+    from .oligo_utils import AcceptanceStats, _optimize_sequence
+
+    if get_backend() != backend:
+        set_backend(backend)
+    # No handle: the pool has no partial ΔG to look up (see PoolInteractions).
+    chunk_interactions = _ChunkInteractions(_worker_attach(handle), known) if handle is not None else None
+    stats = AcceptanceStats() if with_stats else None
+    results = [
+        _optimize_sequence(seq, na_conc, k_conc, oligo_conc, chunk_interactions, stats)
+        for seq in chunk
+    ]
+    # Worker processes exit without running atexit hooks.
+    flush_thermo_store()
+    if chunk_interactions is None:
+        return results, 0, {}, stats
+    return results, chunk_interactions.lookups, chunk_interactions.computed, stats
+
+
+def _worker_init(settings):
+    # The memoized thermo functions register their caches on import.
+    from . import sequence_utils  # noqa: F401
+
+    apply_thermo_settings(settings)
+
+
+def get_executor(workers):
+    """The shared worker pool, (re)started for workers processes and the current thermo settings."""
+    global _executor, _executor_workers, _executor_settings
+    settings = thermo_settings()
+    with _executor_lock:
+        if _executor is None or _executor_workers != workers or _executor_settings != settings:
+            if _executor is not None:
+                _executor.shutdown()
+            # spawn rather than fork: the parent may be a threaded server.
+            # Workers start with the parent's thermo cache and store settings.
+            _executor = ProcessPoolExecutor(
+                max_workers=workers, mp_context=get_context('spawn'),
+                initializer=_worker_init, initargs=(settings,)
+            )
+            _executor_workers = workers
+            _executor_settings = settings
+        return _executor
+
+
+def shutdown_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown()
+            _executor = None
+
+
+atexit.register(shutdown_executor)
+
+
+def map_chunks(func, items, workers, *args):
+    """func(chunk, *args) for consecutive chunks of items, in order, on the shared pool.
+
+    items is split into CHUNKS_PER_WORKER chunks per worker, so workers
+    that finish early pick up the remaining chunks.
+    """
+    items = list(items)
+    size = max(1, -(-len(items) // (workers * CHUNKS_PER_WORKER)))
+    chunks = [items[lo:lo + size] for lo in range(0, len(items), size)]
+    return get_executor(workers).map(func, chunks, *(repeat(arg) for arg in args))
+
+
+def optimize_sequences_parallel(sequences, na_conc, k_conc, oligo_conc, interactions, workers, stats=None, on_chunk=None):
+    """optimize_oligos' trim search spread over worker processes.
+
+    Returns the trimmed sequence (None when no trim passes) for each of
+    sequences, in order. Only sequences are sent to the workers, never the
+    oligo records. interactions must already be synced with the pool;
+    worker lookups are recorded in it as if they had been made serially,
+    so its hit/miss statistics do not depend on the number of workers.
+    Worker acceptance counters are added to stats when given. on_chunk(start, results) is
+    called as each chunk's results arrive, start being the index of its
+    first sequence.
+    """
+    n_chunks = min(len(sequences), workers * CHUNKS_PER_WORKER)
+    bounds = np.linspace(0, len(sequences), n_chunks + 1).astype(int)
+    chunks = [sequences[lo:hi] for lo, hi in zip(bounds[:-1], bounds[1:])]
+    index = interactions.member_index() if interactions.enabled else {}
+
+    executor = get_executor(workers)
+    backend = get_backend()
+    optimized = []
+    shared = SharedPool(interactions.encoded_pool()) if interactions.enabled else nullcontext()
+    with shared as pool:
+        futures = []
+        try:
+            for chunk in chunks:
+                futures.append(executor.submit(
+                    _optimize_chunk, pool.handle if pool is not None else None, chunk,
+                    {seq: interactions.worst(index[seq]) for seq in chunk if seq in index},
+                    na_conc, k_conc, oligo_conc, backend, stats is not None
+                ))
+            for start, future in zip(bounds[:-1], futures):
+                results, lookups, computed, chunk_stats = future.result()
+                if on_chunk is not None:
+                    on_chunk(int(start), results)
+                optimized.extend(results)
+                interactions.record_lookups(lookups, computed)
+                if chunk_stats is not None:
+                    stats.merge(chunk_stats)
+        except BaseException:
+            # Leaving the block unlinks the shared pool, so stop the chunks
+            # that haven't started and let running ones finish first.
+            for future in futures:
+                future.cancel()
+            wait(futures)
+            raise
+    return optimized
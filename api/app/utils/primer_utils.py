@@ -1,4 +1,5 @@
-from .sequence_utils import get_reverse_complement, get_gc_content
+from .sequence_utils import get_reverse_complement
+from .thermo_utils import ThermoProfile
 
 def calculate_primer_tm(sequence):
     gc_count = sequence.count('G') + sequence.count('C')
@@ -17,14 +18,14 @@ def generate_primers(sequence, options=None):
     desired_tm_max = options.get('desired_tm_max', 65)
 
     forward_primer = ''
+    profile = ThermoProfile(sequence[0:max_len])
     for i in range(min_len, max_len + 1):
         if i > len(sequence):
             break
-        primer_candidate = sequence[0:i]
-        tm = calculate_primer_tm(primer_candidate)
-        gc_content = get_gc_content(primer_candidate)
+        tm = profile.wallace_tm(0, i)
+        gc_content = profile.gc_content(0, i)
         if desired_tm_min <= tm <= desired_tm_max and desired_gc_min <= gc_content <= desired_gc_max:
-            forward_primer = primer_candidate
+            forward_primer = sequence[0:i]
             break
     
     if not forward_primer:
@@ -32,14 +33,14 @@ def generate_primers(sequence, options=None):
 
     reverse_primer = ''
     reverse_complement_seq = get_reverse_complement(sequence)
+    profile = ThermoProfile(reverse_complement_seq[0:max_len])
     for i in range(min_len, max_len + 1):
         if i > len(reverse_complement_seq):
             break
-        primer_candidate = reverse_complement_seq[0:i]
-        tm = calculate_primer_tm(primer_candidate)
-        gc_content = get_gc_content(primer_candidate)
+        tm = profile.wallace_tm(0, i)
+        gc_content = profile.gc_content(0, i)
         if desired_tm_min <= tm <= desired_tm_max and desired_gc_min <= gc_content <= desired_gc_max:
-            reverse_primer = primer_candidate
+            reverse_primer = reverse_complement_seq[0:i]
             break
 
     if not reverse_primer:
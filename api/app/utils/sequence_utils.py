@@ -1,13 +1,18 @@
-from ..config.constants import H_NN, S_NN, H_INIT, S_INIT, R, H_LOOP
+from ..config.constants import H_NN, S_NN, H_INIT, S_INIT, R
+import io
+import itertools
 import math
+from .thermo_cache import memoize_thermo
+from .thermo_utils import HAS_STACKS, encode_sequence, encode_pool, hairpin_dg_codes, partial_dg_row
+from .kernel_backend import jit_kernels, jit_nn_sums, jit_hairpin_dg, jit_partial_dg
+
+# Uppercase IUPAC codes; anything else (lowercase, U, gaps) passes through unchanged.
+_COMPLEMENT_TABLE = str.maketrans('ATCGWSMKRYBDHVN', 'TAGCWSKMYRVHDBN')
 
 def get_reverse_complement(sequence):
-    complement = {
-        'A': 'T', 'T': 'A', 'C': 'G', 'G': 'C', 'W': 'W', 'S': 'S',
-        'M': 'K', 'K': 'M', 'R': 'Y', 'Y': 'R', 'B': 'V', 'D': 'H',
-        'H': 'D', 'V': 'B', 'N': 'N'
-    }
-    return "".join(complement.get(base, base) for base in reversed(sequence))
+    if hasattr(sequence, 'reverse_complement'):
+        return str(sequence.reverse_complement())
+    return sequence.translate(_COMPLEMENT_TABLE)[::-1]
 
 def get_gc_content(seq):
     if not seq:
@@ -15,6 +20,25 @@ def get_gc_content(seq):
     gc_count = seq.count('G') + seq.count('C')
     return (gc_count / len(seq)) * 100
 
+def _nn_sums(seq):
+    # Scalar nearest-neighbor sums of an uppercase sequence; the numba backend
+    # runs the same loop in kernel_backend._nn_sums.
+    seq_l = len(seq)
+    delta_h = 0
+    delta_s = 0
+
+    for i in range(seq_l - 1):
+        dimer = seq[i:i+2]
+        if all(c in 'ATCG' for c in dimer):  # Only process valid nucleotides
+            delta_h += H_NN.get(dimer, 0)
+            delta_s += S_NN.get(dimer, 0)
+
+    if seq_l > 0:
+        delta_h += H_INIT.get(seq[0], 0) + H_INIT.get(seq[-1], 0)
+        delta_s += S_INIT.get(seq[0], 0) + S_INIT.get(seq[-1], 0)
+    return delta_h, delta_s
+
+@memoize_thermo
 def get_tm(seq, na_conc=50, k_conc=0, oligo_conc=250):
     try:
         if not seq or len(seq) < 2:
@@ -25,18 +49,10 @@ def get_tm(seq, na_conc=50, k_conc=0, oligo_conc=250):
 
         seq = seq.upper()
         seq_l = len(seq)
-        delta_h = 0
-        delta_s = 0
-
-        for i in range(seq_l - 1):
-            dimer = seq[i:i+2]
-            if all(c in 'ATCG' for c in dimer):  # Only process valid nucleotides
-                delta_h += H_NN.get(dimer, 0)
-                delta_s += S_NN.get(dimer, 0)
-
-        if seq_l > 0:
-            delta_h += H_INIT.get(seq[0], 0) + H_INIT.get(seq[-1], 0)
-            delta_s += S_INIT.get(seq[0], 0) + S_INIT.get(seq[-1], 0)
+        if jit_kernels() is not None:
+            delta_h, delta_s = jit_nn_sums(encode_sequence(seq))
+        else:
+            delta_h, delta_s = _nn_sums(seq)
 
         delta_h *= 1000
 
@@ -55,72 +71,33 @@ def get_tm(seq, na_conc=50, k_conc=0, oligo_conc=250):
         print(f"Error calculating Tm for sequence {seq}: {e}")
         return 0.0
 
+@memoize_thermo
 def get_dg_intra_hairpin(seq):
     try:
         if not seq:
             return 0.0
 
-        seq = seq.upper()
-        seq_l = len(seq)
-        min_dg = 0
-        if seq_l < 8:
-            return 0
-
-        for i in range(seq_l - 4):
-            for j in range(i + 4, seq_l):
-                stem1 = seq[i:j]
-                stem2 = get_reverse_complement(seq[j:])
-
-                stem_len = min(len(stem1), len(stem2))
-                if stem_len < 4:
-                    continue
-
-                delta_h = 0
-                delta_s = 0
-
-                for k in range(stem_len):
-                    if k < len(stem1) and k < len(stem2):
-                        dimer = stem1[k] + stem2[k]
-                        if all(c in 'ATCG' for c in dimer):
-                            delta_h += H_NN.get(dimer, 0)
-                            delta_s += S_NN.get(dimer, 0)
-
-                loop_length = len(seq[i + stem_len:j])
-
-                if loop_length < 3:
-                    continue
-
-                dg = delta_h - ((delta_s * (273.15 + 37)) / 1000)
-
-                if loop_length > 0:
-                    dg += H_LOOP + R * (273.15 + 37) * math.log(max(1, loop_length)) / 1000
-
-                if dg < min_dg:
-                    min_dg = dg
-        return min_dg
+        # Stem energies are shared between neighboring (i, j) positions, see
+        # thermo_utils.hairpin_dg_codes for the prefix-sum formulation.
+        codes = encode_sequence(seq)
+        if jit_kernels() is not None:
+            return jit_hairpin_dg(codes)
+        return hairpin_dg_codes(codes)
     except Exception as e:
         print(f"Error calculating dG intra hairpin for sequence {seq}: {e}")
         return 0.0
 
+@memoize_thermo
 def get_dg_full_complementary(seq):
     try:
         if not seq:
             return 0.0
 
         seq = seq.upper()
-        seq_l = len(seq)
-        delta_h = 0
-        delta_s = 0
-
-        for i in range(seq_l - 1):
-            dimer = seq[i:i+2]
-            if all(c in 'ATCG' for c in dimer):
-                delta_h += H_NN.get(dimer, 0)
-                delta_s += S_NN.get(dimer, 0)
-
-        if seq_l > 0:
-            delta_h += H_INIT.get(seq[0], 0) + H_INIT.get(seq[-1], 0)
-            delta_s += S_INIT.get(seq[0], 0) + S_INIT.get(seq[-1], 0)
+        if jit_kernels() is not None:
+            delta_h, delta_s = jit_nn_sums(encode_sequence(seq))
+        else:
+            delta_h, delta_s = _nn_sums(seq)
 
         dg = delta_h - (delta_s * (273.15 + 37) / 1000)
         return dg
@@ -128,81 +105,103 @@ def get_dg_full_complementary(seq):
         print(f"Error calculating dG full complementary for sequence {seq}: {e}")
         return 0.0
 
+def _partner_sequences(oligos):
+    return [
+        other['sequence'] for other in oligos
+        if other and 'sequence' in other and other['sequence']
+    ]
+
 def get_dg_partial_complementary(oligos, target_oligo):
     try:
         if not oligos or not target_oligo or 'sequence' not in target_oligo:
             return 0.0
+        if not HAS_STACKS:
+            # No stack parameters: every alignment sums to 0.
+            return 0
 
-        target_seq = target_oligo['sequence'].upper()
-        max_dg = 0
-
-        for other_oligo in oligos:
-            if not other_oligo or 'sequence' not in other_oligo:
-                continue
-
-            other_seq = other_oligo['sequence'].upper()
-            if not other_seq:
-                continue
-
-            other_rev_comp = get_reverse_complement(other_seq)
-
-            for i in range(len(target_seq) + len(other_seq) - 1):
-                current_h = 0
-                current_s = 0
-
-                for j in range(len(target_seq) - 1):
-                    if i - j < 0 or i - j >= len(other_rev_comp) - 1:
-                        continue
-
-                    if j + 1 < len(target_seq) and i - j + 1 < len(other_rev_comp):
-                        dimer = target_seq[j:j+2] + other_rev_comp[i-j:i-j+2]
-                        if len(dimer) == 4 and all(c in 'ATCG' for c in dimer):
-                            if dimer in H_NN and dimer in S_NN:
-                                current_h += H_NN[dimer]
-                                current_s += S_NN[dimer]
-
-                if current_h != 0:
-                    dg = current_h - (current_s * (273.15 + 37) / 1000)
-                    if dg < max_dg:
-                        max_dg = dg
-        return max_dg
+        # Each alignment offset is one diagonal of the stack matrix, see
+        # thermo_utils.partial_dg_row.
+        partners = _partner_sequences(oligos)
+        if jit_kernels() is not None:
+            return jit_partial_dg(encode_sequence(target_oligo['sequence']),
+                                  [encode_sequence(partner) for partner in partners])
+        pool_codes, pool_offsets, pool_lengths = encode_pool(partners)
+        row = partial_dg_row(encode_sequence(target_oligo['sequence']), pool_codes, pool_offsets, pool_lengths)
+        max_dg = row.min() if len(row) else 0
+        return float(max_dg) if max_dg < 0 else 0
     except Exception as e:
         print(f"Error calculating dG partial complementary: {e}")
         return 0.0
 
-def parse_multi_fasta(text, sequence_name=''):
-    text = text.strip()
-    if not text:
-        return []
+def _iter_fasta_lines(stream):
+    # Logical lines as str.splitlines() would produce them, one physical
+    # line at a time so the input is never held in memory at once.
+    for raw in stream:
+        if isinstance(raw, bytes):
+            raw = raw.decode('utf-8', 'replace')
+        yield from raw.splitlines()
+
+def iter_multi_fasta(stream, sequence_name=''):
+    """Yield {'name', 'seq'} records from a str, text stream or byte stream.
+
+    Naming and cleaning follow parse_multi_fasta: input that does not start
+    with '>' is one raw sequence, headers are the first non-blank line after
+    each '>', sequence lines keep only letters (uppercased), and records
+    without sequence are dropped.
+    """
+    if isinstance(stream, str):
+        stream = io.StringIO(stream)
+    lines = _iter_fasta_lines(stream)
+
+    first = ''
+    for line in lines:
+        first = line.lstrip()
+        if first:
+            break
+    if not first:
+        return
 
     # If it doesn't start with '>', treat it as a raw sequence
-    if not text.startswith('>'):
-        # Clean the sequence (remove non-alphabetic characters)
-        clean_seq = ''.join(filter(str.isalpha, text)).upper()
+    if not first.startswith('>'):
+        chunks = [''.join(filter(str.isalpha, first))]
+        chunks.extend(''.join(filter(str.isalpha, line)) for line in lines)
+        clean_seq = ''.join(chunks).upper()
         if clean_seq:
-            return [{
+            yield {
                 'name': sequence_name or 'sequence1',
                 'seq': clean_seq
-            }]
-        else:
-            return []
-
-    # Parse FASTA format
-    fragments = []
-    blocks = text.split('>')[1:]  # Remove empty first element
-
-    for block in blocks:
-        lines = block.strip().splitlines()
-        if not lines:
-            continue
-
-        header = lines[0].strip()
-        seq = ''.join(filter(str.isalpha, ''.join(lines[1:]))).upper()
+            }
+        return
+
+    emitted = 0
+    header = None
+    chunks = []
+    in_block = False
+    for line in itertools.chain([first], lines):
+        for k, part in enumerate(line.split('>')):
+            if k > 0:
+                if in_block and chunks:
+                    seq = ''.join(chunks).upper()
+                    if seq:
+                        emitted += 1
+                        yield {'name': header or f'fragment{emitted}', 'seq': seq}
+                in_block = True
+                header = None
+                chunks = []
+            if not in_block:
+                continue
+            if header is None:
+                # The header is the first non-blank line of the block.
+                if part.strip():
+                    header = part.strip()
+                continue
+            chunks.append(''.join(filter(str.isalpha, part)))
 
+    if in_block and chunks:
+        seq = ''.join(chunks).upper()
         if seq:
-            fragments.append({
-                'name': header or f'fragment{len(fragments) + 1}',
-                'seq': seq
-            })
+            emitted += 1
+            yield {'name': header or f'fragment{emitted}', 'seq': seq}
 
-    return fragments
+def parse_multi_fasta(text, sequence_name=''):
+    return list(iter_multi_fasta(text, sequence_name))
@@ -0,0 +1,208 @@
+"""
+Bounded in-process memoization for the thermodynamic functions.
+"""
+import atexit
+import functools
+import inspect
+import threading
+from collections import OrderedDict
+
+from .packed_sequence import PackedSequence
+from .thermo_store import ThermoStore
+
+# Rough per-entry bookkeeping cost (dict slot, key tuple, float) on top of the
+# sequence characters themselves.
+ENTRY_OVERHEAD_BYTES = 160
+
+
+class ThermoCache:
+    """Thread-safe LRU cache bounded by entry count and approximate memory."""
+
+    def __init__(self, name, max_entries=100000, max_bytes=64 * 1024 * 1024):
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _entry_size(key):
+        return ENTRY_OVERHEAD_BYTES + sum(
+            len(part) for part in key if isinstance(part, (str, PackedSequence))
+        )
+
+    def get(self, key):
+        """Return (found, value) and mark the entry as recently used."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def put(self, key, value):
+        size = self._entry_size(key)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._entries[key] = value
+                return
+            self._entries[key] = value
+            self.bytes += size
+            self._evict()
+
+    def _evict(self):
+        while self._entries and (len(self._entries) > self.max_entries or self.bytes > self.max_bytes):
+            key, _ = self._entries.popitem(last=False)
+            self.bytes -= self._entry_size(key)
+            self.evictions += 1
+
+    def resize(self, max_entries=None, max_bytes=None):
+        with self._lock:
+            if max_entries is not None:
+                self.max_entries = max_entries
+            if max_bytes is not None:
+                self.max_bytes = max_bytes
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self.bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+
+_caches = {}
+_enabled = True
+_store = None
+# Arguments of the configure_* calls, replayed in worker processes.
+_cache_settings = {}
+_store_settings = None
+
+
+def memoize_thermo(func):
+    """Cache func by its fully bound arguments, e.g. (sequence, na, k, oligo_conc)."""
+    signature = inspect.signature(func)
+    cache = _caches.setdefault(func.__name__, ThermoCache(func.__name__))
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _enabled:
+            return func(*args, **kwargs)
+        try:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            # A PackedSequence argument is keyed by its equal str, which
+            # doesn't keep the packed parent buffer alive.
+            key = tuple(
+                str(part) if isinstance(part, PackedSequence) else part
+                for part in bound.arguments.values()
+            )
+            hash(key)
+        except TypeError:
+            return func(*args, **kwargs)
+
+        found, value = cache.get(key)
+        if found:
+            return value
+        store = _store
+        if store is not None:
+            found, value = store.get(func.__name__, key)
+            if found:
+                cache.put(key, value)
+                return value
+        value = func(*args, **kwargs)
+        cache.put(key, value)
+        if store is not None:
+            store.put(func.__name__, key, value)
+        return value
+
+    wrapper.cache = cache
+    return wrapper
+
+
+def configure_thermo_cache(enabled=None, max_entries=None, max_bytes=None):
+    """Apply limits to every thermo cache; max_bytes is split evenly between them."""
+    global _enabled
+    _cache_settings.update(
+        (name, value) for name, value in
+        (('enabled', enabled), ('max_entries', max_entries), ('max_bytes', max_bytes))
+        if value is not None
+    )
+    if enabled is not None:
+        _enabled = enabled
+    per_cache_bytes = max_bytes // max(1, len(_caches)) if max_bytes is not None else None
+    for cache in _caches.values():
+        cache.resize(max_entries, per_cache_bytes)
+        if not _enabled:
+            cache.clear()
+
+
+def configure_thermo_store(path, ttl_seconds=None, max_entries=None):
+    """Share results with other workers through an SQLite file; an empty path disables it."""
+    global _store, _store_settings
+    flush_thermo_store()
+    _store_settings = (path, ttl_seconds, max_entries)
+    if not path:
+        _store = None
+        return
+    options = {}
+    if ttl_seconds is not None:
+        options['ttl_seconds'] = ttl_seconds
+    if max_entries is not None:
+        options['max_entries'] = max_entries
+    _store = ThermoStore(path, **options)
+
+
+def thermo_settings():
+    """The cache and store configuration, for apply_thermo_settings in another process."""
+    return dict(_cache_settings), _store_settings
+
+
+def apply_thermo_settings(settings):
+    cache_settings, store_settings = settings
+    configure_thermo_cache(**cache_settings)
+    if store_settings is not None:
+        configure_thermo_store(*store_settings)
+
+
+def flush_thermo_store():
+    """Write buffered results to the shared store, e.g. at the end of a request."""
+    if _store is not None:
+        _store.flush()
+
+
+atexit.register(flush_thermo_store)
+
+
+def thermo_cache_stats():
+    return {
+        'enabled': _enabled,
+        'caches': {name: cache.stats() for name, cache in _caches.items()},
+        'store': _store.stats() if _store is not None else None
+    }
+
+
+def clear_thermo_cache(include_store=False):
+    for cache in _caches.values():
+        cache.clear()
+    if include_store and _store is not None:
+        _store.clear()
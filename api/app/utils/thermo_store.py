@@ -0,0 +1,151 @@
+"""
+Persistent SQLite store for thermodynamic results shared by all workers on a host.
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+from .packed_sequence import PackedSequence
+
+PRUNE_EVERY_WRITES = 1000
+# Results buffered in memory before they are written in one transaction.
+WRITE_BATCH = 256
+# Bump when a thermodynamic kernel changes, so stored results are not reused.
+STORE_VERSION = 2
+
+
+class ThermoStore:
+    """On-disk key/value store keyed by a hash of (function, sequence, conditions).
+
+    Every worker process opens the same file; SQLite's WAL mode lets readers
+    and a writer work concurrently. Entries older than ttl_seconds are
+    ignored and pruned, and the table is trimmed to max_entries oldest-first.
+    Writes are buffered and committed WRITE_BATCH at a time (or on flush),
+    since a transaction per result costs more than recomputing it.
+    """
+
+    def __init__(self, path, ttl_seconds=30 * 24 * 3600, max_entries=1000000):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._pending = {}
+        self.hits = 0
+        self.misses = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._connection()
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS thermo ('
+            'key TEXT PRIMARY KEY, value REAL NOT NULL, created REAL NOT NULL)'
+        )
+        conn.execute('CREATE INDEX IF NOT EXISTS thermo_created ON thermo (created)')
+        conn.commit()
+
+    def _connection(self):
+        # sqlite3 connections cannot be shared between threads.
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _normalize(part):
+        # 50 and 50.0 are the same condition, and a PackedSequence is the
+        # same sequence as its str.
+        if isinstance(part, (int, float)) and not isinstance(part, bool):
+            return float(part)
+        if isinstance(part, PackedSequence):
+            return str(part)
+        return part
+
+    @classmethod
+    def make_key(cls, name, key):
+        parts = tuple(cls._normalize(part) for part in key)
+        return hashlib.sha1(repr((STORE_VERSION, name, parts)).encode('utf-8')).hexdigest()
+
+    def get(self, name, key):
+        store_key = self.make_key(name, key)
+        with self._lock:
+            pending = self._pending.get(store_key)
+            if pending is not None:
+                self.hits += 1
+                return True, pending[0]
+        row = self._connection().execute(
+            'SELECT value, created FROM thermo WHERE key = ?', (store_key,)
+        ).fetchone()
+        with self._lock:
+            if row is None or time.time() - row[1] > self.ttl_seconds:
+                self.misses += 1
+                return False, None
+            self.hits += 1
+        return True, row[0]
+
+    def put(self, name, key, value):
+        store_key = self.make_key(name, key)
+        with self._lock:
+            self._pending[store_key] = (float(value), time.time())
+            full = len(self._pending) >= WRITE_BATCH
+        if full:
+            self.flush()
+
+    def flush(self):
+        """Commit the buffered results in one transaction."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            before = self._writes
+            self._writes += len(pending)
+            prune = self._writes // PRUNE_EVERY_WRITES > before // PRUNE_EVERY_WRITES
+        if not pending:
+            return
+        conn = self._connection()
+        with conn:
+            conn.executemany(
+                'INSERT OR REPLACE INTO thermo (key, value, created) VALUES (?, ?, ?)',
+                [(store_key, value, created) for store_key, (value, created) in pending.items()]
+            )
+        if prune:
+            self.prune()
+
+    def prune(self):
+        conn = self._connection()
+        conn.execute('DELETE FROM thermo WHERE created < ?', (time.time() - self.ttl_seconds,))
+        count = conn.execute('SELECT COUNT(*) FROM thermo').fetchone()[0]
+        if count > self.max_entries:
+            conn.execute(
+                'DELETE FROM thermo WHERE key IN '
+                '(SELECT key FROM thermo ORDER BY created LIMIT ?)',
+                (count - self.max_entries,)
+            )
+        conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._pending.clear()
+        conn = self._connection()
+        conn.execute('DELETE FROM thermo')
+        conn.commit()
+
+    def stats(self):
+        entries = self._connection().execute('SELECT COUNT(*) FROM thermo').fetchone()[0]
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'path': self.path,
+                'entries': entries,
+                'pending': len(self._pending),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+            }
@@ -0,0 +1,355 @@
+"""
+Vectorized nearest-neighbor thermodynamics for whole oligo pools.
+
+Sequences are encoded once into integer arrays (A=0, C=1, G=2, T=3, any other
+character=4) and every dinucleotide is scored with NumPy lookups against the
+tables in config/constants.py. Results reproduce the scalar functions in
+sequence_utils, including the order in which the sums are accumulated.
+"""
+import math
+
+import numpy as np
+
+from ..config.constants import H_NN, S_NN, H_INIT, S_INIT, R, H_LOOP
+
+BASES = 'ACGT'
+INVALID_CODE = 4
+N_CODES = 5
+
+# ASCII -> code lookup. Sequences are uppercased before encoding, so only the
+# uppercase letters need an entry; everything else maps to INVALID_CODE.
+_ENCODE_TABLE = np.full(256, INVALID_CODE, dtype=np.uint8)
+for _code, _base in enumerate(BASES):
+    _ENCODE_TABLE[ord(_base)] = _code
+
+# Watson-Crick complement of every code; invalid bases stay invalid.
+COMPLEMENT_CODE = np.array([3, 2, 1, 0, INVALID_CODE], dtype=np.uint8)
+
+
+def _pair_table(table):
+    values = np.zeros(N_CODES * N_CODES, dtype=np.float64)
+    for a, first in enumerate(BASES):
+        for b, second in enumerate(BASES):
+            values[a * N_CODES + b] = table.get(first + second, 0)
+    return values
+
+
+def _init_table(table):
+    values = np.zeros(N_CODES, dtype=np.float64)
+    for code, base in enumerate(BASES):
+        values[code] = table.get(base, 0)
+    return values
+
+
+H_PAIR = _pair_table(H_NN)
+S_PAIR = _pair_table(S_NN)
+H_INIT_CODE = _init_table(H_INIT)
+S_INIT_CODE = _init_table(S_INIT)
+
+
+def _stack_tables():
+    # Cross-dimer stacks are looked up with 4-character keys: the target
+    # dinucleotide followed by the partner's reverse-complement dinucleotide.
+    # Only keys present in both tables contribute, as in the scalar scan.
+    h_values = np.zeros(N_CODES ** 4, dtype=np.float64)
+    s_values = np.zeros(N_CODES ** 4, dtype=np.float64)
+    for key in H_NN:
+        if len(key) == 4 and key in S_NN and all(c in BASES for c in key):
+            a, b, c, d = (BASES.index(base) for base in key)
+            idx = (a * N_CODES + b) * N_CODES * N_CODES + c * N_CODES + d
+            h_values[idx] = H_NN[key]
+            s_values[idx] = S_NN[key]
+    return h_values, s_values
+
+
+H_STACK, S_STACK = _stack_tables()
+HAS_STACKS = bool(H_STACK.any())
+
+# ThermoProfile keeps its prefix sums in fixed point so that window sums are
+# exact differences no matter how long the parent sequence is.
+FIXED_SCALE = 1000
+H_PAIR_FIXED = np.rint(H_PAIR * FIXED_SCALE).astype(np.int64)
+S_PAIR_FIXED = np.rint(S_PAIR * FIXED_SCALE).astype(np.int64)
+
+# Upper bound on the number of cells in one (target pairs x pool pairs) block.
+PARTIAL_BLOCK_CELLS = 1 << 22
+
+
+def encode_sequence(seq):
+    """Encode one sequence (str or PackedSequence) into a uint8 code array."""
+    if hasattr(seq, 'codes'):
+        return seq.codes()
+    raw = seq.upper().encode('ascii', 'replace')
+    return _ENCODE_TABLE[np.frombuffer(raw, dtype=np.uint8)]
+
+
+def encode_pool(seqs):
+    """Encode many sequences into one flat code array.
+
+    Returns (codes, offsets, lengths) where sequence k occupies
+    codes[offsets[k]:offsets[k] + lengths[k]].
+    """
+    packed = any(hasattr(s, 'codes') for s in seqs)
+    seqs = [s if hasattr(s, 'codes') else s.upper() for s in seqs]
+    lengths = np.fromiter((len(s) for s in seqs), dtype=np.int64, count=len(seqs))
+    offsets = np.zeros(len(seqs), dtype=np.int64)
+    if len(seqs) > 1:
+        np.cumsum(lengths[:-1], out=offsets[1:])
+    if packed:
+        # PackedSequence views export their codes without a str round trip.
+        codes = np.concatenate([encode_sequence(s) for s in seqs]) if seqs else np.zeros(0, dtype=np.uint8)
+        return codes.astype(np.uint8), offsets, lengths
+    raw = ''.join(seqs).encode('ascii', 'replace')
+    codes = _ENCODE_TABLE[np.frombuffer(raw, dtype=np.uint8)]
+    return codes, offsets, lengths
+
+
+def reverse_complement_pool(codes, offsets, lengths):
+    """Reverse-complement every member of an encoded pool in one gather.
+
+    Members keep their order and offsets; invalid codes stay invalid.
+    """
+    owner = np.repeat(np.arange(len(lengths)), lengths)
+    local = np.arange(len(codes)) - offsets[owner]
+    source = offsets[owner] + lengths[owner] - 1 - local
+    return COMPLEMENT_CODE[codes[source]]
+
+
+def tm_from_sums(delta_h, delta_s, lengths, na_conc=50, k_conc=0, oligo_conc=250):
+    """Convert ΔH/ΔS sums into Tm (°C) exactly as sequence_utils.get_tm does."""
+    total_salt = max(1, na_conc + k_conc)
+    oligo_conc_m = max(1e-12, oligo_conc * 1e-9)
+
+    delta_h = delta_h * 1000
+    delta_s = delta_s + 0.368 * (lengths - 1) * math.log(total_salt / 1000)
+    denominator = delta_s + R * math.log(oligo_conc_m / 2)
+
+    tm = np.zeros(len(lengths), dtype=np.float64)
+    ok = (lengths >= 2) & (np.abs(denominator) >= 1e-10)
+    tm[ok] = np.maximum(0.0, delta_h[ok] / denominator[ok] - 273.15)
+    return tm
+
+
+def _loop_penalties(max_loop):
+    # Same expression as the scalar hairpin scan, evaluated once per loop size.
+    return np.array([
+        H_LOOP + R * (273.15 + 37) * math.log(max(1, loop_length)) / 1000
+        for loop_length in range(max_loop + 1)
+    ], dtype=np.float64)
+
+
+def hairpin_dg_codes(codes):
+    """Minimum hairpin ΔG of one encoded sequence.
+
+    The scalar scan pairs base i + k with the complement of base L - 1 - k for
+    every stem start i, so the stem energy of (i, j) only depends on i and the
+    stem length L - j. Cumulative sums along each stem start give every stem
+    energy in O(1) and the whole scan costs O(L²) array work instead of O(L³)
+    Python steps. Returns 0 when no loop/stem combination is favorable.
+    """
+    seq_l = len(codes)
+    if seq_l < 8:
+        return 0
+
+    starts = np.arange(seq_l - 4)
+    offsets = np.arange(seq_l)
+    tail = COMPLEMENT_CODE[codes[::-1]]
+
+    # pair_idx[i, k] = (codes[i + k], complement(codes[L - 1 - k])).
+    pos = starts[:, None] + offsets[None, :]
+    in_range = pos < seq_l
+    head = np.where(in_range, codes[np.minimum(pos, seq_l - 1)], INVALID_CODE)
+    pair_idx = head.astype(np.intp) * N_CODES + tail[None, :]
+
+    zeros = np.zeros((len(starts), 1), dtype=np.float64)
+    stem_h = np.concatenate([zeros, np.cumsum(H_PAIR[pair_idx], axis=1)], axis=1)
+    stem_s = np.concatenate([zeros, np.cumsum(S_PAIR[pair_idx], axis=1)], axis=1)
+
+    i = starts[:, None]
+    j = offsets[None, :]
+    stem_len = np.minimum(j - i, seq_l - j)
+    loop_length = j - i - stem_len
+    valid = (j >= i + 4) & (stem_len >= 4) & (loop_length >= 3)
+    if not valid.any():
+        return 0
+
+    rows, cols = np.nonzero(valid)
+    stems = stem_len[rows, cols]
+    dg = stem_h[rows, stems] - ((stem_s[rows, stems] * (273.15 + 37)) / 1000)
+    dg = dg + _loop_penalties(seq_l)[loop_length[rows, cols]]
+
+    min_dg = dg.min()
+    return float(min_dg) if min_dg < 0 else 0
+
+
+def _pair_codes(codes):
+    return codes[:-1].astype(np.intp) * N_CODES + codes[1:]
+
+
+def _partial_dg_block(target_pairs, pool_codes, pool_lengths):
+    """Worst partial ΔG of one target against each sequence of a pool block.
+
+    Every alignment offset of every (target, partner) pair is a diagonal of
+    the (target pairs x partner pairs) stack matrix, so all diagonals of the
+    block are summed at once with a single bincount.
+    """
+    n_pool = len(pool_lengths)
+    worst = np.zeros(n_pool, dtype=np.float64)
+
+    # Reverse-complementing the flat array reverses the member order too.
+    rc_codes = COMPLEMENT_CODE[pool_codes[::-1]]
+    rc_lengths = pool_lengths[::-1]
+    owner = np.repeat(np.arange(n_pool)[::-1], rc_lengths)
+    if len(rc_codes) < 2:
+        return worst
+    rc_starts = np.zeros(n_pool, dtype=np.int64)
+    rc_starts[::-1] = np.concatenate(([0], np.cumsum(rc_lengths)[:-1]))
+
+    valid = owner[:-1] == owner[1:]
+    pair_owner = owner[:-1][valid]
+    partner_pairs = _pair_codes(rc_codes)[valid]
+    partner_pos = np.nonzero(valid)[0] - rc_starts[pair_owner]
+
+    n_target = len(target_pairs)
+    bins_per_member = np.where(pool_lengths >= 2, n_target + pool_lengths - 2, 0)
+    bin_base = np.concatenate(([0], np.cumsum(bins_per_member)[:-1]))
+    n_bins = int(bins_per_member.sum())
+
+    stack_idx = target_pairs[:, None] * (N_CODES * N_CODES) + partner_pairs[None, :]
+    bins = (bin_base[pair_owner][None, :]
+            + np.arange(n_target)[:, None]
+            + partner_pos[None, :])
+    # Row-major ravel visits each offset in increasing target position, the
+    # same order in which the scalar scan accumulates.
+    delta_h = np.bincount(bins.ravel(), weights=H_STACK[stack_idx].ravel(), minlength=n_bins)
+    delta_s = np.bincount(bins.ravel(), weights=S_STACK[stack_idx].ravel(), minlength=n_bins)
+
+    dg = np.where(delta_h != 0, delta_h - (delta_s * (273.15 + 37) / 1000), 0.0)
+    has_bins = bins_per_member > 0
+    if n_bins:
+        worst[has_bins] = np.minimum.reduceat(dg, bin_base[has_bins])
+    return np.minimum(worst, 0.0)
+
+
+def partial_dg_row(target_codes, pool_codes, pool_offsets, pool_lengths):
+    """Worst partial ΔG of one encoded target against every pool member."""
+    n_pool = len(pool_lengths)
+    worst = np.zeros(n_pool, dtype=np.float64)
+    if not HAS_STACKS or len(target_codes) < 2 or n_pool == 0:
+        return worst
+
+    target_pairs = _pair_codes(target_codes)
+    per_block = max(1, PARTIAL_BLOCK_CELLS // max(1, len(target_pairs)))
+    start = 0
+    while start < n_pool:
+        # Grow the block member by member until it holds per_block pairs.
+        stop = start + 1
+        cells = pool_lengths[start]
+        while stop < n_pool and cells + pool_lengths[stop] <= per_block:
+            cells += pool_lengths[stop]
+            stop += 1
+        lo = pool_offsets[start]
+        hi = pool_offsets[stop - 1] + pool_lengths[stop - 1]
+        worst[start:stop] = _partial_dg_block(
+            target_pairs, pool_codes[lo:hi], pool_lengths[start:stop])
+        start = stop
+    return worst
+
+
+class ThermoProfile:
+    """Prefix sums over one parent sequence for O(1) window thermodynamics.
+
+    Stores cumulative nearest-neighbor ΔH/ΔS and per-base counts so the GC
+    content, Tm, Wallace Tm and full-duplex ΔG of any window
+    sequence[start:end] cost O(1) instead of a rescan. GC and Wallace values
+    are identical to get_gc_content/calculate_primer_tm; Tm and ΔG match
+    get_tm/get_dg_full_complementary to floating-point rounding.
+    """
+
+    def __init__(self, sequence):
+        self.sequence = sequence
+        self.codes = encode_sequence(sequence)
+        pair_idx = _pair_codes(self.codes) if len(self.codes) > 1 else np.zeros(0, dtype=np.intp)
+        self._cum_h = np.concatenate(([0], np.cumsum(H_PAIR_FIXED[pair_idx])))
+        self._cum_s = np.concatenate(([0], np.cumsum(S_PAIR_FIXED[pair_idx])))
+
+        # Base counts use the raw characters, as get_gc_content and
+        # calculate_primer_tm count only uppercase letters. A PackedSequence
+        # is uppercase by construction, so its codes are enough.
+        if hasattr(sequence, 'codes'):
+            g_mask = self.codes == 2
+            gc_mask = g_mask | (self.codes == 1)
+            at_mask = (self.codes == 0) | (self.codes == 3)
+        else:
+            raw = np.frombuffer(sequence.encode('ascii', 'replace'), dtype=np.uint8)
+            g_mask = raw == ord('G')
+            gc_mask = g_mask | (raw == ord('C'))
+            at_mask = (raw == ord('A')) | (raw == ord('T'))
+        self._cum_g = np.concatenate(([0], np.cumsum(g_mask)))
+        self._cum_gc = np.concatenate(([0], np.cumsum(gc_mask)))
+        self._cum_at = np.concatenate(([0], np.cumsum(at_mask)))
+
+    def __len__(self):
+        return len(self.codes)
+
+    def window_sums(self, starts, ends):
+        """ΔH (kcal/mol) and ΔS (cal/(mol·K)) of every window, initiation included."""
+        starts = np.asarray(starts, dtype=np.int64)
+        ends = np.asarray(ends, dtype=np.int64)
+        nonempty = ends > starts
+        # Pairs start..end-2 of the window; empty windows collapse to 0.
+        first_pair = np.minimum(starts, len(self._cum_h) - 1)
+        last_pair = np.where(nonempty, ends - 1, first_pair)
+        delta_h = (self._cum_h[last_pair] - self._cum_h[first_pair]) / FIXED_SCALE
+        delta_s = (self._cum_s[last_pair] - self._cum_s[first_pair]) / FIXED_SCALE
+
+        first = np.full(len(starts), INVALID_CODE, dtype=np.intp)
+        last = np.full(len(starts), INVALID_CODE, dtype=np.intp)
+        first[nonempty] = self.codes[starts[nonempty]]
+        last[nonempty] = self.codes[ends[nonempty] - 1]
+        delta_h = delta_h + (H_INIT_CODE[first] + H_INIT_CODE[last])
+        delta_s = delta_s + (S_INIT_CODE[first] + S_INIT_CODE[last])
+        return delta_h, delta_s
+
+    def tm_windows(self, starts, ends, na_conc=50, k_conc=0, oligo_conc=250):
+        delta_h, delta_s = self.window_sums(starts, ends)
+        lengths = np.asarray(ends, dtype=np.int64) - np.asarray(starts, dtype=np.int64)
+        return tm_from_sums(delta_h, delta_s, lengths, na_conc, k_conc, oligo_conc)
+
+    def gc_windows(self, starts, ends):
+        starts = np.asarray(starts, dtype=np.int64)
+        ends = np.asarray(ends, dtype=np.int64)
+        lengths = ends - starts
+        gc_count = self._cum_gc[ends] - self._cum_gc[starts]
+        gc = np.zeros(len(starts), dtype=np.float64)
+        nonempty = lengths > 0
+        gc[nonempty] = (gc_count[nonempty] / lengths[nonempty]) * 100
+        return gc
+
+    def gc_skew_windows(self, starts, ends):
+        """(G - C) / (G + C) of every window, 0 where the window has no G or C."""
+        starts = np.asarray(starts, dtype=np.int64)
+        ends = np.asarray(ends, dtype=np.int64)
+        g_count = self._cum_g[ends] - self._cum_g[starts]
+        gc_count = self._cum_gc[ends] - self._cum_gc[starts]
+        skew = np.zeros(len(starts), dtype=np.float64)
+        has_gc = gc_count > 0
+        skew[has_gc] = (2 * g_count[has_gc] - gc_count[has_gc]) / gc_count[has_gc]
+        return skew
+
+    def tm(self, start, end, na_conc=50, k_conc=0, oligo_conc=250):
+        return float(self.tm_windows([start], [end], na_conc, k_conc, oligo_conc)[0])
+
+    def gc_content(self, start, end):
+        if end <= start:
+            return 0
+        return ((int(self._cum_gc[end]) - int(self._cum_gc[start])) / (end - start)) * 100
+
+    def wallace_tm(self, start, end):
+        gc_count = int(self._cum_gc[end]) - int(self._cum_gc[start])
+        at_count = int(self._cum_at[end]) - int(self._cum_at[start])
+        return (2 * at_count) + (4 * gc_count)
+
+    def dg_full_complementary(self, start, end):
+        delta_h, delta_s = self.window_sums([start], [end])
+        return float(delta_h[0] - (delta_s[0] * (273.15 + 37) / 1000))
@@ -0,0 +1,38 @@
+import pytest
+
+from app.config.constants import H_NN, S_NN
+from app.utils import interaction_utils, kernel_backend, sequence_utils, thermo_utils
+
+
+@pytest.fixture
+def stack_parameters(monkeypatch):
+    """Give the constants cross-dimer stacks, which the shipped tables lack.
+
+    Matching dinucleotides (target XY against partner reverse complement
+    XY) take the duplex pair energies, and a few mismatches a weaker one,
+    so the partial ΔG engines have non-zero values to reproduce.
+    """
+    for pair in [key for key in H_NN if len(key) == 2]:
+        monkeypatch.setitem(H_NN, pair + pair, H_NN[pair])
+        monkeypatch.setitem(S_NN, pair + pair, S_NN[pair])
+    for key in ('ACAT', 'GGGA', 'TACA', 'CGCA'):
+        monkeypatch.setitem(H_NN, key, -2.5)
+        monkeypatch.setitem(S_NN, key, -7.0)
+
+    h_stack, s_stack = thermo_utils._stack_tables()
+    for module in (thermo_utils, kernel_backend):
+        monkeypatch.setattr(module, 'H_STACK', h_stack)
+        monkeypatch.setattr(module, 'S_STACK', s_stack)
+    for module in (thermo_utils, kernel_backend, sequence_utils, interaction_utils):
+        monkeypatch.setattr(module, 'HAS_STACKS', True)
+
+
+@pytest.fixture
+def client():
+    from app.main import create_app_with_legacy_endpoints
+
+    # Creating the app selects the configured kernel backend; put back the
+    # one the other tests run with.
+    backend = kernel_backend.get_backend()
+    yield create_app_with_legacy_endpoints().test_client()
+    kernel_backend.set_backend(backend)
@@ -0,0 +1,444 @@
+"""
+Reference implementations: the original scalar functions, kept verbatim so
+the tests can check the optimized engines against them.
+"""
+from app.config.constants import H_NN, S_NN, H_INIT, S_INIT, R, H_LOOP
+import math
+
+def get_reverse_complement(sequence):
+    complement = {
+        'A': 'T', 'T': 'A', 'C': 'G', 'G': 'C', 'W': 'W', 'S': 'S',
+        'M': 'K', 'K': 'M', 'R': 'Y', 'Y': 'R', 'B': 'V', 'D': 'H',
+        'H': 'D', 'V': 'B', 'N': 'N'
+    }
+    return "".join(complement.get(base, base) for base in reversed(sequence))
+
+def get_gc_content(seq):
+    if not seq:
+        return 0
+    gc_count = seq.count('G') + seq.count('C')
+    return (gc_count / len(seq)) * 100
+
+def get_tm(seq, na_conc=50, k_conc=0, oligo_conc=250):
+    try:
+        if not seq or len(seq) < 2:
+            return 0.0
+
+        total_salt = max(1, na_conc + k_conc)  # Prevent division by zero
+        oligo_conc_m = max(1e-12, oligo_conc * 1e-9)  # Prevent log of zero
+
+        seq = seq.upper()
+        seq_l = len(seq)
+        delta_h = 0
+        delta_s = 0
+
+        for i in range(seq_l - 1):
+            dimer = seq[i:i+2]
+            if all(c in 'ATCG' for c in dimer):  # Only process valid nucleotides
+                delta_h += H_NN.get(dimer, 0)
+                delta_s += S_NN.get(dimer, 0)
+
+        if seq_l > 0:
+            delta_h += H_INIT.get(seq[0], 0) + H_INIT.get(seq[-1], 0)
+            delta_s += S_INIT.get(seq[0], 0) + S_INIT.get(seq[-1], 0)
+
+        delta_h *= 1000
+
+        if total_salt > 0:
+            salt_correction = 0.368 * (seq_l - 1) * math.log(total_salt / 1000)
+            delta_s += salt_correction
+
+        denominator = delta_s + R * math.log(oligo_conc_m / 2)
+        if abs(denominator) < 1e-10:  # Prevent division by zero
+            return 0.0
+
+        tm_kelvin = delta_h / denominator
+
+        return max(0.0, tm_kelvin - 273.15)  # Ensure positive temperature
+    except Exception as e:
+        print(f"Error calculating Tm for sequence {seq}: {e}")
+        return 0.0
+
+def get_dg_intra_hairpin(seq):
+    try:
+        if not seq:
+            return 0.0
+
+        seq = seq.upper()
+        seq_l = len(seq)
+        min_dg = 0
+        if seq_l < 8:
+            return 0
+
+        for i in range(seq_l - 4):
+            for j in range(i + 4, seq_l):
+                stem1 = seq[i:j]
+                stem2 = get_reverse_complement(seq[j:])
+
+                stem_len = min(len(stem1), len(stem2))
+                if stem_len < 4:
+                    continue
+
+                delta_h = 0
+                delta_s = 0
+
+                for k in range(stem_len):
+                    if k < len(stem1) and k < len(stem2):
+                        dimer = stem1[k] + stem2[k]
+                        if all(c in 'ATCG' for c in dimer):
+                            delta_h += H_NN.get(dimer, 0)
+                            delta_s += S_NN.get(dimer, 0)
+
+                loop_length = len(seq[i + stem_len:j])
+
+                if loop_length < 3:
+                    continue
+
+                dg = delta_h - ((delta_s * (273.15 + 37)) / 1000)
+
+                if loop_length > 0:
+                    dg += H_LOOP + R * (273.15 + 37) * math.log(max(1, loop_length)) / 1000
+
+                if dg < min_dg:
+                    min_dg = dg
+        return min_dg
+    except Exception as e:
+        print(f"Error calculating dG intra hairpin for sequence {seq}: {e}")
+        return 0.0
+
+def get_dg_full_complementary(seq):
+    try:
+        if not seq:
+            return 0.0
+
+        seq = seq.upper()
+        seq_l = len(seq)
+        delta_h = 0
+        delta_s = 0
+
+        for i in range(seq_l - 1):
+            dimer = seq[i:i+2]
+            if all(c in 'ATCG' for c in dimer):
+                delta_h += H_NN.get(dimer, 0)
+                delta_s += S_NN.get(dimer, 0)
+
+        if seq_l > 0:
+            delta_h += H_INIT.get(seq[0], 0) + H_INIT.get(seq[-1], 0)
+            delta_s += S_INIT.get(seq[0], 0) + S_INIT.get(seq[-1], 0)
+
+        dg = delta_h - (delta_s * (273.15 + 37) / 1000)
+        return dg
+    except Exception as e:
+        print(f"Error calculating dG full complementary for sequence {seq}: {e}")
+        return 0.0
+
+def get_dg_partial_complementary(oligos, target_oligo):
+    try:
+        if not oligos or not target_oligo or 'sequence' not in target_oligo:
+            return 0.0
+
+        target_seq = target_oligo['sequence'].upper()
+        max_dg = 0
+
+        for other_oligo in oligos:
+            if not other_oligo or 'sequence' not in other_oligo:
+                continue
+
+            other_seq = other_oligo['sequence'].upper()
+            if not other_seq:
+                continue
+
+            other_rev_comp = get_reverse_complement(other_seq)
+
+            for i in range(len(target_seq) + len(other_seq) - 1):
+                current_h = 0
+                current_s = 0
+
+                for j in range(len(target_seq) - 1):
+                    if i - j < 0 or i - j >= len(other_rev_comp) - 1:
+                        continue
+
+                    if j + 1 < len(target_seq) and i - j + 1 < len(other_rev_comp):
+                        dimer = target_seq[j:j+2] + other_rev_comp[i-j:i-j+2]
+                        if len(dimer) == 4 and all(c in 'ATCG' for c in dimer):
+                            if dimer in H_NN and dimer in S_NN:
+                                current_h += H_NN[dimer]
+                                current_s += S_NN[dimer]
+
+                if current_h != 0:
+                    dg = current_h - (current_s * (273.15 + 37) / 1000)
+                    if dg < max_dg:
+                        max_dg = dg
+        return max_dg
+    except Exception as e:
+        print(f"Error calculating dG partial complementary: {e}")
+        return 0.0
+
+def parse_multi_fasta(text, sequence_name=''):
+    text = text.strip()
+    if not text:
+        return []
+
+    # If it doesn't start with '>', treat it as a raw sequence
+    if not text.startswith('>'):
+        # Clean the sequence (remove non-alphabetic characters)
+        clean_seq = ''.join(filter(str.isalpha, text)).upper()
+        if clean_seq:
+            return [{
+                'name': sequence_name or 'sequence1',
+                'seq': clean_seq
+            }]
+        else:
+            return []
+
+    # Parse FASTA format
+    fragments = []
+    blocks = text.split('>')[1:]  # Remove empty first element
+
+    for block in blocks:
+        lines = block.strip().splitlines()
+        if not lines:
+            continue
+
+        header = lines[0].strip()
+        seq = ''.join(filter(str.isalpha, ''.join(lines[1:]))).upper()
+
+        if seq:
+            fragments.append({
+                'name': header or f'fragment{len(fragments) + 1}',
+                'seq': seq
+            })
+
+    return fragments
+
+def simple_oligo_maker(sequence, oligo_length=60, overlap_length=30):
+    forward = []
+    reverse = []
+    result = []
+
+    for pos in range(0, len(sequence), oligo_length):
+        forward.append(sequence[pos:pos + oligo_length])
+
+    if forward and len(forward[-1]) < overlap_length:
+        forward.pop()
+
+    for i in range(len(forward) - 1):
+        bridge_start = i * oligo_length + (oligo_length - overlap_length)
+        region = sequence[bridge_start:bridge_start + oligo_length]
+        reverse.append(get_reverse_complement(region))
+
+    last_fwd_end = len(forward) * oligo_length
+    term_start = max(0, last_fwd_end - overlap_length)
+    if term_start < len(sequence):
+        terminal_region = sequence[term_start:]
+        reverse.append(get_reverse_complement(terminal_region))
+
+    filtered_reverse = [seq for seq in reverse if len(seq) >= overlap_length]
+
+    for i, seq in enumerate(forward):
+        result.append({
+            'label': f'FF_{i+1}',
+            'sequence': seq,
+            'length': len(seq)
+        })
+    for i, seq in enumerate(filtered_reverse):
+        result.append({
+            'label': f'RC_{i+1}',
+            'sequence': seq,
+            'length': len(seq)
+        })
+
+    return result
+
+def generate_gapped_oligos(sequence, oligo_length, overlap_length, gap_length):
+    min_length_to_keep = 20
+    oligos = []
+
+    # Generate Forward Oligos
+    fwd_oligo_start = 0
+    fwd_oligo_index = 1
+    while fwd_oligo_start < len(sequence):
+        oligo = sequence[fwd_oligo_start:fwd_oligo_start + oligo_length]
+        if len(oligo) >= min_length_to_keep:
+            oligos.append({
+                'label': f'FF_{fwd_oligo_index}',
+                'sequence': oligo,
+                'length': len(oligo)
+            })
+        fwd_oligo_start += oligo_length + gap_length
+        fwd_oligo_index += 1
+
+    # Generate Reverse Complement Oligos
+    rev_comp_start = oligo_length - overlap_length
+    rev_comp_index = 1
+    while rev_comp_start + oligo_length <= len(sequence):
+        segment = sequence[rev_comp_start:rev_comp_start + oligo_length]
+        rev_comp = get_reverse_complement(segment)
+        oligos.append({
+            'label': f'RC_{rev_comp_index}',
+            'sequence': rev_comp,
+            'length': len(rev_comp)
+        })
+        rev_comp_start += oligo_length + gap_length
+        rev_comp_index += 1
+
+    return [oligo for oligo in oligos if len(oligo['sequence']) >= min_length_to_keep]
+
+def clean_oligos(oligos, end_len=8, score_threshold=0.75, trim_limit=8):
+    cleaned = []
+    for obj in oligos:
+        seq = obj['sequence']
+        trimmed5 = 0
+        trimmed3 = 0
+        is_valid = False
+
+        while len(seq) >= end_len * 2 and (trimmed5 < trim_limit or trimmed3 < trim_limit):
+            start_seq = seq[:end_len]
+            end_seq = seq[-end_len:]
+
+            worst5 = score_end_match(start_seq, seq[end_len:])
+            worst3 = score_end_match(end_seq, seq[:-end_len])
+
+            for other in oligos:
+                if other == obj or is_intended_partner(obj, other):
+                    continue
+                worst5 = max(worst5, score_end_match(start_seq, other['sequence']))
+                worst3 = max(worst3, score_end_match(end_seq, other['sequence']))
+                if worst5 == 1 or worst3 == 1:
+                    break
+
+            conflict5 = worst5 >= score_threshold
+            conflict3 = worst3 >= score_threshold
+
+            if not conflict5 and not conflict3:
+                is_valid = True
+                break
+            
+            if conflict3 and trimmed3 < trim_limit:
+                seq = seq[:-1]
+                trimmed3 += 1
+            elif conflict5 and trimmed5 < trim_limit:
+                seq = seq[1:]
+                trimmed5 += 1
+            else:
+                break
+        
+        if is_valid:
+            trimmed_homo = trim_terminal_homopolymers(seq, 5)
+            cleaned.append({
+                **obj,
+                'sequence': trimmed_homo,
+                'length': len(trimmed_homo),
+                'invalid': False 
+            })
+        else:
+            cleaned.append({
+                **obj,
+                'invalid': True,
+                'sequence': obj['sequence'],
+                'length': obj['length']
+            })
+    return cleaned
+
+def score_end_match(end_seq, target_seq):
+    end_len = len(end_seq)
+    end_rc = get_reverse_complement(end_seq)
+    worst_score = 0
+
+    for i in range(len(target_seq) - end_len + 1):
+        window = target_seq[i:i + end_len]
+        mismatches = 0
+        mismatch_pos = -1
+
+        for p in range(end_len):
+            if end_rc[p] != window[p]:
+                mismatches += 1
+                mismatch_pos = p + 1
+                if mismatches > 1:
+                    break
+        
+        if mismatches == 0:
+            return 1
+        if mismatches == 1:
+            base = end_rc[mismatch_pos - 1]
+            base_penalty = 1.0 if base in ['G', 'C'] else 0.5
+            pos_weight = mismatch_pos / end_len
+            score = (7 / 8) - pos_weight * base_penalty
+            worst_score = max(worst_score, score)
+    return worst_score
+
+def is_intended_partner(a, b):
+    orientation = lambda label: "FF" if label.startswith("FF") else "RC"
+    index_num = lambda label: int(label.split('_')[1])
+    if orientation(a['label']) == orientation(b['label']):
+        return False
+    i = index_num(a['label'])
+    j = index_num(b['label'])
+    if orientation(a['label']) == "FF":
+        return j == i or j == i - 1
+    else:
+        return j == i or j == i + 1
+
+def trim_terminal_homopolymers(seq, window=5):
+    import re
+    homo_regex = re.compile(r'(A{4,}|T{4,}|C{4,}|G{4,})')
+    trimmed_seq = seq
+    start_match = homo_regex.search(trimmed_seq[:window])
+    if start_match and trimmed_seq.startswith(start_match.group(0)):
+        trimmed_seq = trimmed_seq[len(start_match.group(0)) - 1:]
+    end_match = homo_regex.search(trimmed_seq[-window:])
+    if end_match and trimmed_seq.endswith(end_match.group(0)):
+        trimmed_seq = trimmed_seq[:len(trimmed_seq) - len(end_match.group(0)) + 1]
+    return trimmed_seq
+
+def optimize_oligos(oligos, na_conc, k_conc, oligo_conc):
+    optimized = []
+    MIN_LENGTH = 20
+    MAX_TRIM = 10
+
+    for oligo in oligos:
+        is_optimized = False
+        
+        for left_trim in range(MAX_TRIM + 1):
+            for right_trim in range(MAX_TRIM + 1):
+                new_length = len(oligo['sequence']) - left_trim - right_trim
+                if new_length < MIN_LENGTH:
+                    continue
+
+                trimmed_seq = oligo['sequence'][left_trim:len(oligo['sequence']) - right_trim]
+                temp_oligo = {**oligo, 'sequence': trimmed_seq}
+
+                if is_oligo_acceptable(oligos, temp_oligo, na_conc, k_conc, oligo_conc):
+                    optimized.append({
+                        **oligo,
+                        'sequence': trimmed_seq,
+                        'length': new_length,
+                        'invalid': False
+                    })
+                    is_optimized = True
+                    break
+            if is_optimized:
+                break
+        
+        if not is_optimized:
+            optimized.append({
+                **oligo,
+                'invalid': True
+            })
+    return optimized
+
+def is_oligo_acceptable(oligos, target_oligo, na_conc, k_conc, oligo_conc):
+    seq = target_oligo['sequence']
+    gc = get_gc_content(seq)
+    tm = get_tm(seq, na_conc, k_conc, oligo_conc)
+    dg_intra = get_dg_intra_hairpin(seq)
+    dg_full = get_dg_full_complementary(seq)
+    dg_partial = get_dg_partial_complementary(oligos, target_oligo)
+    
+    gc_valid = 25 <= gc <= 75
+    tm_valid = 50 <= tm <= 75
+    dg_intra_valid = dg_intra >= -3
+    dg_full_valid = dg_full <= -20
+    dg_partial_valid = dg_partial >= -5
+
+    return gc_valid and tm_valid and dg_intra_valid and dg_full_valid and dg_partial_valid
@@ -0,0 +1,47 @@
+import itertools
+import random
+
+import pytest
+
+from app.utils.degenerate_utils import IUPAC_BASES, get_degenerate_dg_full_complementary, get_degenerate_tm
+from tests import reference
+
+
+def expansions(seq):
+    return [''.join(bases) for bases in itertools.product(*(IUPAC_BASES.get(char, char) for char in seq))]
+
+
+def test_ranges_match_brute_force_expansion():
+    rng = random.Random(11)
+    for _ in range(40):
+        seq = ''.join(rng.choice('ACGTACGTNKRYSWX') for _ in range(rng.randint(2, 14)))
+        seq = seq[:4] + rng.choice('NK') + seq[4:]
+        expanded = expansions(seq)
+
+        tm = get_degenerate_tm(seq, 100, 5, 500)
+        tms = [reference.get_tm(option, 100, 5, 500) for option in expanded]
+        assert tm['min'] == pytest.approx(min(tms), abs=1e-9)
+        assert tm['max'] == pytest.approx(max(tms), abs=1e-9)
+        assert tm['min'] - 1e-9 <= tm['at_mean_sums'] <= tm['max'] + 1e-9
+
+        dg = get_degenerate_dg_full_complementary(seq)
+        dgs = [reference.get_dg_full_complementary(option) for option in expanded]
+        assert dg['min'] == pytest.approx(min(dgs), abs=1e-9)
+        assert dg['max'] == pytest.approx(max(dgs), abs=1e-9)
+        assert dg['mean'] == pytest.approx(sum(dgs) / len(dgs), abs=1e-9)
+
+
+def test_plain_sequences_collapse_to_the_scalar_values():
+    seq = 'ACGTTGCAGGCTAGCTTAGC'
+    tm = reference.get_tm(seq)
+    assert get_degenerate_tm(seq) == pytest.approx({'at_mean_sums': tm, 'min': tm, 'max': tm}, abs=1e-9)
+    assert get_degenerate_tm('N') == {'at_mean_sums': 0.0, 'min': 0.0, 'max': 0.0}
+
+
+def test_analyze_reports_ranges_only_for_degenerate_input(client):
+    plain = client.post('/api/sequences/analyze', json={'sequence': 'ACGTACGTAGCTAGCTAG'}).get_json()
+    assert 'tm_degenerate' not in plain
+
+    degenerate = client.post('/api/sequences/analyze', json={'sequence': 'ACGTNNKAGCTAGCTAG'}).get_json()
+    assert set(degenerate['tm_degenerate']) == {'at_mean_sums', 'min', 'max'}
+    assert set(degenerate['dg_full_degenerate']) == {'mean', 'min', 'max'}
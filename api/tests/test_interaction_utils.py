@@ -0,0 +1,60 @@
+import random
+
+import pytest
+
+from app.utils.interaction_utils import PoolInteractions
+from tests import reference
+
+
+def random_pool(rng, size):
+    return [
+        {'label': f'FF_{k + 1}', 'sequence': ''.join(rng.choice('ACGT') for _ in range(rng.randint(10, 30)))}
+        for k in range(size)
+    ]
+
+
+def scalar_worst(pool, seq):
+    return reference.get_dg_partial_complementary(pool, {'sequence': seq})
+
+
+def test_matrix_and_lookups_match_the_scalar_scan(stack_parameters):
+    rng = random.Random(4)
+    pool = random_pool(rng, 12)
+    interactions = PoolInteractions(pool)
+
+    for k, oligo in enumerate(pool):
+        assert interactions.worst(k) == pytest.approx(scalar_worst(pool, oligo['sequence']), abs=1e-9)
+    candidate = pool[3]['sequence'][2:-2]
+    assert interactions.candidate_worst(candidate) == pytest.approx(scalar_worst(pool, candidate), abs=1e-9)
+    interactions.candidate_worst(candidate)
+    interactions.candidate_worst(pool[0]['sequence'])
+
+    stats = interactions.stats()
+    assert (stats['enabled'], stats['hits'], stats['misses'], stats['rows_recomputed']) == (True, 2, 1, 12)
+
+
+def test_sync_recomputes_only_changed_rows(stack_parameters):
+    rng = random.Random(5)
+    pool = random_pool(rng, 10)
+    interactions = PoolInteractions(pool)
+    changed = [dict(oligo) for oligo in pool]
+    changed[2]['sequence'] = changed[2]['sequence'][1:]
+    changed[7]['sequence'] = reference.get_reverse_complement(changed[1]['sequence'])
+
+    interactions.sync(changed)
+
+    assert interactions.rows_recomputed == 12
+    assert interactions.matrix == pytest.approx(PoolInteractions(changed).matrix, abs=1e-9)
+
+
+def test_without_stack_parameters_nothing_is_built():
+    pool = random_pool(random.Random(6), 5)
+    interactions = PoolInteractions(pool)
+
+    assert interactions.matrix is None
+    assert interactions.worst(0) == 0
+    assert interactions.candidate_worst(pool[0]['sequence'][1:]) == 0
+    interactions.sync(pool[:3])
+    assert interactions.stats() == {
+        'pool_size': 3, 'enabled': False, 'hits': 0, 'misses': 0, 'hit_rate': 0.0, 'rows_recomputed': 0
+    }
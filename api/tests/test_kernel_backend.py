@@ -0,0 +1,67 @@
+import logging
+import random
+
+import pytest
+
+from app.utils import kernel_backend, thermo_cache
+from app.utils.oligo_utils import score_end_match
+from app.utils.sequence_utils import (
+    get_dg_full_complementary, get_dg_intra_hairpin, get_dg_partial_complementary, get_tm
+)
+from tests import reference
+
+
+@pytest.fixture(params=['numpy', 'numba'])
+def backend(request, monkeypatch):
+    if request.param == 'numba' and kernel_backend.numba is None:
+        pytest.skip('numba is not installed')
+    # Memoized results would hide the backend under test.
+    monkeypatch.setattr(thermo_cache, '_enabled', False)
+    previous = kernel_backend.get_backend()
+    assert kernel_backend.set_backend(request.param) == request.param
+    yield request.param
+    kernel_backend.set_backend(previous)
+
+
+def test_backends_return_the_scalar_values(backend, stack_parameters):
+    rng = random.Random(12)
+    seqs = [''.join(rng.choice('ACGTNacgt') for _ in range(rng.randint(0, 30))) for _ in range(60)]
+    for seq in seqs:
+        assert get_tm(seq, 80, 5, 300) == pytest.approx(reference.get_tm(seq, 80, 5, 300), abs=1e-9)
+        assert get_dg_full_complementary(seq) == pytest.approx(reference.get_dg_full_complementary(seq), abs=1e-9)
+        assert get_dg_intra_hairpin(seq) == pytest.approx(reference.get_dg_intra_hairpin(seq), abs=1e-9)
+
+    pool = [{'sequence': seq} for seq in seqs[:10]]
+    for seq in seqs[10:30]:
+        target = {'sequence': seq}
+        assert get_dg_partial_complementary(pool, target) == pytest.approx(
+            reference.get_dg_partial_complementary(pool, target), abs=1e-9)
+
+
+def test_backends_score_end_matches_like_the_scalar_loop(backend):
+    rng = random.Random(13)
+    for _ in range(300):
+        end = ''.join(rng.choice('ACGT') for _ in range(8))
+        target = ''.join(rng.choice('ACGT') for _ in range(rng.randint(0, 40)))
+        if rng.random() < 0.5:
+            # Plant a one-mismatch copy of the end's reverse complement.
+            site = list(reference.get_reverse_complement(end))
+            site[rng.randrange(8)] = rng.choice('ACGT')
+            cut = rng.randint(0, len(target))
+            target = target[:cut] + ''.join(site) + target[cut:]
+        expected = reference.score_end_match(end, target)
+        score = score_end_match(end, target)
+        assert score == expected and type(score) is type(expected)
+
+
+def test_missing_numba_falls_back_with_a_warning(monkeypatch, caplog):
+    previous = kernel_backend.get_backend()
+    with monkeypatch.context() as patch:
+        patch.setattr(kernel_backend, 'numba', None)
+        with caplog.at_level(logging.WARNING, logger=kernel_backend.__name__):
+            assert kernel_backend.set_backend('numba') == 'numpy'
+    kernel_backend.set_backend(previous)
+
+    assert 'numba is not installed' in caplog.text
+    with pytest.raises(ValueError):
+        kernel_backend.set_backend('cuda')
@@ -0,0 +1,85 @@
+import csv
+import io
+import json
+import random
+import zipfile
+
+from app.utils.library_utils import OligoLibrary, design_construct, iter_library_designs, write_library_zip
+from app.utils.oligo_utils import simple_oligo_maker
+from tests import reference
+
+DESIGN = {'maker': 'simple', 'oligo_length': 40, 'overlap_length': 15}
+
+
+def random_sequence(rng, length):
+    return ''.join(rng.choice('ACGT') for _ in range(length))
+
+
+def shared_block_records(seed, count=6):
+    # Constructs share a common block on either strand, so many oligos repeat.
+    rng = random.Random(seed)
+    block = random_sequence(rng, 100)
+    records = []
+    for k in range(count):
+        shared = block if k % 2 == 0 else reference.get_reverse_complement(block)
+        records.append((f'c{k}', shared + random_sequence(rng, 50 * (k % 3))))
+    return records
+
+
+def read_entry(archive, name):
+    with zipfile.ZipFile(archive) as zf:
+        text = zf.read(name).decode('utf-8')
+    return json.loads(text) if name.endswith('.json') else list(csv.DictReader(io.StringIO(text)))
+
+
+def test_library_orders_each_sequence_once():
+    library = OligoLibrary('96-column')
+    assert library.add('AACG', 'x_FF_1') == ('Plate_1', 'A1', 'as_ordered')
+    assert library.add('CGTT', 'y_RC_1') == ('Plate_1', 'A1', 'reverse_complement')
+    assert library.add('GGGA', 'y_FF_1') == ('Plate_1', 'B1', 'as_ordered')
+    for k in range(94):
+        library.add(random_sequence(random.Random(k), 30), f'z_{k}')
+    assert library.add('TTTT', 'w_FF_1')[:2] == ('Plate_2', 'A1')
+    assert (library.requested, library.ordered, library.plates()) == (98, 97, 2)
+
+    strands = OligoLibrary('96-column', reverse_complements=False)
+    strands.add('AACG', 'x_FF_1')
+    assert strands.add('CGTT', 'y_RC_1') == ('Plate_1', 'B1', 'as_ordered')
+
+
+def test_library_zip_pools_every_oligo_from_its_ordered_well():
+    records = shared_block_records(23) + [('empty', '')]
+    designs = list(iter_library_designs(records, DESIGN))
+    assert [name for name, _ in designs] == [name for name, _ in records]
+    assert designs[0][1] == [(o['label'], o['sequence']) for o in simple_oligo_maker(records[0][1], 40, 15)]
+
+    archive = io.BytesIO()
+    summary = write_library_zip(archive, designs, OligoLibrary('96-column'))
+    assert read_entry(archive, 'summary.json') == summary
+
+    wanted = [seq for _, oligos in designs if oligos for _, seq in oligos]
+    canonical = {min(seq, reference.get_reverse_complement(seq)) for seq in wanted}
+    assert summary['failed_constructs'] == ['empty']
+    assert (summary['oligos_requested'], summary['unique_oligos']) == (len(wanted), len(canonical))
+    assert summary['oligos_saved'] == len(wanted) - len(canonical) > 0
+
+    ordered = {(row['Plate'], row['Well']): row['Sequence'] for row in read_entry(archive, 'oligos_to_order.csv')}
+    assert len(ordered) == len(canonical)
+    for row in read_entry(archive, 'pooling.csv'):
+        source = ordered[(row['Plate Source'], row['Well Source'])]
+        if row['Orientation'] == 'as_ordered':
+            assert source == row['Sequence']
+        else:
+            assert source == reference.get_reverse_complement(row['Sequence'])
+
+
+def test_library_endpoint_returns_the_archive(client):
+    records = shared_block_records(24, count=3)
+    fasta = ''.join(f'>{name}\n{seq}\n' for name, seq in records)
+    response = client.post('/api/oligos/library', json={
+        'sequence': fasta, 'oligo_length': 40, 'overlap_length': 15, 'simple_oligo_maker': True
+    })
+    assert response.status_code == 200
+    summary = read_entry(io.BytesIO(response.data), 'summary.json')
+    expected = sum(len(design_construct(seq, DESIGN)) for _, seq in records)
+    assert (summary['constructs'], summary['oligos_requested']) == (3, expected)
@@ -0,0 +1,65 @@
+import sqlite3
+
+from app.utils.oligo_inventory import OligoInventory, inventory_pooling
+
+
+def test_find_prefers_the_well_with_most_volume(tmp_path):
+    inventory = OligoInventory(str(tmp_path / 'inventory.db'))
+    inventory.add([
+        {'plate': 'P1', 'well': 'A1', 'sequence': 'acgtacgt', 'volume': 5},
+        {'plate': 'P1', 'well': 'B1', 'sequence': 'ACGTACGT', 'volume': 20},
+        {'plate': 'P2', 'well': 'A1', 'sequence': 'ACGTACGT'},
+    ])
+
+    stocked = inventory.find('ACGTACGT')
+    assert (stocked['plate'], stocked['well'], stocked['volume']) == ('P1', 'B1', 20)
+    assert inventory.find('TTTTTTTT') is None
+    assert inventory.find_many(['ACGTACGT', 'TTTTTTTT']) == {'ACGTACGT': stocked}
+
+
+def test_restocking_a_well_replaces_its_sequence(tmp_path):
+    inventory = OligoInventory(str(tmp_path / 'inventory.db'))
+    inventory.add([{'plate': 'P1', 'well': 'A1', 'sequence': 'ACGTACGT', 'volume': 10}])
+    inventory.add([{'plate': 'P1', 'well': 'A1', 'sequence': 'GGGGCCCC', 'volume': 10}])
+
+    assert inventory.find('ACGTACGT') is None
+    assert inventory.find_many(['ACGTACGT']) == {}
+    assert inventory.find('GGGGCCCC')['well'] == 'A1'
+    assert inventory.stats()['entries'] == 1
+
+
+def test_files_keyed_by_sequence_are_migrated(tmp_path):
+    path = str(tmp_path / 'inventory.db')
+    conn = sqlite3.connect(path)
+    conn.execute(
+        'CREATE TABLE stock (key BLOB NOT NULL, plate TEXT NOT NULL, well TEXT NOT NULL, '
+        'sequence TEXT NOT NULL, name TEXT, volume REAL, added REAL NOT NULL, '
+        'PRIMARY KEY (key, plate, well)) WITHOUT ROWID'
+    )
+    conn.executemany('INSERT INTO stock VALUES (?, ?, ?, ?, ?, ?, ?)', [
+        (OligoInventory.make_key('ACGTACGT'), 'P1', 'A1', 'ACGTACGT', None, 10, 1.0),
+        (OligoInventory.make_key('GGGGCCCC'), 'P1', 'A1', 'GGGGCCCC', None, 10, 2.0),
+        (OligoInventory.make_key('ACGTACGT'), 'P1', 'B2', 'ACGTACGT', None, 3, 1.0),
+    ])
+    conn.commit()
+    conn.close()
+
+    inventory = OligoInventory(path)
+    assert inventory.find('GGGGCCCC')['well'] == 'A1'
+    assert inventory.find('ACGTACGT')['well'] == 'B2'
+    assert inventory.stats()['entries'] == 2
+
+
+def test_inventory_pooling_splits_stocked_and_to_order(tmp_path):
+    inventory = OligoInventory(str(tmp_path / 'inventory.db'))
+    inventory.add([{'plate': 'P1', 'well': 'C3', 'sequence': 'ACGTACGT', 'volume': 10}])
+    oligos = [
+        {'label': 'FF_1', 'sequence': 'ACGTACGT', 'fragment': 'frag'},
+        {'label': 'RC_1', 'sequence': 'TTTTGGGG', 'fragment': 'frag'},
+    ]
+
+    report = inventory_pooling(oligos, inventory)
+    assert (report['stocked'], report['to_order']) == (1, 1)
+    assert report['pooling'][0]['Plate Source'] == 'P1'
+    assert report['pooling'][0]['Well Source'] == 'C3'
+    assert report['oligos_to_order'] == [oligos[1]]
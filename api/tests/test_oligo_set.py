@@ -0,0 +1,49 @@
+import itertools
+
+from app.utils.oligo_set import OligoSet
+from tests import reference
+
+OLIGOS = [
+    {'label': 'FF_1', 'sequence': 'ACGTACGT', 'length': 8, 'fragment': 'a'},
+    {'label': 'RC_1', 'sequence': 'TTGCA', 'length': 5, 'fragment': 'a', 'invalid': True},
+    {'label': 'FF_2', 'sequence': 'GGCC', 'length': 4, 'fragment': 'a', 'overlap_tm': 61.2},
+    {'label': 'FF_2', 'sequence': 'GGCC', 'length': 4, 'fragment': 'a', 'overlap_tm': 61.2},
+    {'label': 'RC_x', 'sequence': 'AC', 'length': 2, 'fragment': 'b'},
+    {'label': 'FF', 'sequence': 'CA', 'length': 2},
+    {'label': 'RC_2', 'sequence': 'GGCC', 'length': 4, 'fragment': 'b'},
+]
+
+
+def test_dicts_round_trip():
+    oligo_set = OligoSet.from_dicts(OLIGOS)
+    assert oligo_set.to_dicts() == OLIGOS
+    assert oligo_set.fragment_ids == [0, 0, 0, 0, 1, 2, 1]
+
+    pooled = OligoSet.from_dicts(OLIGOS, fragment='c', pool='p1')
+    assert pooled.to_dicts() == [{**oligo, 'fragment': 'c', 'pool': 'p1'} for oligo in OLIGOS]
+
+
+def test_row_checks_match_the_dict_checks():
+    oligo_set = OligoSet.from_dicts(OLIGOS)
+    numbered = {row for row, oligo in enumerate(OLIGOS) if oligo['label'][3:].isdigit()}
+    for a, b in itertools.product(range(len(OLIGOS)), repeat=2):
+        # The original raised on labels without a number; they never pair now.
+        if a in numbered and b in numbered:
+            assert oligo_set.is_partner(a, b) == reference.is_intended_partner(OLIGOS[a], OLIGOS[b])
+        else:
+            assert not oligo_set.is_partner(a, b)
+        assert oligo_set.same(a, b) == (OLIGOS[a] == OLIGOS[b])
+
+
+def test_concat_and_with_columns():
+    first = OligoSet.from_dicts(OLIGOS[:3], fragment='a')
+    second = OligoSet.from_dicts(OLIGOS[3:], fragment='b', pool='p2')
+    joined = OligoSet.concat([first, second])
+    assert joined.to_dicts() == first.to_dicts() + second.to_dicts()
+    assert joined.fragment_ids == [0, 0, 0, 1, 1, 1, 1]
+
+    trimmed = joined.with_columns(sequence=[seq[1:] for seq in joined.sequences], invalid=[False] * len(joined))
+    assert trimmed.index is joined.index and trimmed.labels is joined.labels
+    assert [oligo['sequence'] for oligo in trimmed.iter_dicts()] == [oligo['sequence'][1:] for oligo in OLIGOS]
+    assert all(oligo['invalid'] is False for oligo in trimmed.iter_dicts())
+    assert joined.column('invalid') == [None, True, None, None, None, None, None]
@@ -0,0 +1,158 @@
+import functools
+import random
+
+import pytest
+
+from app.utils import kernel_backend
+from app.utils.kmer_index import KmerIndex
+from app.utils.oligo_utils import (
+    ACCEPTANCE_STAGES, AcceptanceStats, clean_oligos, is_oligo_acceptable,
+    score_end_match, simple_oligo_maker, tm_balanced_oligo_maker
+)
+from tests import reference
+
+
+def random_sequence(rng, length, alphabet='ACGT'):
+    return ''.join(rng.choice(alphabet) for _ in range(length))
+
+
+def repetitive_pool(rng, length=600):
+    # Reused motifs and their reverse complements give the ends real conflicts.
+    motifs = [random_sequence(rng, 12) for _ in range(4)]
+    motifs += [reference.get_reverse_complement(motif) for motif in motifs]
+    parts = []
+    while sum(map(len, parts)) < length:
+        parts.append(rng.choice(motifs) if rng.random() < 0.4 else random_sequence(rng, 10))
+    return simple_oligo_maker(''.join(parts), 40, 15)
+
+
+def test_kmer_index_finds_every_window_within_one_mismatch():
+    rng = random.Random(14)
+    sequences = [random_sequence(rng, rng.randint(0, 30), 'ACG') for _ in range(20)]
+    index = KmerIndex(sequences, 5)
+    for _ in range(200):
+        query = random_sequence(rng, 5, 'ACG')
+        expected = {
+            member for member, seq in enumerate(sequences)
+            if any(sum(a != b for a, b in zip(query, seq[i:i + 5])) <= 1 for i in range(len(seq) - 4))
+        }
+        assert index.candidates(query) == expected
+    assert index.candidates('ACG') == set()
+
+
+def test_clean_oligos_matches_the_full_scan():
+    rng = random.Random(15)
+    trimmed = 0
+    for _ in range(8):
+        oligos = repetitive_pool(rng)
+        expected = reference.clean_oligos([dict(oligo) for oligo in oligos])
+        assert clean_oligos([dict(oligo) for oligo in oligos]) == expected
+        trimmed += sum(
+            cleaned['sequence'] != oligo['sequence'] or cleaned['invalid']
+            for cleaned, oligo in zip(expected, oligos)
+        )
+    assert trimmed
+
+
+def test_bit_parallel_end_match_matches_the_window_scan(monkeypatch):
+    monkeypatch.setattr(kernel_backend, '_backend', 'numpy')
+    rng = random.Random(16)
+    cases = [('', 'ACGT'), ('ACGT', ''), ('ACGTACGTAC', 'ACGT'), ('acgt', 'ACGTacgt'), ('ACGT', 'ÄCGTTTGCA')]
+    for _ in range(300):
+        end = random_sequence(rng, rng.randint(1, 10), 'ACGTNa')
+        target = random_sequence(rng, rng.randint(0, 300), 'ACGTNa')
+        if rng.random() < 0.5:
+            site = list(reference.get_reverse_complement(end))
+            site[rng.randrange(len(site))] = rng.choice('ACGT')
+            cut = rng.randint(0, len(target))
+            target = target[:cut] + ''.join(site) + target[cut:]
+        cases.append((end, target))
+
+    for end, target in cases:
+        expected = reference.score_end_match(end, target)
+        score = score_end_match(end, target)
+        assert score == expected and type(score) is type(expected), (end, target)
+
+
+@pytest.mark.parametrize('with_stacks', [False, True])
+def test_acceptance_checks_stop_at_the_first_rejection(request, with_stacks):
+    if with_stacks:
+        request.getfixturevalue('stack_parameters')
+    rng = random.Random(18)
+    pool = simple_oligo_maker(random_sequence(rng, 150), 40, 15)
+    # Random candidates almost never clear the hairpin check; these do.
+    candidates = ['TCGGACCCTCACTAAGGGCTAA', 'CTCGACCCTTCTAGGAGGGGGG', 'TCTCTTCATTAGTGTCGTGTAT'] + [
+        random_sequence(rng, rng.randint(20, 45), rng.choice(['ACGT', 'AC', 'GC'])) for _ in range(40)
+    ]
+
+    stats = AcceptanceStats()
+    accepted = 0
+    for seq in candidates:
+        expected = reference.is_oligo_acceptable(pool, {'sequence': seq}, 50, 0, 250)
+        assert is_oligo_acceptable(pool, {'sequence': seq}, 50, 0, 250, stats=stats) == expected
+        accepted += expected
+
+    assert (stats.candidates, stats.accepted) == (len(candidates), accepted)
+    # Without stacks every candidate reaching the dimer check passes it.
+    assert stats.stages['dg_partial']['rejected'] if with_stacks else accepted == 3
+    remaining = stats.candidates
+    for name in ACCEPTANCE_STAGES:
+        counters = stats.stages[name]
+        assert counters['evaluated'] == remaining
+        remaining -= counters['rejected']
+    assert remaining == accepted
+
+
+def best_balanced_cost(sequence, min_length, max_length, widths, target_tm):
+    # Every chain of overlaps (s, e): each one starts after the previous
+    # ended, and the oligos between consecutive starts fit the length limits.
+    seq_l = len(sequence)
+
+    def cost(start, end):
+        return (reference.get_tm(sequence[start:end]) - target_tm) ** 2
+
+    overlaps = [(s, s + w) for s in range(1, seq_l) for w in widths if s + w <= seq_l - 1]
+
+    @functools.lru_cache(maxsize=None)
+    def chain(start, end):
+        options = [0.0] if min_length <= end <= max_length else []
+        options += [
+            chain(prev_start, prev_end) for prev_start, prev_end in overlaps
+            if prev_end <= start and min_length <= end - prev_start <= max_length
+        ]
+        return cost(start, end) + min(options, default=float('inf'))
+
+    return min(
+        (chain(start, end) for start, end in overlaps if min_length <= seq_l - start <= max_length),
+        default=float('inf')
+    )
+
+
+def test_tm_balanced_layout_is_the_cheapest_chain():
+    rng = random.Random(19)
+    for _ in range(3):
+        sequence = random_sequence(rng, rng.randint(70, 95))
+        oligos = tm_balanced_oligo_maker(sequence, 25, 35, 8, 12, 40)
+        forward = [oligo for oligo in oligos if oligo['label'].startswith('FF_')]
+        reverse = [oligo for oligo in oligos if oligo['label'].startswith('RC_')]
+        pieces = [
+            forward[k // 2]['sequence'] if k % 2 == 0 else reference.get_reverse_complement(reverse[k // 2]['sequence'])
+            for k in range(len(oligos))
+        ]
+
+        # Consecutive pieces overlap, and the chain covers the sequence.
+        position = 0
+        total = 0.0
+        for piece, following in zip(pieces, pieces[1:] + ['']):
+            assert 25 <= len(piece) <= 35 and sequence.startswith(piece, position)
+            if following:
+                overlap = next(w for w in range(12, 7, -1) if piece.endswith(following[:w]))
+                total += (reference.get_tm(following[:overlap]) - 40) ** 2
+                position += len(piece) - overlap
+        assert position + len(pieces[-1]) == len(sequence)
+        assert total == pytest.approx(best_balanced_cost(sequence, 25, 35, range(8, 13), 40))
+
+
+def test_tm_balanced_short_fragment_is_one_oligo():
+    assert tm_balanced_oligo_maker('acgtacgtac', 25, 35) == [{'label': 'FF_1', 'sequence': 'ACGTACGTAC', 'length': 10}]
+    assert tm_balanced_oligo_maker('', 25, 35) == []
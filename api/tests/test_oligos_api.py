@@ -0,0 +1,101 @@
+import json
+import random
+
+import pytest
+
+from app.resources import oligos as oligos_resource
+from tests import reference
+
+GENERATE = '/api/oligos/generate'
+
+
+def shared_motif_fasta(seed):
+    # Fragments built from the same motifs, so cross-fragment checks matter.
+    rng = random.Random(seed)
+    motifs = [''.join(rng.choice('ACGT') for _ in range(12)) for _ in range(3)]
+    motifs += [reference.get_reverse_complement(motif) for motif in motifs]
+    records = {}
+    for name in ('a', 'b', 'c'):
+        parts = []
+        while sum(map(len, parts)) < 300:
+            parts.append(rng.choice(motifs) if rng.random() < 0.4
+                         else ''.join(rng.choice('ACGT') for _ in range(10)))
+        records[name] = ''.join(parts)
+    return records
+
+
+def generate(client, records, **options):
+    fasta = ''.join(f'>{name}\n{seq}\n' for name, seq in records.items())
+    return client.post(GENERATE, json={
+        'sequence': fasta, 'oligo_length': 40, 'overlap_length': 15,
+        'simple_oligo_maker': True, 'clean_oligos': True, **options
+    })
+
+
+def reference_clean(records, groups):
+    cleaned = {}
+    for names in groups:
+        pool = [
+            {**oligo, 'fragment': name}
+            for name in names for oligo in reference.simple_oligo_maker(records[name], 40, 15)
+        ]
+        for oligo in reference.clean_oligos(pool):
+            cleaned.setdefault(oligo['fragment'], []).append((oligo['sequence'], oligo['invalid']))
+    return cleaned
+
+
+def by_fragment(response):
+    found = {}
+    for oligo in response.get_json()['oligos']:
+        found.setdefault(oligo['fragment'], []).append((oligo['sequence'], oligo['invalid']))
+    return found
+
+
+@pytest.mark.parametrize('options, groups', [
+    ({}, [('a', 'b', 'c')]),
+    ({'cross_check_scope': 'global'}, [('a', 'b', 'c')]),
+    ({'cross_check_scope': 'fragment'}, [('a',), ('b',), ('c',)]),
+    ({'cross_check_scope': 'pool', 'pools': {'a': 'p1', 'b': 'p1'}}, [('a', 'b'), ('c',)]),
+])
+def test_cross_check_scopes_match_the_full_scan_per_group(client, options, groups):
+    records = shared_motif_fasta(17)
+    response = generate(client, records, **options)
+    assert response.status_code == 200
+    assert response.get_json()['parameters']['cross_check_scope'] == options.get('cross_check_scope', 'global')
+    assert by_fragment(response) == reference_clean(records, groups)
+
+
+def test_scopes_actually_differ_on_shared_motifs(client):
+    records = shared_motif_fasta(17)
+    assert by_fragment(generate(client, records)) != by_fragment(generate(client, records, cross_check_scope='fragment'))
+
+
+def test_invalid_scope_options_are_rejected(client):
+    records = shared_motif_fasta(18)
+    assert generate(client, records, cross_check_scope='well').status_code == 400
+    assert generate(client, records, cross_check_scope='pool', pools={'a': ['p1']}).status_code == 400
+    streamed = generate(client, records, stream=True)
+    assert streamed.status_code == 400
+    assert 'fragment' in streamed.get_json()['error']
+
+
+@pytest.mark.parametrize('options', [
+    {'clean_oligos': False},
+    {'cross_check_scope': 'fragment'},
+    {'cross_check_scope': 'fragment', 'tm_balanced_oligo_maker': True, 'oligo_length': 60, 'overlap_length': 25},
+])
+def test_streamed_lines_match_the_buffered_response(client, monkeypatch, options):
+    monkeypatch.setattr(oligos_resource, 'STREAM_CHUNK_OLIGOS', 3)
+    records = shared_motif_fasta(20)
+    buffered = generate(client, records, **options).get_json()
+    streamed = generate(client, records, stream=True, **options)
+    assert streamed.mimetype == 'application/x-ndjson'
+
+    lines = [json.loads(line) for line in streamed.get_data(as_text=True).splitlines()]
+    oligos = [oligo for line in lines if line['type'] == 'oligos' for oligo in line['oligos']]
+    primers = [primer for line in lines if line['type'] == 'primers' for primer in line['primers']]
+    assert [line['name'] for line in lines if line['type'] == 'fragment'] == list(records)
+    assert all(len(line['oligos']) <= 3 for line in lines if line['type'] == 'oligos')
+    assert oligos and (oligos, primers) == (buffered['oligos'], buffered['primers'])
+    assert lines[-1]['type'] == 'summary'
+    assert (lines[-1]['fragments'], lines[-1]['total_count']) == (len(records), len(oligos))
@@ -0,0 +1,58 @@
+import random
+
+from app.utils.oligo_utils import optimize_oligos, simple_oligo_maker
+from app.utils.optimize_checkpoint import OptimizeCheckpoint
+
+
+def oligo_pool(seed):
+    rng = random.Random(seed)
+    return simple_oligo_maker(''.join(rng.choice('ACGT') for _ in range(400)), 40, 15)
+
+
+def test_results_are_kept_per_run(tmp_path):
+    checkpoint = OptimizeCheckpoint(str(tmp_path / 'checkpoint.db'))
+    run = checkpoint.run_key(['ACGT', 'GGCC'], 50, 0, 250)
+    other = checkpoint.run_key(['ACGT', 'GGCC'], 60, 0, 250)
+    assert run != other
+
+    assert checkpoint.load(run, 2) == {}
+    checkpoint.save(run, [0, 1], ['CG', None])
+    assert checkpoint.load(run, 2) == {0: 'CG', 1: None}
+    assert checkpoint.load(other, 2) == {}
+    stats = checkpoint.stats()
+    assert (stats['runs'], stats['results'], stats['resumed'], stats['saved']) == (2, 2, 2, 2)
+
+    # Runs not touched within the TTL are dropped with their results.
+    checkpoint.ttl_seconds = -1
+    checkpoint.prune()
+    assert (checkpoint.stats()['runs'], checkpoint.stats()['results']) == (0, 0)
+
+
+def test_resumed_runs_reuse_stored_results(tmp_path):
+    pool = oligo_pool(25)
+    expected = optimize_oligos([dict(oligo) for oligo in pool], 50, 0, 250)
+
+    path = str(tmp_path / 'checkpoint.db')
+    checkpoint = OptimizeCheckpoint(path)
+    assert optimize_oligos([dict(oligo) for oligo in pool], 50, 0, 250, checkpoint=checkpoint) == expected
+    assert (checkpoint.resumed, checkpoint.saved) == (0, len(pool))
+
+    # A new process reopening the file finds every result of the same run.
+    reopened = OptimizeCheckpoint(path)
+    assert optimize_oligos([dict(oligo) for oligo in pool], 50, 0, 250, checkpoint=reopened) == expected
+    assert (reopened.resumed, reopened.saved) == (len(pool), 0)
+
+
+def test_interrupted_runs_only_optimize_the_rest(tmp_path):
+    pool = oligo_pool(26)
+    checkpoint = OptimizeCheckpoint(str(tmp_path / 'checkpoint.db'))
+    run = checkpoint.run_key([oligo['sequence'] for oligo in pool], 50, 0, 250)
+    # A stored result stands for the finished oligo and is not recomputed.
+    checkpoint.save(run, [0], ['ACGTACGT'])
+
+    resumed = optimize_oligos([dict(oligo) for oligo in pool], 50, 0, 250, checkpoint=checkpoint)
+    expected = optimize_oligos([dict(oligo) for oligo in pool], 50, 0, 250)
+    assert resumed[0] == {**pool[0], 'sequence': 'ACGTACGT', 'length': 8, 'invalid': False}
+    assert resumed[1:] == expected[1:]
+    # saved counts the stored row and the len(pool) - 1 optimized now.
+    assert (checkpoint.resumed, checkpoint.saved) == (1, len(pool))
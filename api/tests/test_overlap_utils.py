@@ -0,0 +1,72 @@
+import itertools
+import random
+
+import pytest
+
+from app.utils.oligo_utils import simple_oligo_maker
+from app.utils.overlap_utils import DEFAULT_OVERLAP_K, find_junctions, overlap_conflicts, validate_overlaps
+from tests import reference
+
+
+def near_windows(a, b, k, max_mismatches):
+    # Whether a and b share a k-mer within max_mismatches, on either strand.
+    def windows(seq):
+        return [seq[i:i + k] for i in range(len(seq) - k + 1) if set(seq[i:i + k]) <= set('ACGT')]
+
+    b_windows = windows(b) + windows(reference.get_reverse_complement(b))
+    return any(
+        sum(x != y for x, y in zip(u, v)) <= max_mismatches
+        for u in windows(a) for v in b_windows
+    )
+
+
+@pytest.mark.parametrize('k, max_mismatches', [(6, 0), (6, 1), (9, 1)])
+def test_conflicts_match_the_pairwise_scan(k, max_mismatches):
+    rng = random.Random(22)
+    motifs = [''.join(rng.choice('ACGT') for _ in range(k)) for _ in range(4)]
+    overlaps = []
+    for _ in range(25):
+        seq = list(''.join(rng.choice('ACGTN' if rng.random() < 0.1 else 'ACGT') for _ in range(rng.randint(0, 20))))
+        motif = rng.choice(motifs)
+        if rng.random() < 0.3:
+            motif = reference.get_reverse_complement(motif)
+        position = rng.randint(0, len(seq))
+        seq[position:position] = motif
+        if rng.random() < 0.5:
+            seq[position + rng.randrange(k)] = rng.choice('ACGT')
+        overlaps.append(''.join(seq))
+    groups = [rng.choice('xy') for _ in overlaps]
+
+    for pools in (None, groups):
+        conflicts = overlap_conflicts(overlaps, k, max_mismatches, pools)
+        found = {pair for group in conflicts for pair in itertools.combinations(group, 2)}
+        expected = {
+            (a, b) for a, b in itertools.combinations(range(len(overlaps)), 2)
+            if (pools is None or pools[a] == pools[b]) and near_windows(overlaps[a], overlaps[b], k, max_mismatches)
+        }
+        assert found == expected
+
+
+def test_junctions_follow_the_maker_layout():
+    rng = random.Random(23)
+    sequence = ''.join(rng.choice('ACGT') for _ in range(200))
+    oligos = [{**oligo, 'fragment': 'a'} for oligo in simple_oligo_maker(sequence, 40, 15)]
+    junctions = find_junctions(oligos)
+    assert len(junctions) == len(oligos) - 1
+    assert all(len(junction['overlap']) >= 15 and junction['overlap'] in sequence for junction in junctions)
+
+
+def test_repeated_fragments_conflict_only_across_the_pool():
+    rng = random.Random(24)
+    sequence = ''.join(rng.choice('ACGT') for _ in range(200))
+    oligos = [
+        {**oligo, 'fragment': name}
+        for name in ('a', 'b') for oligo in simple_oligo_maker(sequence, 40, 20)
+    ]
+
+    shared = validate_overlaps(oligos)
+    assert (shared['k'], shared['unique']) == (DEFAULT_OVERLAP_K, False)
+    assert shared['flagged'] == shared['junctions']
+    assert validate_overlaps(oligos, scope='fragment')['unique']
+    with pytest.raises(ValueError):
+        overlap_conflicts(['ACGT'], 0)
@@ -0,0 +1,54 @@
+import random
+
+import pytest
+
+from app.utils.packed_sequence import PackedSequence
+from app.utils.thermo_utils import encode_sequence
+from tests import reference
+
+
+def test_views_decode_like_str_slices():
+    rng = random.Random(8)
+    text = ''.join(rng.choice('ACGTACGTACGTNRYK') for _ in range(301))
+    packed = PackedSequence(text)
+    assert str(packed) == text
+
+    for _ in range(100):
+        start, stop = sorted(rng.sample(range(len(text) + 1), 2))
+        view = packed[start:stop]
+        assert str(view) == text[start:stop]
+        assert str(view.reverse_complement()) == reference.get_reverse_complement(text[start:stop])
+        assert view.codes().tolist() == encode_sequence(text[start:stop]).tolist()
+
+        rc = view.reverse_complement()
+        inner = rc[1:len(rc) - 1]
+        assert str(inner) == reference.get_reverse_complement(text[start:stop])[1:-1]
+        assert inner.codes().tolist() == encode_sequence(str(inner)).tolist()
+
+
+def test_stores_plain_bases_at_two_bits_each():
+    packed = PackedSequence('ACGT' * 25000 + 'N')
+    assert packed.nbytes == 25001 + 8 + 1
+    assert packed[:100000].nbytes == 25000
+
+
+def test_compares_and_hashes_like_its_uppercase_str():
+    packed = PackedSequence('acgtn')
+    assert packed == 'ACGTN' and packed != 'acgtn'
+    assert hash(packed) == hash('ACGTN')
+    assert packed[-1] == 'N'
+    assert 'GTN' in packed and packed.count('A') == 1 and packed.find('T') == 3
+    with pytest.raises(IndexError):
+        packed[5]
+
+
+def test_replace_rewrites_only_the_given_bases():
+    text = 'ACGTACGTNNACGTAC'
+    packed = PackedSequence(text)
+    for position in range(0, len(text) - 2):
+        variant = packed.replace(position, 'nnk')
+        assert str(variant) == text[:position] + 'NNK' + text[position + 3:]
+        assert str(packed) == text
+    assert str(packed[2:].replace(0, 'TT')) == 'TTACGTNNACGTAC'
+    with pytest.raises(IndexError):
+        packed.replace(len(text) - 1, 'AA')
@@ -0,0 +1,64 @@
+import random
+
+import pytest
+
+from app.utils import parallel_utils
+from app.utils.interaction_utils import PoolInteractions
+from app.utils.oligo_utils import AcceptanceStats, optimize_oligos, simple_oligo_maker
+from app.utils.parallel_utils import MIN_PARALLEL_OLIGOS, SharedInteractions, SharedPool, optimize_sequences_parallel
+
+
+@pytest.fixture
+def workers():
+    yield 2
+    parallel_utils.shutdown_executor()
+
+
+def oligo_pool(seed, count):
+    rng = random.Random(seed)
+    sequence = ''.join(rng.choice('ACGT') for _ in range(25 * count + 20))
+    return simple_oligo_maker(sequence, 40, 15)[:count]
+
+
+def test_shared_pool_lookups_match_pool_interactions(stack_parameters):
+    pool = oligo_pool(1, 8)
+    interactions = PoolInteractions(pool)
+    with SharedPool(interactions.encoded_pool()) as shared:
+        worker_side = SharedInteractions(shared.handle)
+        try:
+            for oligo in pool:
+                candidate = oligo['sequence'][3:-4]
+                assert worker_side.candidate_worst(candidate) == pytest.approx(
+                    interactions.candidate_worst(candidate), abs=1e-9
+                )
+        finally:
+            worker_side.close()
+
+
+def test_parallel_trims_match_a_serial_run(workers):
+    pool = oligo_pool(2, MIN_PARALLEL_OLIGOS + 8)
+    serial_stats, parallel_stats = AcceptanceStats(), AcceptanceStats()
+
+    serial = optimize_oligos(pool, 50, 0, 250, stats=serial_stats)
+    parallel = optimize_oligos(pool, 50, 0, 250, workers=workers, stats=parallel_stats)
+
+    assert parallel == serial
+    assert any(not oligo['invalid'] for oligo in serial)
+    parallel_counts = {name: counters['evaluated'] for name, counters in parallel_stats.as_dict()['stages'].items()}
+    serial_counts = {name: counters['evaluated'] for name, counters in serial_stats.as_dict()['stages'].items()}
+    assert (parallel_stats.candidates, parallel_stats.accepted, parallel_counts) == \
+        (serial_stats.candidates, serial_stats.accepted, serial_counts)
+
+
+def test_chunk_callback_errors_propagate(workers):
+    pool = oligo_pool(3, 12)
+    sequences = [oligo['sequence'] for oligo in pool]
+    seen = []
+
+    def on_chunk(start, results):
+        seen.append(start)
+        raise RuntimeError('stop')
+
+    with pytest.raises(RuntimeError, match='stop'):
+        optimize_sequences_parallel(sequences, 50, 0, 250, PoolInteractions(pool), workers, on_chunk=on_chunk)
+    assert seen == [0]
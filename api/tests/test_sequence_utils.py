@@ -0,0 +1,44 @@
+import io
+import random
+
+import pytest
+
+from app.utils.sequence_utils import get_reverse_complement, iter_multi_fasta, parse_multi_fasta
+from tests import reference
+
+
+def test_reverse_complement_keeps_the_original_mapping():
+    rng = random.Random(9)
+    alphabet = 'ACGTWSMKRYBDHVNacgtU-* '
+    for _ in range(200):
+        seq = ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 40)))
+        assert get_reverse_complement(seq) == reference.get_reverse_complement(seq)
+
+
+FASTA_CASES = [
+    '',
+    '   \n\n',
+    'acgt nnk\n12 ggcc\n',
+    '>one\nACGT\nacgt\n>two desc\n\nGG-CC\n',
+    '\n>\n\nACGT\n>empty\n>three\nTT>four\nAA\r\nCC\r\n',
+    '>a\n>b\nAC\n>\nGG\n',
+]
+
+
+@pytest.mark.parametrize('text', FASTA_CASES)
+def test_streaming_parser_matches_the_whole_text_parser(text):
+    expected = reference.parse_multi_fasta(text, 'raw')
+    assert parse_multi_fasta(text, 'raw') == expected
+    assert list(iter_multi_fasta(io.StringIO(text), 'raw')) == expected
+    assert list(iter_multi_fasta(io.BytesIO(text.encode('utf-8')), 'raw')) == expected
+
+
+def test_streaming_parser_reads_records_lazily():
+    def lines():
+        yield '>first\n'
+        yield 'ACGT\n'
+        yield '>second\n'
+        raise AssertionError('read past the record being consumed')
+
+    records = iter_multi_fasta(lines())
+    assert next(records) == {'name': 'first', 'seq': 'ACGT'}
@@ -0,0 +1,36 @@
+import json
+import random
+
+import pytest
+
+from tests import reference
+
+
+def test_profile_streams_every_window(client):
+    rng = random.Random(10)
+    first = ''.join(rng.choice('ACGT') for _ in range(250))
+    second = ''.join(rng.choice('ACGTN') for _ in range(40))
+    response = client.post('/api/sequences/profile', json={
+        'sequence': f'>first\n{first}\n>second\n{second}\n', 'window': 50, 'step': 20, 'na_conc': 100
+    })
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+    headers = [line for line in lines if line['type'] == 'sequence']
+    assert [(h['name'], h['length'], h['window'], h['windows']) for h in headers] == [
+        ('first', 250, 50, 11), ('second', 40, 40, 1)
+    ]
+    for record, seq in (('first', first), ('second', second)):
+        windows = [line for line in lines if line['type'] == 'windows' and line['name'] == record]
+        starts = [start for line in windows for start in line['start']]
+        tm = [value for line in windows for value in line['tm']]
+        gc = [value for line in windows for value in line['gc_content']]
+        width = min(50, len(seq))
+        assert starts == list(range(0, len(seq) - width + 1, 20))
+        assert tm == pytest.approx([round(reference.get_tm(seq[s:s + width], 100), 2) for s in starts], abs=0.011)
+        assert gc == pytest.approx([round(reference.get_gc_content(seq[s:s + width]), 2) for s in starts], abs=0.011)
+
+
+def test_profile_rejects_empty_sequences(client):
+    assert client.post('/api/sequences/profile', json={'sequence': '  '}).status_code == 400
@@ -0,0 +1,59 @@
+from app.utils import thermo_cache
+from app.utils.packed_sequence import PackedSequence
+from app.utils.thermo_cache import ENTRY_OVERHEAD_BYTES, ThermoCache, memoize_thermo
+
+calls = []
+
+
+@memoize_thermo
+def _tm_like(seq, na_conc=50, k_conc=0):
+    calls.append(seq)
+    return len(seq) + na_conc + k_conc
+
+
+def test_lru_evicts_oldest_entries_first():
+    cache = ThermoCache('test', max_entries=2)
+    cache.put(('A',), 1)
+    cache.put(('C',), 2)
+    cache.get(('A',))
+    cache.put(('G',), 3)
+
+    assert cache.get(('C',)) == (False, None)
+    assert cache.get(('A',)) == (True, 1)
+    assert cache.stats()['evictions'] == 1
+
+
+def test_byte_limit_counts_sequence_characters():
+    cache = ThermoCache('test', max_bytes=2 * ENTRY_OVERHEAD_BYTES + 20)
+    cache.put(('A' * 10, 50), 1.0)
+    cache.put((PackedSequence('C' * 10), 50), 2.0)
+    assert cache.bytes == 2 * ENTRY_OVERHEAD_BYTES + 20
+
+    cache.put(('G', 50), 3.0)
+    assert cache.stats()['entries'] == 2
+    assert cache.get(('A' * 10, 50)) == (False, None)
+
+
+def test_memoize_keys_on_bound_arguments():
+    _tm_like.cache.clear()
+    calls.clear()
+
+    assert _tm_like('ACGT') == _tm_like('ACGT', 50) == _tm_like(seq='ACGT', k_conc=0) == 54
+    assert _tm_like(PackedSequence('acgt')) == 54
+    assert _tm_like('ACGT', 60) == 64
+    assert calls == ['ACGT', 'ACGT']
+    assert all(type(key[0]) is str for key in _tm_like.cache._entries)
+
+
+def test_unhashable_arguments_and_disabled_cache_bypass_it(monkeypatch):
+    _tm_like.cache.clear()
+    calls.clear()
+
+    _tm_like(['A', 'C'])
+    _tm_like(['A', 'C'])
+    monkeypatch.setattr(thermo_cache, '_enabled', False)
+    _tm_like('ACGT')
+    _tm_like('ACGT')
+
+    assert len(calls) == 4
+    assert _tm_like.cache.stats()['entries'] == 0
@@ -0,0 +1,37 @@
+from app.utils import thermo_store
+from app.utils.packed_sequence import PackedSequence
+from app.utils.thermo_store import ThermoStore
+
+
+def test_results_are_shared_between_store_instances(tmp_path):
+    path = str(tmp_path / 'thermo.db')
+    writer = ThermoStore(path)
+    writer.put('get_tm', ('ACGT', 50, 0, 250), 12.5)
+    assert writer.get('get_tm', ('ACGT', 50, 0, 250)) == (True, 12.5)
+    assert writer.stats()['pending'] == 1
+
+    reader = ThermoStore(path)
+    assert reader.get('get_tm', ('ACGT', 50, 0, 250)) == (False, None)
+    writer.flush()
+    assert reader.get('get_tm', ('ACGT', 50.0, 0.0, 250.0)) == (True, 12.5)
+    assert reader.get('get_dg_full_complementary', ('ACGT',)) == (False, None)
+
+
+def test_keys_normalize_numbers_and_packed_sequences():
+    assert ThermoStore.make_key('get_tm', ('ACGT', 50)) == ThermoStore.make_key('get_tm', (PackedSequence('ACGT'), 50.0))
+    assert ThermoStore.make_key('get_tm', ('ACGT', True)) != ThermoStore.make_key('get_tm', ('ACGT', 1.0))
+
+
+def test_writes_are_batched_and_expired_entries_ignored(tmp_path, monkeypatch):
+    monkeypatch.setattr(thermo_store, 'WRITE_BATCH', 3)
+    store = ThermoStore(str(tmp_path / 'thermo.db'), ttl_seconds=60, max_entries=2)
+    for k in range(3):
+        store.put('get_tm', (f'SEQ{k}',), float(k))
+    assert store.stats()['pending'] == 0
+    assert store.stats()['entries'] == 3
+
+    store.prune()
+    assert store.stats()['entries'] == 2
+
+    monkeypatch.setattr(thermo_store.time, 'time', lambda: 1e12)
+    assert store.get('get_tm', ('SEQ2',)) == (False, None)
@@ -0,0 +1,113 @@
+import random
+
+import numpy as np
+import pytest
+
+from app.utils.packed_sequence import PackedSequence
+from app.utils.primer_utils import calculate_primer_tm
+from app.utils.sequence_utils import _nn_sums, get_dg_intra_hairpin, get_dg_partial_complementary
+from app.utils.thermo_utils import (
+    INVALID_CODE, ThermoProfile, encode_pool, encode_sequence, hairpin_dg_codes, partial_dg_row, tm_from_sums
+)
+from tests import reference
+
+
+def random_sequence(rng, length, alphabet='ACGT'):
+    return ''.join(rng.choice(alphabet) for _ in range(length))
+
+
+def test_encode_sequence_maps_bases_and_marks_the_rest_invalid():
+    assert encode_sequence('ACGTacgtN-').tolist() == [0, 1, 2, 3, 0, 1, 2, 3, INVALID_CODE, INVALID_CODE]
+
+
+def test_encode_pool_lays_members_out_back_to_back():
+    codes, offsets, lengths = encode_pool(['ACG', '', 'tt'])
+    assert codes.tolist() == [0, 1, 2, 3, 3]
+    assert offsets.tolist() == [0, 3, 3]
+    assert lengths.tolist() == [3, 0, 2]
+
+
+@pytest.mark.parametrize('conditions', [(50, 0, 250), (150, 20, 50), (0, 0, 0)])
+def test_tm_from_sums_matches_the_scalar_tm(conditions):
+    rng = random.Random(1)
+    seqs = [random_sequence(rng, rng.randint(0, 70), 'ACGTN') for _ in range(200)]
+    sums = [_nn_sums(seq) for seq in seqs]
+    lengths = np.array([len(seq) for seq in seqs])
+
+    tm = tm_from_sums(np.array([h for h, _ in sums]), np.array([s for _, s in sums]), lengths, *conditions)
+
+    expected = [reference.get_tm(seq, *conditions) for seq in seqs]
+    assert tm == pytest.approx(expected, abs=1e-9)
+
+
+def test_hairpin_engine_matches_the_cubic_scan():
+    rng = random.Random(2)
+    seqs = ['', 'ACGTACG', 'GGGGAAAACCCC', 'acgtTTTTacgt']
+    seqs += [random_sequence(rng, rng.randint(8, 40), 'ACGTN') for _ in range(60)]
+    # Self-complementary stems, so the minimum is usually below 0.
+    for _ in range(20):
+        stem = random_sequence(rng, rng.randint(4, 10))
+        seqs.append(stem + random_sequence(rng, rng.randint(3, 8)) + reference.get_reverse_complement(stem))
+
+    for seq in seqs:
+        expected = reference.get_dg_intra_hairpin(seq)
+        assert hairpin_dg_codes(encode_sequence(seq)) == pytest.approx(expected, abs=1e-9)
+        assert get_dg_intra_hairpin(seq) == pytest.approx(expected, abs=1e-9)
+
+
+def test_partial_dg_is_zero_without_stack_parameters():
+    oligos = [{'sequence': 'ACGTACGTACGT'}, {'sequence': 'ACGTACGTACGT'}]
+    assert get_dg_partial_complementary(oligos, oligos[0]) == 0
+    assert reference.get_dg_partial_complementary(oligos, oligos[0]) == 0
+
+
+def test_partial_dg_scan_matches_the_scalar_scan(stack_parameters):
+    rng = random.Random(3)
+    values = []
+    for _ in range(25):
+        oligos = [{'sequence': random_sequence(rng, rng.randint(0, 30), 'ACGTN')} for _ in range(rng.randint(1, 6))]
+        oligos.append({'sequence': reference.get_reverse_complement(oligos[0]['sequence'])})
+        oligos.append({'label': 'no sequence'})
+        target = {'sequence': random_sequence(rng, rng.randint(1, 30), 'ACGTN')}
+
+        expected = reference.get_dg_partial_complementary(oligos, target)
+        assert get_dg_partial_complementary(oligos, target) == pytest.approx(expected, abs=1e-9)
+        values.append(expected)
+
+        partners = [oligo['sequence'] for oligo in oligos if oligo.get('sequence')]
+        row = partial_dg_row(encode_sequence(target['sequence']), *encode_pool(partners))
+        assert row == pytest.approx(
+            [reference.get_dg_partial_complementary([{'sequence': partner}], target) for partner in partners],
+            abs=1e-9
+        )
+    assert min(values) < -5
+
+
+def test_profile_windows_match_the_scalar_functions():
+    rng = random.Random(7)
+    parent = random_sequence(rng, 400, 'ACGTACGTACGTNacgt')
+    profile = ThermoProfile(parent)
+    windows = [(0, 0), (0, 1), (5, 7), (0, len(parent)), (len(parent) - 3, len(parent))]
+    windows += [tuple(sorted(rng.sample(range(len(parent) + 1), 2))) for _ in range(200)]
+
+    for start, end in windows:
+        seq = parent[start:end]
+        assert profile.gc_content(start, end) == reference.get_gc_content(seq)
+        assert profile.wallace_tm(start, end) == calculate_primer_tm(seq)
+        assert profile.tm(start, end, 100, 10, 500) == pytest.approx(reference.get_tm(seq, 100, 10, 500), abs=1e-9)
+        assert profile.dg_full_complementary(start, end) == pytest.approx(
+            reference.get_dg_full_complementary(seq), abs=1e-9)
+
+    starts, ends = zip(*windows)
+    assert profile.tm_windows(starts, ends) == pytest.approx(
+        [profile.tm(start, end) for start, end in windows], abs=1e-12)
+
+
+def test_profile_of_a_packed_sequence_matches_its_str():
+    parent = 'acgtNNGGCCATATGCGCTTAAGGCRYACGT'
+    packed = ThermoProfile(PackedSequence(parent))
+    plain = ThermoProfile(parent.upper())
+    for start, end in [(0, len(parent)), (3, 20), (10, 11)]:
+        assert packed.gc_content(start, end) == plain.gc_content(start, end)
+        assert packed.tm(start, end) == plain.tm(start, end)
+        assert packed.dg_full_complementary(start, end) == plain.dg_full_complementary(start, end)